@@ -37,15 +37,13 @@ class PredictionService {
 
   /**
    * Batch prediction for multiple tenants
+   * Sent as one array per field, which the ML service validates column-wise
    */
   async predictBatch(tenantsData) {
     try {
       const response = await axios.post(
-        `${this.mlServiceUrl}/predict`,
-        {
-          tenants: tenantsData,
-          include_explanation: false
-        },
+        `${this.mlServiceUrl}/predict/columnar`,
+        this.toColumns(tenantsData),
         {
           timeout: 60000,
           headers: { 'Content-Type': 'application/json' }
@@ -59,6 +57,20 @@ class PredictionService {
     }
   }
 
+  /**
+   * Transpose tenant objects into equal-length arrays keyed by field
+   */
+  toColumns(tenantsData) {
+    const fields = [...new Set(tenantsData.flatMap(tenant => Object.keys(tenant)))];
+    const columns = {};
+    for (const field of fields) {
+      columns[field] = tenantsData.map(tenant =>
+        tenant[field] === undefined ? null : tenant[field]
+      );
+    }
+    return columns;
+  }
+
   /**
    * Predict churn for all leases in renewal window (90 days)
    */
@@ -77,6 +77,14 @@ describe('PredictionService', () => {
 
       expect(result).toHaveLength(2);
       expect(result[0].tenant_id).toBe('TENANT-001');
+      expect(axios.post).toHaveBeenCalledWith(
+        expect.stringContaining('/predict/columnar'),
+        {
+          tenant_id: ['TENANT-001', 'TENANT-002'],
+          monthly_rent: [2500, 2000]
+        },
+        expect.any(Object)
+      );
     });
   });
 
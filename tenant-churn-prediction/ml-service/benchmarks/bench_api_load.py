@@ -0,0 +1,136 @@
+"""
+API Load Benchmark
+/health and single-tenant /predict latency while clients keep posting large
+/predict batches, plus how many batch requests were shed with a 503
+
+Usage:
+    python benchmarks/bench_api_load.py --batch-tenants 2000 --batch-clients 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def train_service_model(model_dir: Path) -> None:
+    """Model artifact and feature pipeline for the API to serve"""
+    tables = make_raw_tables(5_000)
+    engineer = TenantFeatureEngineer()
+    X = engineer.engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+    )
+    y = (np.random.default_rng(0).random(len(X)) > 0.7).astype(int)
+    model = XGBoostChurnModel({"n_estimators": 200})
+    model.train(X, y, cv_folds=0)
+    model.save(model_dir / "xgboost_churn_model", feature_pipeline=engineer)
+
+
+def tenants(n: int) -> list:
+    return [
+        {
+            "tenant_id": f"T{i}",
+            "property_id": f"P{i}",
+            "lease_id": f"L{i}",
+            "lease_end_date": "2026-12-01",
+            "avg_days_late": float(i % 9),
+        }
+        for i in range(n)
+    ]
+
+
+def summarize(name: str, latencies: list) -> None:
+    if not latencies:
+        print(f"  {name:28s} no responses")
+        return
+    ms = np.array(latencies) * 1000
+    print(
+        f"  {name:28s} n={len(ms):5d}  p50 {np.percentile(ms, 50):8.1f} ms  "
+        f"p95 {np.percentile(ms, 95):8.1f} ms  max {ms.max():8.1f} ms"
+    )
+
+
+async def run_load(app, args) -> None:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    deadline = time.perf_counter() + args.seconds
+    batch_body = {"tenants": tenants(args.batch_tenants)}
+    small_body = {"tenants": tenants(1)}
+    results = {"health": [], "small": [], "batch": [], "shed": 0}
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://api", timeout=None
+    ) as client:
+
+        async def batch_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/predict", json=batch_body)
+                if response.status_code == 503:
+                    results["shed"] += 1
+                    await asyncio.sleep(float(response.headers["Retry-After"]))
+                else:
+                    results["batch"].append(time.perf_counter() - start)
+
+        async def probe(path: str, key: str, body=None):
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if body is None:
+                    await client.get(path)
+                else:
+                    await client.post(path, json=body)
+                results[key].append(time.perf_counter() - start)
+                await asyncio.sleep(args.probe_interval)
+
+        await asyncio.gather(
+            probe("/health", "health"),
+            probe("/predict", "small", small_body),
+            *[batch_client() for _ in range(args.batch_clients)],
+        )
+
+    print(
+        f"\n{args.batch_clients} clients x {args.batch_tenants} tenants per batch, "
+        f"{args.seconds:.0f}s"
+    )
+    summarize("/health", results["health"])
+    summarize("/predict (1 tenant)", results["small"])
+    summarize(f"/predict ({args.batch_tenants} tenants)", results["batch"])
+    print(f"  batch requests shed with 503: {results['shed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the prediction API")
+    parser.add_argument("--batch-tenants", type=int, default=2000)
+    parser.add_argument("--batch-clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        train_service_model(Path(tmp_dir))
+        os.environ["MODEL_PATH"] = str(Path(tmp_dir) / "xgboost_churn_model")
+
+        from src.api import main as api
+
+        asyncio.run(api.load_model())
+        asyncio.run(run_load(api.app, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Columnar Request Benchmark
+End-to-end /predict latency for one object per tenant versus the same tenants
+sent as JSON columns or an Arrow IPC table to /predict/columnar
+
+Usage:
+    python benchmarks/bench_columnar_request.py --tenants 10000 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_api_load import tenants, train_service_model
+from src.api.columnar import ARROW_STREAM_MEDIA_TYPE
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def arrow_stream(columns: dict) -> bytes:
+    table = pa.Table.from_pydict(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark columnar /predict")
+    parser.add_argument("--tenants", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        train_service_model(Path(tmp_dir))
+        os.environ["MODEL_PATH"] = str(Path(tmp_dir) / "xgboost_churn_model")
+
+        import httpx
+
+        from src.api import main as api
+
+        asyncio.run(api.load_model())
+
+        async def post(path: str, body: bytes, content_type: str) -> None:
+            transport = httpx.ASGITransport(app=api.app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://api", timeout=None
+            ) as client:
+                response = await client.post(
+                    path, content=body, headers={"Content-Type": content_type}
+                )
+                response.raise_for_status()
+
+        for n in args.tenants:
+            rows = tenants(n)
+            columns = {name: [row[name] for row in rows] for name in rows[0]}
+            cases = [
+                (
+                    "rows, JSON",
+                    "/predict",
+                    json.dumps({"tenants": rows}),
+                    "application/json",
+                ),
+                (
+                    "columns, JSON",
+                    "/predict/columnar",
+                    json.dumps(columns),
+                    "application/json",
+                ),
+                (
+                    "columns, Arrow IPC",
+                    "/predict/columnar",
+                    arrow_stream(columns),
+                    ARROW_STREAM_MEDIA_TYPE,
+                ),
+            ]
+
+            print(f"\n{n} tenants")
+            baseline = None
+            for label, path, body, content_type in cases:
+                body = body.encode() if isinstance(body, str) else body
+                elapsed = best_of(
+                    lambda: asyncio.run(post(path, body, content_type)), args.repeats
+                )
+                baseline = baseline or elapsed
+                print(
+                    f"  {label:20s} {elapsed * 1000:8.0f} ms  "
+                    f"{baseline / elapsed:5.1f}x  body {len(body) / 1e6:5.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
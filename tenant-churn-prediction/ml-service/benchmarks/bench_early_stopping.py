@@ -0,0 +1,65 @@
+"""
+Early Stopping Benchmark
+Training time, tree count, validation AUC and predict_proba latency with all
+n_estimators trees vs early stopping truncated to the best iteration
+
+Usage:
+    python benchmarks/bench_early_stopping.py --leases 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from sklearn.model_selection import train_test_split
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_training_matrix import make_training_set
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark early stopping")
+    parser.add_argument("--leases", type=int, default=100_000)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    X, y = make_training_set(args.leases)
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    request = X_val.iloc[:1]
+    batch = X_val.iloc[:10_000]
+
+    print(f"\nLeases: {args.leases:,}  n_estimators: {args.n_estimators}")
+    for name, patience in [("All trees", None), ("Early stopping (10)", 10)]:
+        model = XGBoostChurnModel({"n_estimators": args.n_estimators})
+        results = model.train(
+            X_train, y_train, X_val, y_val, early_stopping_rounds=patience, cv_folds=0
+        )
+        metadata = results["metadata"]
+        one_row = best_of(lambda: model.predict_proba(request), args.repeats)
+        rows = best_of(lambda: model.predict_proba(batch), max(1, args.repeats // 5))
+        print(
+            f"  {name:20s} trees {metadata['n_trees']:4d}  "
+            f"fit {metadata['phase_seconds']['fit']:6.2f} s  "
+            f"val AUC {results['validation_metrics']['roc_auc']:.4f}  "
+            f"predict 1 row {one_row * 1000:6.2f} ms  "
+            f"{len(batch):,} rows {rows * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Feature Dtype Benchmark
+Bytes per row of the feature matrix under all-float64, float32/int32 and the
+downcast float32/int8/category layouts
+
+Usage:
+    python benchmarks/bench_feature_dtypes.py --leases 200000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.buffer import bytes_per_row
+from src.features.feature_engineer import TenantFeatureEngineer
+
+
+def as_float64(features: pd.DataFrame, categorical: list) -> pd.DataFrame:
+    """Every column as float64, categoricals as their codes"""
+    codes = {col: features[col].cat.codes for col in categorical}
+    return features.assign(**codes).astype(np.float64)
+
+
+def as_wide_codes(features: pd.DataFrame, categorical: list) -> pd.DataFrame:
+    """The previous layout: float32 numerics and flags, int32 codes"""
+    numeric = features.drop(columns=categorical).astype(np.float32)
+    codes = {col: features[col].cat.codes.astype(np.int32) for col in categorical}
+    return numeric.assign(**codes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feature matrix dtypes")
+    parser.add_argument("--leases", type=int, default=200_000)
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.leases, payments_per_lease=2)
+    features = TenantFeatureEngineer().engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        tables["market_data"],
+        is_training=True,
+    )
+    categorical = [
+        col
+        for col in features.columns
+        if isinstance(features[col].dtype, pd.CategoricalDtype)
+    ]
+
+    layouts = {
+        "float64": as_float64(features, categorical),
+        "float32 + int32 codes": as_wide_codes(features, categorical),
+        "float32 + int8 + category": features,
+    }
+    baseline = bytes_per_row(layouts["float64"])
+
+    print(f"Leases: {args.leases:,}  Features: {features.shape[1]}")
+    for name, frame in layouts.items():
+        size = bytes_per_row(frame)
+        total_mb = size * len(frame) / 1e6
+        print(
+            f"  {name:26s} {size:7.1f} bytes/row  {total_mb:8.1f} MB  "
+            f"({size / baseline:.0%} of float64)"
+        )
+    print(f"  Column dtypes: {dict(features.dtypes.astype(str).value_counts())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Feature Build Memory Benchmark
+Peak traced memory and wall time of engineer_features on synthetic portfolios
+
+Usage:
+    python benchmarks/bench_feature_memory.py --leases 1000000 --payments-per-lease 2
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.feature_engineer import TenantFeatureEngineer
+
+
+def build(tables: dict):
+    return TenantFeatureEngineer().engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        tables["market_data"],
+        is_training=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feature build memory")
+    parser.add_argument("--leases", type=int, default=1_000_000)
+    parser.add_argument("--payments-per-lease", type=int, default=2)
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.leases, payments_per_lease=args.payments_per_lease)
+    gc.collect()
+
+    start = time.perf_counter()
+    features = build(tables)
+    wall = time.perf_counter() - start
+    result_mb = features.memory_usage(index=False, deep=True).sum() / 1e6
+    del features
+    gc.collect()
+
+    tracemalloc.start()
+    features = build(tables)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Leases: {args.leases:,}  Payments: {len(tables['payments']):,}")
+    print(f"  Wall time:          {wall:8.2f} s")
+    print(f"  Peak traced memory: {peak / 1e6:8.1f} MB")
+    print(f"  Feature matrix:     {result_mb:8.1f} MB ({features.shape[1]} columns)")
+    print(f"  Column dtypes:      {dict(features.dtypes.astype(str).value_counts())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Incremental Aggregate Benchmark
+Full-history payment/maintenance groupby vs folding one month into the store
+
+Usage:
+    python benchmarks/bench_incremental_aggregates.py --leases 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.aggregates import AggregateStore
+from src.features.feature_engineer import TenantFeatureEngineer
+
+
+def full_groupby(tables: dict) -> pd.DataFrame:
+    return TenantFeatureEngineer()._merge_data_sources(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+    )
+
+
+def from_store(tables: dict, store: AggregateStore) -> pd.DataFrame:
+    store.update(tables["payments"], tables["maintenance"])
+    return TenantFeatureEngineer()._merge_data_sources(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        aggregate_store=store,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental aggregates")
+    parser.add_argument("--leases", type=int, default=200_000)
+    parser.add_argument("--payments-per-lease", type=int, default=12)
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.leases, payments_per_lease=args.payments_per_lease)
+
+    # Everything up to the last month is already folded into the store
+    cutoff = pd.to_datetime(tables["payments"]["payment_date"]).max()
+    cutoff = cutoff - pd.DateOffset(months=1)
+    store = AggregateStore()
+    store.update(
+        tables["payments"][
+            pd.to_datetime(tables["payments"]["payment_date"]) <= cutoff
+        ],
+        tables["maintenance"][
+            pd.to_datetime(tables["maintenance"]["request_date"]) <= cutoff
+        ],
+    )
+
+    start = time.perf_counter()
+    full_groupby(tables)
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_store(tables, store)
+    incremental = time.perf_counter() - start
+
+    print(
+        f"Leases: {args.leases:,}  Payments: {len(tables['payments']):,}  "
+        f"Maintenance: {len(tables['maintenance']):,}"
+    )
+    print(f"  Full-history groupby merge: {full:8.2f} s")
+    print(f"  Incremental (last month):   {incremental:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Inference Backend Benchmark
+predict_proba latency of the XGBoost booster vs the compiled NumPy tree engine
+(and the per-call "auto" choice) for single requests and batches, plus the
+pandas-free single-row mode
+
+Usage:
+    python benchmarks/bench_inference_backends.py --leases 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_training_matrix import make_training_set
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference backends")
+    parser.add_argument("--leases", type=int, default=100_000)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    X, y = make_training_set(args.leases)
+    X_train, X_test, y_train, _ = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    model = XGBoostChurnModel({"n_estimators": args.n_estimators})
+    model.train(X_train, y_train, cv_folds=0)
+
+    expected = model.predict_proba(X_test)[:, 1]
+    model.set_inference_backend("numpy")
+    max_diff = np.abs(model.predict_proba(X_test)[:, 1] - expected).max()
+
+    print(f"\nLeases: {args.leases:,}  trees: {args.n_estimators}")
+    print(f"Max |booster - numpy| probability difference: {max_diff:.2e}")
+    for rows in [1, 100, 1_000, 10_000]:
+        batch = X_test.iloc[:rows]
+        repeats = args.repeats if rows < 10_000 else max(1, args.repeats // 5)
+        timings = {}
+        for backend in model.INFERENCE_BACKENDS:
+            model.set_inference_backend(backend)
+            timings[backend] = best_of(lambda: model.predict_proba(batch), repeats)
+        print(
+            f"  {rows:6,} rows  booster {timings['booster'] * 1000:8.2f} ms  "
+            f"numpy {timings['numpy'] * 1000:8.2f} ms  "
+            f"auto {timings['auto'] * 1000:8.2f} ms"
+        )
+
+    row = model._engine.to_matrix(X_test.iloc[[0]])[0].tolist()
+    single = best_of(lambda: model.predict_row(row), args.repeats * 10)
+    print(f"  predict_row (no pandas)  {single * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Inference Threading Benchmark
+Aggregate predict_proba throughput for API-like worker processes x XGBoost
+threads per worker, to pick WEB_CONCURRENCY and INFERENCE_THREADS for a host
+
+Usage:
+    python benchmarks/bench_inference_threads.py --workers 1,2,4 --threads 1,2,4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_training_matrix import make_training_set
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def serve(
+    model_path: str, batch: pd.DataFrame, threads: int, seconds: float, start_at: float
+) -> int:
+    """Predict the batch in a loop for a fixed window, like one API worker"""
+    model = XGBoostChurnModel.load(Path(model_path), inference_threads=threads)
+    model.predict_proba(batch)  # warm up
+
+    while time.time() < start_at:
+        time.sleep(0.01)
+    deadline = start_at + seconds
+    calls = 0
+    while time.time() < deadline:
+        model.predict_proba(batch)
+        calls += 1
+    return calls
+
+
+def throughput(
+    model_path: str, batch: pd.DataFrame, workers: int, threads: int, seconds: float
+) -> float:
+    """Rows per second summed over all worker processes"""
+    # Spawned workers: forking after OpenMP has run in the parent can hang
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers) as pool:
+        # Every worker starts its measured window at the same moment
+        start_at = time.time() + 3.0 + workers
+        calls = pool.starmap(
+            serve, [(model_path, batch, threads, seconds, start_at)] * workers
+        )
+    return sum(calls) * len(batch) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference threading")
+    parser.add_argument("--leases", type=int, default=50_000)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--threads", default="1,2,4")
+    parser.add_argument("--batch-rows", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    X, y = make_training_set(args.leases)
+    model = XGBoostChurnModel()
+    model.train(X, y, cv_folds=0)
+    batch = X.iloc[: args.batch_rows]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = str(Path(tmp_dir) / "model.pkl")
+        model.save(Path(model_path))
+
+        print(f"\nCPUs: {os.cpu_count()}  batch rows: {args.batch_rows}")
+        for workers in [int(w) for w in args.workers.split(",")]:
+            for threads in [int(t) for t in args.threads.split(",")]:
+                rate = throughput(model_path, batch, workers, threads, args.seconds)
+                print(f"  {workers} workers x {threads} threads  {rate:10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
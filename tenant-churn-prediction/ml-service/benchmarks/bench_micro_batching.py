@@ -0,0 +1,88 @@
+"""
+Micro-Batching Benchmark
+Throughput and tail latency of concurrent single-tenant /predict calls with
+and without request coalescing
+
+Usage:
+    python benchmarks/bench_micro_batching.py --clients 32 --wait-ms 2
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_api_load import tenants, train_service_model
+from src.api.micro_batcher import MicroBatcher
+
+
+async def run_clients(app, clients: int, seconds: float):
+    """Latencies of closed-loop single-tenant clients and the count shed with 503"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    shed = 0
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://api", timeout=None
+    ) as client:
+
+        async def single_tenant_client(i: int):
+            body = {"tenants": tenants(i + 1)[i:]}
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/predict", json=body)
+                if response.status_code == 503:
+                    nonlocal shed
+                    shed += 1
+                    await asyncio.sleep(float(response.headers["Retry-After"]))
+                    continue
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*[single_tenant_client(i) for i in range(clients)])
+
+    return np.array(latencies) * 1000, shed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /predict micro-batching")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-rows", type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        train_service_model(Path(tmp_dir))
+        os.environ["MODEL_PATH"] = str(Path(tmp_dir) / "xgboost_churn_model")
+
+        from src.api import main as api
+
+        asyncio.run(api.load_model())
+
+        print(f"\n{args.clients} concurrent single-tenant clients, {args.seconds:.0f}s")
+        for label, wait_ms in [
+            ("unbatched", 0),
+            (f"{args.wait_ms:g} ms window", args.wait_ms),
+        ]:
+            api.micro_batcher = MicroBatcher(api.run_coalesced, wait_ms, args.max_rows)
+            ms, shed = asyncio.run(run_clients(api.app, args.clients, args.seconds))
+            print(
+                f"  {label:16s} {len(ms) / args.seconds:8.0f} req/s  "
+                f"p50 {np.percentile(ms, 50):7.1f} ms  "
+                f"p99 {np.percentile(ms, 99):7.1f} ms  shed {shed}"
+            )
+
+
+if __name__ == "__main__":
+    main()
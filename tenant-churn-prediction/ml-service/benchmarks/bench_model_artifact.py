@@ -0,0 +1,109 @@
+"""
+Model Artifact Benchmark
+Load time of the legacy joblib pickle vs the UBJSON booster + manifest artifact,
+including the serving startup with the numpy inference backend, plus manifest
+reads and the per-request feature importance lookup
+
+Usage:
+    python benchmarks/bench_model_artifact.py --leases 100000 --n-estimators 500
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_training_matrix import make_training_set
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def size_mb(path: Path) -> float:
+    files = [path] if path.is_file() else [p for p in path.rglob("*") if p.is_file()]
+    return sum(p.stat().st_size for p in files) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model artifact loading")
+    parser.add_argument("--leases", type=int, default=100_000)
+    parser.add_argument("--n-estimators", type=int, default=500)
+    parser.add_argument("--max-depth", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    X, y = make_training_set(args.leases)
+    model = XGBoostChurnModel(
+        {"n_estimators": args.n_estimators, "max_depth": args.max_depth}
+    )
+    model.train(X, y, cv_folds=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = Path(tmp_dir) / "xgboost_churn_model.pkl"
+        artifact_path = Path(tmp_dir) / "xgboost_churn_model"
+        joblib.dump(
+            {
+                "model": model.model,
+                "feature_names": model.feature_names,
+                "model_config": model.model_config,
+                "training_metadata": model.training_metadata,
+                "model_version": model.model_version,
+            },
+            legacy_path,
+        )
+        model.save(artifact_path)
+
+        def serve(path: Path) -> XGBoostChurnModel:
+            loaded = XGBoostChurnModel.load(path)
+            loaded.set_inference_backend("numpy")
+            return loaded
+
+        timings = {
+            "load (joblib)": best_of(
+                lambda: XGBoostChurnModel.load(legacy_path), args.repeats
+            ),
+            "load (artifact)": best_of(
+                lambda: XGBoostChurnModel.load(artifact_path), args.repeats
+            ),
+            "load + numpy backend (joblib)": best_of(
+                lambda: serve(legacy_path), args.repeats
+            ),
+            "load + numpy backend (artifact)": best_of(
+                lambda: serve(artifact_path), args.repeats
+            ),
+            "read manifest only": best_of(
+                lambda: XGBoostChurnModel.read_manifest(artifact_path), args.repeats
+            ),
+        }
+        legacy = XGBoostChurnModel.load(legacy_path)
+        artifact = XGBoostChurnModel.load(artifact_path)
+        timings["feature importance (joblib)"] = best_of(
+            legacy.get_feature_importance, args.repeats
+        )
+        timings["feature importance (artifact)"] = best_of(
+            artifact.get_feature_importance, args.repeats
+        )
+
+        print(
+            f"\nTrees: {args.n_estimators} (depth {args.max_depth})  "
+            f"joblib {size_mb(legacy_path):.1f} MB  "
+            f"artifact {size_mb(artifact_path):.1f} MB"
+        )
+        for name, seconds in timings.items():
+            print(f"  {name:34s} {seconds * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
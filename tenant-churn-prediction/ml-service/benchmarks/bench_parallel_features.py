@@ -0,0 +1,65 @@
+"""
+Parallel Feature Build Benchmark
+engineer_features wall time and speedup for 1/2/4/8/16 worker processes
+
+Usage:
+    python benchmarks/bench_parallel_features.py --leases 200000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.feature_engineer import TenantFeatureEngineer
+
+
+def build(tables: dict, n_workers: int) -> pd.DataFrame:
+    return TenantFeatureEngineer().engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        tables["market_data"],
+        n_workers=n_workers,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel feature builds")
+    parser.add_argument("--leases", type=int, default=200_000)
+    parser.add_argument("--payments-per-lease", type=int, default=12)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.leases, payments_per_lease=args.payments_per_lease)
+    print(
+        f"Leases: {args.leases:,}  Payments: {len(tables['payments']):,}  "
+        f"CPUs: {os.cpu_count()}"
+    )
+
+    baseline = None
+    expected = None
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        features = build(tables, n_workers)
+        wall = time.perf_counter() - start
+
+        if expected is None:
+            expected, baseline = features, wall
+        else:
+            pd.testing.assert_frame_equal(features, expected, check_exact=True)
+        print(
+            f"  {n_workers:2d} workers: {wall:7.2f} s  speedup {baseline / wall:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
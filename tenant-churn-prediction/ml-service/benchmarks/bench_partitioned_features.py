@@ -0,0 +1,105 @@
+"""
+Partitioned Feature Build Benchmark
+Peak memory of the in-memory build vs the chunked, partitioned build
+
+Usage:
+    python benchmarks/bench_partitioned_features.py --leases 200000 --payments-per-lease 24
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.partitioned import PartitionedFeatureBuilder, read_feature_partitions
+
+LARGE_TABLES = ["payments", "maintenance"]
+
+
+def in_memory(tables: dict, csv_dir: Path) -> pd.DataFrame:
+    large = {name: pd.read_csv(csv_dir / f"{name}.csv") for name in LARGE_TABLES}
+    return TenantFeatureEngineer().engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        large["payments"],
+        tables["properties"],
+        large["maintenance"],
+    )
+
+
+def partitioned(
+    tables: dict, csv_dir: Path, work_dir: Path, n_partitions: int, chunk_rows: int
+) -> Path:
+    large = {
+        name: pd.read_csv(csv_dir / f"{name}.csv", chunksize=chunk_rows)
+        for name in LARGE_TABLES
+    }
+    PartitionedFeatureBuilder(TenantFeatureEngineer(), work_dir, n_partitions).build(
+        tables["tenants"],
+        tables["leases"],
+        large["payments"],
+        tables["properties"],
+        large["maintenance"],
+    )
+    return work_dir / "features"
+
+
+def traced(fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, wall, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark partitioned feature builds")
+    parser.add_argument("--leases", type=int, default=200_000)
+    parser.add_argument("--payments-per-lease", type=int, default=24)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.leases, payments_per_lease=args.payments_per_lease)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_dir = Path(tmp)
+        for name in LARGE_TABLES:
+            tables[name].to_csv(csv_dir / f"{name}.csv", index=False)
+        n_payments = len(tables["payments"])
+        for name in LARGE_TABLES:
+            del tables[name]
+
+        expected, memory_s, memory_mb = traced(lambda: in_memory(tables, csv_dir))
+        feature_dir, partitioned_s, partitioned_mb = traced(
+            lambda: partitioned(
+                tables, csv_dir, csv_dir / "work", args.partitions, args.chunk_rows
+            )
+        )
+        pd.testing.assert_frame_equal(
+            read_feature_partitions(feature_dir), expected, check_exact=True
+        )
+
+    print(f"Leases: {args.leases:,}  Payments: {n_payments:,}")
+    print(f"  In-memory:                 {memory_s:7.2f} s  peak {memory_mb:8.1f} MB")
+    print(
+        f"  Partitioned ({args.partitions} partitions): "
+        f"{partitioned_s:7.2f} s  peak {partitioned_mb:8.1f} MB"
+    )
+    print("  Features identical: yes")
+
+
+if __name__ == "__main__":
+    main()
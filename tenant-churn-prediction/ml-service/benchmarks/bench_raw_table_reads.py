@@ -0,0 +1,77 @@
+"""
+Raw Table Read Benchmark
+pandas CSV parsing vs typed Arrow CSV and projected, memory-mapped Parquet reads
+
+Usage:
+    python benchmarks/bench_raw_table_reads.py --leases 80000 --payments-per-lease 24
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.raw_tables import RAW_TABLES, convert_to_parquet, load_raw_tables
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark raw table reads")
+    parser.add_argument("--leases", type=int, default=80_000)
+    parser.add_argument("--payments-per-lease", type=int, default=24)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.leases, payments_per_lease=args.payments_per_lease)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_dir = Path(tmp) / "csv"
+        csv_dir.mkdir()
+        for name in RAW_TABLES:
+            tables[name].to_csv(csv_dir / f"{name}.csv", index=False)
+        parquet_dir = Path(tmp) / "parquet"
+        convert_to_parquet(csv_dir, parquet_dir)
+
+        csv_mb = sum(p.stat().st_size for p in csv_dir.iterdir()) / 1e6
+        parquet_mb = sum(p.stat().st_size for p in parquet_dir.iterdir()) / 1e6
+
+        timings = {
+            "pandas read_csv": best_of(
+                lambda: {n: pd.read_csv(csv_dir / f"{n}.csv") for n in RAW_TABLES},
+                args.repeats,
+            ),
+            "Arrow CSV (typed)": best_of(
+                lambda: load_raw_tables(csv_dir), args.repeats
+            ),
+            "Parquet (mmap)": best_of(
+                lambda: load_raw_tables(parquet_dir), args.repeats
+            ),
+            "Parquet, last 6 months": best_of(
+                lambda: load_raw_tables(parquet_dir, start_date="2025-01-01"),
+                args.repeats,
+            ),
+        }
+
+    print(f"Leases: {args.leases:,}  Payments: {len(tables['payments']):,}")
+    print(f"  CSV on disk: {csv_mb:.1f} MB  Parquet on disk: {parquet_mb:.1f} MB")
+    baseline = timings["pandas read_csv"]
+    for label, seconds in timings.items():
+        print(f"  {label:24s} {seconds * 1000:8.1f} ms  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Request Transform Latency Benchmark
+p50/p99 latency of the DataFrame transform vs the row fast path for 1/10/100 rows
+
+Usage:
+    python benchmarks/bench_row_transform.py --iterations 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.feature_engineer import TenantFeatureEngineer
+
+
+def latency_ms(fn, iterations: int) -> np.ndarray:
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return timings * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request transforms")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--train-leases", type=int, default=5000)
+    args = parser.parse_args()
+
+    tables = make_raw_tables(args.train_leases)
+    engineer = TenantFeatureEngineer()
+    engineer.engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        tables["market_data"],
+    )
+    merged = engineer._merge_data_sources(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        tables["market_data"],
+    )
+
+    print(f"{'rows':>6} {'path':<12} {'p50 ms':>10} {'p99 ms':>10}")
+    for n_rows in [1, 10, 100]:
+        records = merged.iloc[:n_rows].to_dict("records")
+
+        # Request handlers receive dicts, so the DataFrame path pays construction too
+        batch = latency_ms(
+            lambda: engineer.transform_merged(pd.DataFrame(records)), args.iterations
+        )
+        fast = latency_ms(lambda: engineer.transform_records(records), args.iterations)
+
+        for name, timings in [("dataframe", batch), ("row fast", fast)]:
+            p50, p99 = np.percentile(timings, [50, 99])
+            print(f"{n_rows:>6} {name:<12} {p50:>10.3f} {p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Streamed Response Benchmark
+Time to first byte, total time and peak traced memory of a large /predict
+answered as one JSON document, NDJSON or an Arrow IPC stream
+
+Usage:
+    python benchmarks/bench_streaming.py --tenants 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_api_load import tenants, train_service_model
+from src.api.streaming import ARROW_STREAM_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+
+
+async def post_predict(app, body: bytes, accept: str) -> dict:
+    """Drive one /predict through the ASGI app, timing each body message"""
+    request_sent = False
+    timings = {"first_byte": None, "bytes": 0}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            timings["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if timings["first_byte"] is None:
+                timings["first_byte"] = time.perf_counter()
+            timings["bytes"] += len(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/predict",
+        "raw_path": b"/predict",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"accept", accept.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("api", 80),
+    }
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    timings["total"] = time.perf_counter() - start
+    timings["first_byte"] -= start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streamed /predict")
+    parser.add_argument("--tenants", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        train_service_model(Path(tmp_dir))
+        os.environ["MODEL_PATH"] = str(Path(tmp_dir) / "xgboost_churn_model")
+
+        from src.api import main as api
+
+        asyncio.run(api.load_model())
+        body = json.dumps({"tenants": tenants(args.tenants)}).encode()
+
+        print(f"\n/predict with {args.tenants} tenants")
+        for label, accept in [
+            ("JSON", "application/json"),
+            ("NDJSON", NDJSON_MEDIA_TYPE),
+            ("Arrow IPC", ARROW_STREAM_MEDIA_TYPE),
+        ]:
+            timings = asyncio.run(post_predict(api.app, body, accept))
+            tracemalloc.start()
+            asyncio.run(post_predict(api.app, body, accept))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"  {label:10s} first byte {timings['first_byte'] * 1000:7.0f} ms  "
+                f"total {timings['total'] * 1000:7.0f} ms  "
+                f"{timings['bytes'] / 1e6:6.1f} MB  peak traced {peak / 1e6:6.0f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
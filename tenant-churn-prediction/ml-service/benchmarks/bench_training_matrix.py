@@ -0,0 +1,97 @@
+"""
+Training Matrix Benchmark
+XGBClassifier.fit vs native training on one binned matrix (both with
+out-of-fold CV metrics), cold and from the on-disk matrix cache
+
+Usage:
+    python benchmarks/bench_training_matrix.py --leases 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import make_raw_tables
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def make_training_set(n_leases: int):
+    tables = make_raw_tables(n_leases, payments_per_lease=2)
+    X = TenantFeatureEngineer().engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        tables["market_data"],
+        is_training=True,
+    )
+    # Synthetic labels with some signal so CV AUC is meaningful
+    rng = np.random.default_rng(0)
+    logit = X["avg_days_late"].to_numpy() - X["tenure_months"].to_numpy()
+    y = pd.Series((logit + rng.normal(0, 1, len(X)) > 0).astype(int))
+    return X, y
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training matrices")
+    parser.add_argument("--leases", type=int, default=100_000)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--cv-folds", type=int, default=5)
+    args = parser.parse_args()
+
+    X, y = make_training_set(args.leases)
+    config = {"n_estimators": args.n_estimators}
+
+    def train(**kwargs):
+        kwargs.setdefault("cv_folds", args.cv_folds)
+        return XGBoostChurnModel(config).train(X, y, **kwargs)
+
+    runs = [
+        ("XGBClassifier.fit", *timed(train)),
+        ("QuantileDMatrix", *timed(lambda: train(use_dmatrix=True))),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "train.dmatrix"
+        runs.append(
+            ("Matrix cache (cold)", *timed(lambda: train(matrix_cache_path=cache_path)))
+        )
+        runs.append(
+            ("Matrix cache (warm)", *timed(lambda: train(matrix_cache_path=cache_path)))
+        )
+    runs.append(
+        ("QuantileDMatrix, no CV", *timed(lambda: train(use_dmatrix=True, cv_folds=0)))
+    )
+
+    print(
+        f"\nLeases: {args.leases:,}  Features: {X.shape[1]}  Rounds: {args.n_estimators}"
+    )
+    print(f"  fit + {args.cv_folds}-fold CV + training metrics:")
+    for name, seconds, result in runs:
+        metadata = result["metadata"]
+        auc = metadata["cv_mean_auc"]
+        auc = f"CV AUC {auc:.4f}" if auc is not None else "no CV       "
+        source = metadata["training_metrics_source"]
+        print(f"    {name:24s} {seconds:8.2f} s  {auc}  metrics: {source}")
+        phases = "  ".join(
+            f"{phase} {t:.2f}s" for phase, t in metadata["phase_seconds"].items()
+        )
+        print(f"      {phases}")
+
+
+if __name__ == "__main__":
+    main()
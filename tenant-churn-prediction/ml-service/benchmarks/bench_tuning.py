@@ -0,0 +1,96 @@
+"""
+Hyperparameter Tuning Benchmark
+Exhaustive GridSearchCV (extrapolated from a sample of its grid) vs Hyperband
+
+Usage:
+    python benchmarks/bench_tuning.py --leases 20000 --grid-sample 12
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import GridSearchCV, train_test_split
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_training_matrix import make_training_set
+from src.models.xgboost_model import XGBoostChurnModel
+
+# The grid tune_hyperparameters searched exhaustively with 5-fold CV
+LEGACY_GRID = {
+    "max_depth": [4, 6, 8],
+    "learning_rate": [0.01, 0.1, 0.2],
+    "n_estimators": [100, 200, 300],
+    "subsample": [0.7, 0.8, 0.9],
+    "colsample_bytree": [0.7, 0.8, 0.9],
+}
+
+
+def holdout_auc(params: dict, X_train, y_train, X_test, y_test) -> float:
+    model = XGBoostChurnModel(params)
+    model.model.fit(X_train, y_train)
+    return roc_auc_score(y_test, model.model.predict_proba(X_test)[:, 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hyperparameter tuning")
+    parser.add_argument("--leases", type=int, default=20_000)
+    parser.add_argument("--grid-sample", type=int, default=12)
+    parser.add_argument("--parallel", type=int, default=1)
+    args = parser.parse_args()
+
+    X, y = make_training_set(args.leases)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=0, stratify=y
+    )
+
+    # Time a random sample of the exhaustive grid and extrapolate
+    names = sorted(LEGACY_GRID)
+    grid = list(itertools.product(*(LEGACY_GRID[n] for n in names)))
+    rng = np.random.default_rng(0)
+    sample = [
+        dict(zip(names, grid[i])) for i in rng.choice(len(grid), args.grid_sample)
+    ]
+    search = GridSearchCV(
+        XGBoostChurnModel().model,
+        [{k: [v] for k, v in params.items()} for params in sample],
+        cv=5,
+        scoring="roc_auc",
+        n_jobs=-1,
+    )
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    grid_sample_s = time.perf_counter() - start
+    grid_full_s = grid_sample_s * len(grid) / args.grid_sample
+
+    model = XGBoostChurnModel()
+    start = time.perf_counter()
+    results = model.tune_hyperparameters(X_train, y_train, n_parallel=args.parallel)
+    hyperband_s = time.perf_counter() - start
+
+    grid_auc = holdout_auc(search.best_params_, X_train, y_train, X_test, y_test)
+    hyperband_params = {
+        **results["best_params"],
+        "n_estimators": results["best_num_boost_round"],
+    }
+    hyperband_auc = holdout_auc(hyperband_params, X_train, y_train, X_test, y_test)
+
+    print(f"\nLeases: {args.leases:,}  Grid: {len(grid)} configurations x 5 folds")
+    print(
+        f"  GridSearchCV (sampled {args.grid_sample}): {grid_sample_s:8.1f} s, "
+        f"full grid ~{grid_full_s / 60:6.1f} min  test AUC {grid_auc:.4f}"
+    )
+    print(
+        f"  Hyperband ({results['fits']} fits):      {hyperband_s:8.1f} s"
+        f"                        test AUC {hyperband_auc:.4f}"
+    )
+    print(f"  Speedup vs full grid: ~{grid_full_s / hyperband_s:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Batch Scoring Jobs
+Background scoring of lease portfolios with progress and results kept in SQLite
+"""
+
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.raw_tables import projected_columns, raw_table_path, read_raw_table
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Columns of a scored lease, in result order
+RESULT_COLUMNS = [
+    "lease_id",
+    "tenant_id",
+    "property_id",
+    "churn_probability",
+    "risk_score",
+    "risk_level",
+    "predicted_churn",
+    "confidence",
+    "predicted_at",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    lease_count INTEGER NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    scored_count INTEGER NOT NULL DEFAULT 0,
+    missing_count INTEGER NOT NULL DEFAULT 0,
+    model_version TEXT,
+    error TEXT,
+    owner_pid INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    lease_id TEXT NOT NULL,
+    tenant_id TEXT,
+    property_id TEXT,
+    churn_probability REAL NOT NULL,
+    risk_score INTEGER NOT NULL,
+    risk_level TEXT NOT NULL,
+    predicted_churn INTEGER NOT NULL,
+    confidence REAL NOT NULL,
+    predicted_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+"""
+
+
+class BatchJobStore:
+    """
+    Job status and scored rows in one SQLite file
+
+    Every call opens its own connection, so the API's event loop, the job
+    worker threads and other uvicorn workers sharing the file can all read
+    progress and completed chunks while a job is still writing.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: SQLite database file (created with its directory on first use)
+        """
+        self.path = Path(path)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._init_lock:
+            if not self._initialized:
+                self._initialize()
+                self._initialized = True
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _initialize(self) -> None:
+        """Create the schema and fail jobs whose worker process is gone"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                unfinished = conn.execute(
+                    "SELECT job_id, owner_pid FROM jobs WHERE status IN (?, ?)",
+                    (JOB_QUEUED, JOB_RUNNING),
+                ).fetchall()
+                # Our own pid can't own a job yet: it belonged to a process
+                # that held the same pid before a restart
+                orphaned = [
+                    job_id
+                    for job_id, pid in unfinished
+                    if pid == os.getpid() or not _pid_alive(pid)
+                ]
+                conn.executemany(
+                    "UPDATE jobs SET status = ?, error = ?, completed_at = ? "
+                    "WHERE job_id = ?",
+                    [
+                        (JOB_FAILED, "Interrupted by a service restart", _now(), job)
+                        for job in orphaned
+                    ],
+                )
+        finally:
+            conn.close()
+
+    def create_job(self, lease_count: int, chunk_count: int) -> str:
+        """Record a queued job owned by this process and return its id"""
+        job_id = f"batch_{uuid.uuid4().hex}"
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, lease_count, chunk_count, "
+                "owner_pid, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, lease_count, chunk_count, os.getpid(), _now()),
+            )
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status and progress of a job, or None if unknown"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        del job["owner_pid"]
+        job["progress"] = (
+            job["chunks_done"] / job["chunk_count"] if job["chunk_count"] else 1.0
+        )
+        return job
+
+    def mark_running(self, job_id: str, model_version: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, model_version = ?, started_at = ? "
+                "WHERE job_id = ?",
+                (JOB_RUNNING, model_version, _now(), job_id),
+            )
+
+    def add_chunk(
+        self, job_id: str, first_position: int, results: pd.DataFrame, missing: int
+    ) -> None:
+        """
+        Store one scored chunk and advance the job's progress atomically
+
+        Args:
+            job_id: Job the chunk belongs to
+            first_position: Position of the chunk's first lease in the job
+            results: One row per scored lease with RESULT_COLUMNS
+            missing: Lease ids in the chunk with no lease record
+        """
+        # Object columns hand sqlite3 Python ints and bools instead of NumPy scalars
+        rows = results[RESULT_COLUMNS].astype(object).itertuples(index=False, name=None)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO results (job_id, position, "
+                + ", ".join(RESULT_COLUMNS)
+                + ") VALUES (?, ?, "
+                + ", ".join("?" * len(RESULT_COLUMNS))
+                + ")",
+                ((job_id, first_position + i, *row) for i, row in enumerate(rows)),
+            )
+            conn.execute(
+                "UPDATE jobs SET chunks_done = chunks_done + 1, "
+                "scored_count = scored_count + ?, missing_count = missing_count + ? "
+                "WHERE job_id = ?",
+                (len(results), missing, job_id),
+            )
+
+    def finish(self, job_id: str, error: Optional[str] = None) -> None:
+        """Mark a job completed, or failed with the error message"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, completed_at = ? "
+                "WHERE job_id = ?",
+                (JOB_FAILED if error else JOB_COMPLETED, error, _now(), job_id),
+            )
+
+    def iter_results(
+        self, job_id: str, after: int = -1, limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream scored rows in submission order from one cursor
+
+        Pages are keyed on position, so each one is a primary-key range
+        seek however deep into the job it starts.
+
+        Args:
+            job_id: Job to read
+            after: Return rows after this position (-1: from the start)
+            limit: Most rows to return (default: all)
+
+        Yields:
+            position followed by RESULT_COLUMNS
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "SELECT position, " + ", ".join(RESULT_COLUMNS) + " FROM results "
+                "WHERE job_id = ? AND position > ? ORDER BY position LIMIT ?",
+                (job_id, after, -1 if limit is None else limit),
+            )
+            for row in cursor:
+                result = dict(row)
+                result["predicted_churn"] = bool(result["predicted_churn"])
+                yield result
+
+
+class BatchJobRunner:
+    """
+    Chunked scoring of submitted lease ids on background worker threads
+
+    A job reads only the raw rows its submitted leases join to, once, then
+    builds features and scores chunk_size leases at a time with the model
+    served when the job started.
+    Each chunk is committed with the job's progress, so results can be paged
+    while the job runs and a failure keeps the chunks already scored.
+    """
+
+    def __init__(
+        self,
+        store: BatchJobStore,
+        raw_dir: Path,
+        score_leases: Callable[[Any, Dict[str, pd.DataFrame]], pd.DataFrame],
+        chunk_size: int = 5000,
+        max_workers: int = 1,
+    ):
+        """
+        Args:
+            store: Where job progress and results are kept
+            raw_dir: Raw tenant/lease/payment/property/maintenance tables
+            score_leases: Scores the tables of one chunk with a served model,
+                returning RESULT_COLUMNS in lease order
+            chunk_size: Leases scored per chunk
+            max_workers: Jobs running at once
+        """
+        if chunk_size < 1 or max_workers < 1:
+            raise ValueError("Need chunk_size >= 1 and max_workers >= 1")
+
+        self.store = store
+        self.raw_dir = Path(raw_dir)
+        self.score_leases = score_leases
+        self.chunk_size = chunk_size
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="batch-job"
+        )
+
+    def submit(self, lease_ids: List[str], model_slot) -> str:
+        """
+        Queue a job scoring lease_ids with the model in model_slot
+
+        Args:
+            lease_ids: Leases to score; duplicates are scored once
+            model_slot: Slot holding the served model
+
+        Returns:
+            Job id
+        """
+        lease_ids = list(dict.fromkeys(lease_ids))
+        chunk_count = -(-len(lease_ids) // self.chunk_size)
+        job_id = self.store.create_job(len(lease_ids), chunk_count)
+        self._pool.submit(self._run, job_id, lease_ids, model_slot)
+        return job_id
+
+    def _run(self, job_id: str, lease_ids: List[str], model_slot) -> None:
+        try:
+            with model_slot.acquire() as serving:
+                if serving is None:
+                    raise ValueError("Model not loaded")
+                self.store.mark_running(job_id, serving.model.model_version)
+
+                tables = self._read_job_tables(lease_ids)
+                groups = {
+                    name: tables[name].groupby(key, sort=False).indices
+                    for name, key in _CHUNK_KEYS.items()
+                }
+                for start in range(0, len(lease_ids), self.chunk_size):
+                    chunk_ids = lease_ids[start : start + self.chunk_size]
+                    chunk = _chunk_tables(tables, groups, chunk_ids)
+                    results = (
+                        self.score_leases(serving, chunk)
+                        if len(chunk["leases"])
+                        else pd.DataFrame(columns=RESULT_COLUMNS)
+                    )
+                    self.store.add_chunk(
+                        job_id, start, results, len(chunk_ids) - len(chunk["leases"])
+                    )
+        except Exception as e:
+            print(f"Batch job {job_id} failed: {e}")
+            self.store.finish(job_id, error=str(e))
+            return
+
+        self.store.finish(job_id)
+
+    def _read_job_tables(self, lease_ids: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Raw rows the job's leases join to, filtered as each table is read
+
+        Leases, then their tenants, properties, payments and maintenance
+        requests are read with key filters, so a job holds its own rows
+        rather than the whole portfolio.
+        """
+
+        def read(table: str, keys: Dict[str, Iterable]) -> pd.DataFrame:
+            return read_raw_table(
+                raw_table_path(self.raw_dir, table),
+                table,
+                columns=projected_columns(table),
+                keys=keys,
+            )
+
+        leases = read("leases", {"lease_id": lease_ids})
+        property_ids = leases["property_id"].dropna().unique()
+        return {
+            "leases": leases,
+            "tenants": read(
+                "tenants", {"tenant_id": leases["tenant_id"].dropna().unique()}
+            ),
+            "properties": read("properties", {"property_id": property_ids}),
+            "payments": read("payments", {"lease_id": leases["lease_id"].unique()}),
+            "maintenance": read("maintenance", {"property_id": property_ids}),
+        }
+
+
+# Join key each raw table is sliced on per chunk
+_CHUNK_KEYS = {
+    "leases": "lease_id",
+    "tenants": "tenant_id",
+    "properties": "property_id",
+    "payments": "lease_id",
+    "maintenance": "property_id",
+}
+
+
+def _chunk_tables(
+    tables: Dict[str, pd.DataFrame],
+    groups: Dict[str, Dict[Any, np.ndarray]],
+    lease_ids: List[str],
+) -> Dict[str, pd.DataFrame]:
+    """Rows of each raw table that the chunk's leases join to"""
+
+    def take(name: str, keys: Iterable, keep_order: bool = False) -> pd.DataFrame:
+        rows = [groups[name][key] for key in keys if key in groups[name]]
+        positions = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+        if not keep_order:
+            positions = np.sort(positions)
+        return tables[name].iloc[positions].reset_index(drop=True)
+
+    # Leases keep submission order; the rest keep file order
+    leases = take("leases", lease_ids, keep_order=True)
+    property_ids = leases["property_id"].unique()
+    return {
+        "leases": leases,
+        "tenants": take("tenants", leases["tenant_id"].unique()),
+        "properties": take("properties", property_ids),
+        "payments": take("payments", leases["lease_id"]),
+        "maintenance": take("maintenance", property_ids),
+    }
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
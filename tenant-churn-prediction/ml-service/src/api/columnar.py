@@ -0,0 +1,346 @@
+"""
+Columnar Prediction Requests
+Column-oriented JSON, Arrow IPC and Parquet request bodies with vectorized validation
+"""
+
+import io
+import json
+import typing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+COLUMNAR_MEDIA_TYPES = (
+    JSON_MEDIA_TYPE,
+    ARROW_STREAM_MEDIA_TYPE,
+    ARROW_FILE_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+)
+
+# Most validation errors reported per request
+MAX_REPORTED_ERRORS = 20
+
+# Coercion applied to values a typed column check can't take as they are
+_LAX_ADAPTERS = {kind: TypeAdapter(kind) for kind in (str, bool, int, float)}
+
+_TYPE_ERRORS = {
+    str: "Input should be a string",
+    bool: "Input should be a boolean",
+    int: "Input should be a valid integer",
+    float: "Input should be a number",
+}
+
+
+class ColumnarValidationError(ValueError):
+    """Request columns failed validation; errors are pydantic-style dicts"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(f"{len(errors)} invalid request columns")
+        self.errors = errors
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Type, default and bounds of one request column"""
+
+    name: str
+    kind: type
+    required: bool
+    nullable: bool
+    default: Any = None
+    ge: Optional[float] = None
+    le: Optional[float] = None
+
+
+def column_specs(model: Type[BaseModel]) -> Dict[str, ColumnSpec]:
+    """
+    Column rules taken from a pydantic row model, so both formats validate alike
+
+    Args:
+        model: Row model whose fields are str, bool, int or float (optionally
+            Optional) with ge/le constraints
+
+    Returns:
+        ColumnSpec by field name, in field order
+    """
+    specs = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        nullable = typing.get_origin(annotation) is typing.Union
+        kind = args[0] if nullable else annotation
+        if kind not in (str, bool, int, float):
+            raise ValueError(f"Field {name} of type {annotation} has no column rule")
+
+        bounds = {}
+        for constraint in field.metadata:
+            for bound in ("ge", "le"):
+                if getattr(constraint, bound, None) is not None:
+                    bounds[bound] = getattr(constraint, bound)
+
+        specs[name] = ColumnSpec(
+            name=name,
+            kind=kind,
+            required=field.is_required(),
+            nullable=nullable,
+            default=None if field.is_required() else field.default,
+            **bounds,
+        )
+    return specs
+
+
+def read_columns(body: bytes, media_type: str) -> Dict[str, Any]:
+    """
+    Decode a request body into named columns
+
+    Args:
+        body: Raw request body
+        media_type: One of COLUMNAR_MEDIA_TYPES; JSON is an object of arrays
+
+    Returns:
+        Column values (lists or NumPy arrays) by name
+    """
+    if media_type == JSON_MEDIA_TYPE:
+        try:
+            columns = json.loads(body)
+        except ValueError as e:
+            raise ColumnarValidationError([_error(["body"], f"Invalid JSON: {e}")])
+        if not isinstance(columns, dict) or not all(
+            isinstance(values, list) for values in columns.values()
+        ):
+            raise ColumnarValidationError(
+                [_error(["body"], "Expected an object of column arrays")]
+            )
+        return columns
+
+    try:
+        if media_type == ARROW_STREAM_MEDIA_TYPE:
+            table = ipc.open_stream(body).read_all()
+        elif media_type == ARROW_FILE_MEDIA_TYPE:
+            table = ipc.open_file(pa.BufferReader(body)).read_all()
+        elif media_type == PARQUET_MEDIA_TYPE:
+            table = pq.read_table(io.BytesIO(body))
+        else:
+            raise ValueError(f"Unsupported request media type {media_type}")
+    except (pa.ArrowException, OSError) as e:
+        raise ColumnarValidationError([_error(["body"], f"Unreadable table: {e}")])
+
+    return {
+        name: table.column(name).to_numpy(zero_copy_only=False)
+        for name in table.column_names
+    }
+
+
+def validate_columns(
+    columns: Dict[str, Any], specs: Dict[str, ColumnSpec]
+) -> pd.DataFrame:
+    """
+    Check and convert request columns in one pass per column
+
+    Missing optional columns take their defaults; unknown columns are ignored,
+    as unknown fields are for row requests. Every failing column is reported
+    with its first offending rows.
+
+    Args:
+        columns: Column values by name
+        specs: Column rules from column_specs()
+
+    Returns:
+        One row per tenant with every spec column, typed
+
+    Raises:
+        ColumnarValidationError: On missing, mistyped, null or out-of-range values
+    """
+    lengths = {len(values) for name, values in columns.items() if name in specs}
+    if len(lengths) > 1:
+        raise ColumnarValidationError(
+            [_error(["columns"], f"Columns have different lengths: {sorted(lengths)}")]
+        )
+    n_rows = lengths.pop() if lengths else 0
+    if n_rows == 0:
+        raise ColumnarValidationError([_error(["columns"], "No rows submitted")])
+
+    errors = []
+    frame = {}
+    for name, spec in specs.items():
+        if name not in columns:
+            if spec.required:
+                errors.append(_error([name], "Field required"))
+            else:
+                frame[name] = np.full(n_rows, spec.default, dtype=_dtype(spec))
+            continue
+
+        try:
+            frame[name] = _convert(columns[name], spec)
+        except ColumnarValidationError as e:
+            errors.extend(e.errors)
+
+    if errors:
+        raise ColumnarValidationError(errors[:MAX_REPORTED_ERRORS])
+    return pd.DataFrame(frame)
+
+
+def _convert(values: Any, spec: ColumnSpec) -> np.ndarray:
+    """
+    Typed column, validated against the spec
+
+    Homogeneous JSON arrays and Arrow columns arrive as typed NumPy arrays
+    and are checked with whole-array operations. Values of another type
+    (numeric strings, 0/1 booleans, bytes) go through pydantic's own lax
+    coercion once per distinct value, so a column accepts what TenantData
+    accepts for the same field. Arrow date columns become ISO date strings,
+    as row requests send them.
+    """
+    if spec.kind is str:
+        values = _date_strings(values)
+    elif not isinstance(values, np.ndarray):
+        values = _as_array(values)
+
+    missing = np.asarray(pd.isna(values), dtype=bool)
+    if missing.any() and not spec.nullable:
+        raise ColumnarValidationError(
+            [_row_error(spec.name, missing, "Value is not nullable")]
+        )
+
+    if values.dtype.kind in "OSU":
+        native = {
+            str: str,
+            bool: (bool, np.bool_),
+            int: (int, float, np.integer, np.floating),
+            float: (int, float, np.integer, np.floating),
+        }[spec.kind]
+        pending = ~missing & ~_is_instance(values, native)
+        if spec.kind in (int, float):
+            pending |= _is_instance(values, (bool, np.bool_))
+        values, bad = _lax_coerce(values, spec.kind, pending)
+    elif spec.kind is bool:
+        bad = (
+            ~missing & ~np.isin(values, (0, 1))
+            if values.dtype.kind in "biuf"
+            else np.ones(len(values), dtype=bool)
+        )
+    else:
+        bad = np.full(len(values), values.dtype.kind not in "biuf")
+    if bad.any():
+        raise ColumnarValidationError(
+            [_row_error(spec.name, bad, _TYPE_ERRORS[spec.kind])]
+        )
+
+    if spec.kind is str:
+        return values
+    if spec.kind is bool:
+        return values.astype(bool)
+
+    converted = np.where(missing, np.nan, values).astype(float)
+    if spec.kind is int:
+        fractional = ~missing & (converted != np.floor(converted))
+        if fractional.any():
+            raise ColumnarValidationError(
+                [_row_error(spec.name, fractional, "Input should be a valid integer")]
+            )
+
+    out_of_range = np.zeros(len(values), dtype=bool)
+    if spec.ge is not None:
+        out_of_range |= converted < spec.ge
+    if spec.le is not None:
+        out_of_range |= converted > spec.le
+    if out_of_range.any():
+        raise ColumnarValidationError(
+            [
+                _row_error(
+                    spec.name,
+                    out_of_range,
+                    f"Input should be between {spec.ge} and {spec.le}",
+                )
+            ]
+        )
+
+    if spec.kind is int and not missing.any():
+        return converted.astype(np.int64)
+    return converted
+
+
+def _date_strings(values: Any) -> np.ndarray:
+    """Object array of a str column; date columns as YYYY-MM-DD strings"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        days = values.astype("datetime64[D]")
+        nat = np.isnat(values)
+        if (days == values)[~nat].all():
+            text = np.datetime_as_string(days, unit="D").astype(object)
+            text[nat] = None
+            return text
+    return np.asarray(values, dtype=object)
+
+
+def _lax_coerce(
+    values: np.ndarray, kind: type, pending: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    pydantic lax-mode coercion of values[pending], once per distinct value
+
+    Returns:
+        (object array with pending values coerced, mask of values rejected)
+    """
+    coerced = values.astype(object)
+    bad = np.zeros(len(values), dtype=bool)
+    if not pending.any():
+        return coerced, bad
+
+    codes, uniques = pd.factorize(pd.Series(values[pending], dtype=object))
+    adapter = _LAX_ADAPTERS[kind]
+    results = np.empty(len(uniques), dtype=object)
+    valid = np.ones(len(uniques), dtype=bool)
+    for i, value in enumerate(uniques):
+        try:
+            results[i] = adapter.validate_python(value)
+        except ValidationError:
+            valid[i] = False
+    coerced[pending] = results[codes]
+    bad[pending] = ~valid[codes]
+    return coerced, bad
+
+
+def _as_array(values: list) -> np.ndarray:
+    """NumPy array of a JSON list; typed when its values share a type"""
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        return np.asarray(values, dtype=object)
+    return array if array.ndim == 1 else np.asarray(values, dtype=object)
+
+
+def _is_instance(values: np.ndarray, types) -> np.ndarray:
+    """isinstance() of every value of an object array"""
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+    return np.frompyfunc(lambda v: isinstance(v, types), 1, 1)(values).astype(bool)
+
+
+def _dtype(spec: ColumnSpec):
+    if spec.kind is str or spec.default is None:
+        return object
+    return {bool: bool, int: np.int64, float: float}[spec.kind]
+
+
+def _row_error(name: str, mask: np.ndarray, message: str) -> Dict[str, Any]:
+    """One error per column, naming how many rows failed and the first few"""
+    rows = np.flatnonzero(mask)
+    return _error(
+        [name],
+        f"{message} ({len(rows)} rows)",
+        rows=rows[:5].tolist(),
+    )
+
+
+def _error(loc: List[Any], message: str, **context: Any) -> Dict[str, Any]:
+    return {"loc": ["columns", *loc], "msg": message, **context}
@@ -0,0 +1,141 @@
+"""
+Inference Executor
+Bounded thread pool that keeps model scoring off the asyncio event loop
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Optional, Tuple
+
+
+class InferenceQueueFull(RuntimeError):
+    """Every worker is busy and the wait queue is at capacity"""
+
+
+class BoundedInferencePool:
+    """
+    Thread pool with a fixed number of admitted jobs
+
+    XGBoost prediction and most of the NumPy/pandas work release the GIL, so
+    threads keep the event loop free for health checks and small requests
+    while large batches score. At most max_workers jobs run and max_queue
+    more wait; beyond that run() fails fast with InferenceQueueFull instead
+    of letting latency grow without bound.
+
+    Work that must not be dropped part way (later chunks of a streamed
+    response) awaits admit() instead: it waits for a slot in arrival order,
+    counts as pending, and a finished job hands its slot straight to it, so
+    new requests keep getting InferenceQueueFull while it waits.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        """
+        Args:
+            max_workers: Jobs scored concurrently
+            max_queue: Jobs allowed to wait for a worker
+        """
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("Need max_workers >= 1 and max_queue >= 0")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference"
+        )
+        self._admitted = 0
+        # Admissions waiting for a slot, oldest first, with the loop to wake
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Jobs running, queued or waiting for admission"""
+        return self._admitted + len(self._waiters)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        """
+        Run fn(*args) on a worker thread and await its result
+
+        Args:
+            fn: Function to run
+            *args: Its arguments
+            wait: Await admit() for a slot instead of failing when none is free
+
+        Raises:
+            InferenceQueueFull: When no slot is free and wait is False
+        """
+        if wait:
+            await self.admit()
+        elif not self._try_admit():
+            raise InferenceQueueFull(
+                f"{self.max_workers} inference workers busy and "
+                f"{self.max_queue} requests queued"
+            )
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # Freed when the job ends, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def admit(self) -> None:
+        """
+        Wait for a free slot and take it
+
+        The caller owns the slot until it submits a job (run() does both);
+        a cancelled wait gives up its place or passes the slot on.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._admitted < self._capacity:
+                self._admitted += 1
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = (loop, waiter) in self._waiters
+                if queued:
+                    self._waiters.remove((loop, waiter))
+            # Handed a slot just before the cancellation landed
+            if not queued and not waiter.cancelled():
+                self._release(None)
+            raise
+
+    @property
+    def _capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _try_admit(self) -> bool:
+        with self._lock:
+            if self._waiters or self._admitted >= self._capacity:
+                return False
+            self._admitted += 1
+            return True
+
+    def _release(self, _: Optional[Future]) -> None:
+        """Hand the slot to the oldest waiter, or free it"""
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._hand_over, waiter)
+                    return
+                except RuntimeError:
+                    # Its event loop has closed; try the next waiter
+                    continue
+            self._admitted -= 1
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        if waiter.cancelled():
+            self._release(None)
+        else:
+            waiter.set_result(None)
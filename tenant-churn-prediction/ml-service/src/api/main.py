@@ -3,23 +3,52 @@ FastAPI ML Service for Tenant Churn Prediction
 Provides REST API for model predictions and batch scoring
 """
 
+import asyncio
+import json
 import os
 import sys
+from contextlib import ExitStack
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
-from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from src.api.batch_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    BatchJobRunner,
+    BatchJobStore,
+)
+from src.api.columnar import (
+    COLUMNAR_MEDIA_TYPES,
+    ColumnarValidationError,
+    column_specs,
+    read_columns,
+    validate_columns,
+)
+from src.api.inference_pool import BoundedInferencePool, InferenceQueueFull
+from src.api.micro_batcher import MicroBatcher
+from src.api.model_slot import ModelSlot, ServingModel
+from src.api.streaming import (
+    encode_chunk,
+    json_bytes,
+    json_records,
+    negotiate_stream_format,
+    stream_footer,
+    stream_header,
+)
 from src.features.feature_engineer import TenantFeatureEngineer
+from src.models.base_model import risk_levels
 from src.models.xgboost_model import XGBoostChurnModel
 
 # Initialize FastAPI app
@@ -41,9 +70,68 @@ app.add_middleware(
 )
 
 # Global model instance
-MODEL_PATH = Path(os.getenv("MODEL_PATH", "data/models/xgboost_churn_model.pkl"))
-model: Optional[XGBoostChurnModel] = None
-feature_engineer: Optional[TenantFeatureEngineer] = None
+MODEL_PATH = Path(os.getenv("MODEL_PATH", "data/models/xgboost_churn_model"))
+# "auto" serves small requests from the compiled flat-array trees and large
+# batches through XGBoost; "numpy" or "booster" force one of them
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "auto")
+# Cores per worker process: split between the uvicorn workers (WEB_CONCURRENCY)
+# instead of each worker using all of them
+API_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+WORKER_CORES = max(1, (os.cpu_count() or 1) // API_WORKERS)
+# Scoring runs on a bounded thread pool off the event loop; requests beyond
+# INFERENCE_WORKERS running + INFERENCE_QUEUE_SIZE waiting get a 503. Feature
+# building holds the GIL, so more workers than cores only slow everyone down
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0")) or min(4, WORKER_CORES)
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "32"))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "1"))
+inference_pool = BoundedInferencePool(INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE)
+# Requests of up to SMALL_REQUEST_TENANTS tenants get their own lane so they
+# never queue behind large batches
+SMALL_REQUEST_TENANTS = int(os.getenv("SMALL_REQUEST_TENANTS", "10"))
+SMALL_REQUEST_WORKERS = 2
+small_request_pool = BoundedInferencePool(SMALL_REQUEST_WORKERS, INFERENCE_QUEUE_SIZE)
+# Concurrent small requests arriving within MICRO_BATCH_WAIT_MS are scored as
+# one matrix (0 disables); a batch reaching MICRO_BATCH_MAX_ROWS flushes early
+MICRO_BATCH_WAIT_MS = float(os.getenv("MICRO_BATCH_WAIT_MS", "2"))
+MICRO_BATCH_MAX_ROWS = int(os.getenv("MICRO_BATCH_MAX_ROWS", "256"))
+# XGBoost threads per scoring call. Every pool thread can be inside a booster
+# call at once, so the worker's cores are divided between them. Small-lane
+# batches (at most MICRO_BATCH_MAX_ROWS plus one request) only count when they
+# can reach the booster: under "auto" they normally stay on the compiled trees
+SMALL_LANE_ROWS = MICRO_BATCH_MAX_ROWS + SMALL_REQUEST_TENANTS
+SMALL_LANE_USES_BOOSTER = INFERENCE_BACKEND == "booster" or (
+    INFERENCE_BACKEND == "auto"
+    and SMALL_LANE_ROWS > XGBoostChurnModel.AUTO_ENGINE_MAX_ROWS
+)
+BOOSTER_CALLERS = INFERENCE_WORKERS + (
+    SMALL_REQUEST_WORKERS if SMALL_LANE_USES_BOOSTER else 0
+)
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0")) or max(
+    1, WORKER_CORES // BOOSTER_CALLERS
+)
+# Streamed /predict responses (Accept: application/x-ndjson or
+# application/vnd.apache.arrow.stream) are scored and sent this many rows at a time
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "5000"))
+
+# /predict/batch jobs read the portfolio's raw tables, score them
+# BATCH_CHUNK_SIZE leases at a time and keep progress and results in SQLite
+BATCH_RAW_DATA_DIR = Path(os.getenv("BATCH_RAW_DATA_DIR", "data/raw"))
+BATCH_JOB_DB = Path(os.getenv("BATCH_JOB_DB", "data/batch_jobs/jobs.sqlite"))
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "5000"))
+BATCH_JOB_WORKERS = int(os.getenv("BATCH_JOB_WORKERS", "1"))
+BATCH_PAGE_SIZE = 1000
+BATCH_MAX_PAGE_SIZE = 10000
+
+# Served model and its feature pipeline, swapped atomically by /model/reload
+model_slot = ModelSlot()
+reload_lock = asyncio.Lock()
+
+# Request fields named differently from the merged columns the pipeline reads
+TENANT_FIELD_MAP = {
+    "has_garage": "garage",
+    "property_condition": "condition_rating",
+    "payment_method": "primary_payment_method",
+}
 
 
 # Pydantic models for request/response
@@ -89,6 +177,19 @@ class TenantData(BaseModel):
     lease_term_months: int = 12
 
 
+# Scored after every load so a broken model or pipeline is never swapped in
+SMOKE_TENANT = TenantData(
+    tenant_id="smoke",
+    property_id="smoke",
+    lease_id="smoke",
+    lease_end_date="2030-01-01",
+)
+
+
+# Validation rules for columnar requests, taken from the row model
+TENANT_COLUMNS = column_specs(TenantData)
+
+
 class PredictionRequest(BaseModel):
     """Request for single or batch predictions"""
 
@@ -112,6 +213,10 @@ class PredictionResponse(BaseModel):
     predicted_at: str
 
 
+# Response fields in order, for responses serialized without pydantic objects
+PREDICTION_FIELDS = list(PredictionResponse.model_fields)
+
+
 class ModelMetrics(BaseModel):
     """Model performance metrics"""
 
@@ -123,25 +228,122 @@ class ModelMetrics(BaseModel):
     trained_at: str
 
 
+def load_feature_pipeline(
+    artifact: Path, loaded_model: XGBoostChurnModel
+) -> Optional[TenantFeatureEngineer]:
+    """
+    Load the fitted feature pipeline saved in the model's artifact version
+
+    Only a model trained directly on request columns is served without one.
+
+    Raises:
+        ValueError: If the pipeline the model needs is missing or builds
+            other features, so a reload is rejected
+    """
+    files = XGBoostChurnModel.read_manifest(artifact)["files"]
+    if "feature_pipeline" not in files:
+        if set(loaded_model.feature_names) <= set(TenantData.model_fields):
+            print(f"No feature pipeline in {artifact}. Scoring raw request columns.")
+            return None
+        raise ValueError(f"No feature pipeline in {artifact} for the model's features")
+
+    pipeline = TenantFeatureEngineer.load(artifact / files["feature_pipeline"])
+    if pipeline.feature_names != loaded_model.feature_names:
+        raise ValueError(
+            f"Feature pipeline in {artifact} does not match model features"
+        )
+
+    print(f"Feature pipeline loaded from {artifact}")
+    return pipeline
+
+
+def to_merged_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a TenantData dict onto the merged lease columns"""
+    row = {TENANT_FIELD_MAP.get(key, key): value for key, value in record.items()}
+    row["total_days_late"] = row["avg_days_late"] * row["payment_count"]
+    return row
+
+
+def build_feature_frame(
+    records: List[Dict[str, Any]],
+    feature_engineer: Optional[TenantFeatureEngineer],
+) -> pd.DataFrame:
+    """
+    Build the model feature matrix for request rows
+
+    Runs the fitted training pipeline (row fast path) when one is loaded;
+    otherwise the request columns are passed through as-is.
+    """
+    if feature_engineer is None:
+        return pd.DataFrame(records)
+
+    return feature_engineer.transform_records([to_merged_row(r) for r in records])
+
+
+def build_column_features(
+    frame: pd.DataFrame, feature_engineer: Optional[TenantFeatureEngineer]
+) -> pd.DataFrame:
+    """
+    Build the model feature matrix for validated columnar request rows
+
+    Same features as build_feature_frame(), computed on whole columns by the
+    pipeline's DataFrame path instead of one dict per tenant.
+    """
+    if feature_engineer is None:
+        return frame
+
+    merged = frame.rename(columns=TENANT_FIELD_MAP)
+    merged["total_days_late"] = merged["avg_days_late"] * merged["payment_count"]
+    return feature_engineer.transform_merged(merged)
+
+
+def apply_inference_backend(loaded_model: XGBoostChurnModel) -> None:
+    """Switch to INFERENCE_BACKEND, keeping the booster if the trees can't compile"""
+    try:
+        loaded_model.set_inference_backend(INFERENCE_BACKEND)
+    except ValueError as e:
+        print(f"Inference backend {INFERENCE_BACKEND} unavailable ({e}); using booster")
+        loaded_model.set_inference_backend("booster")
+        return
+    print(f"Inference backend: {INFERENCE_BACKEND}")
+
+
+def load_serving_model() -> ServingModel:
+    """
+    Load, warm and validate the model and pipeline at MODEL_PATH
+
+    Runs off the event loop on reload. The smoke prediction compiles the
+    inference path and fails the load if the model can't score a request.
+    """
+    if not MODEL_PATH.exists():
+        raise FileNotFoundError(f"Model not found at {MODEL_PATH}")
+
+    # Model and pipeline come from one version, even if a save switches the link
+    artifact = MODEL_PATH.resolve()
+    print(f"Loading model from {MODEL_PATH} ({artifact.name})")
+    loaded_model = XGBoostChurnModel.load(artifact, inference_threads=INFERENCE_THREADS)
+    print(f"Inference threads: {INFERENCE_THREADS}")
+    apply_inference_backend(loaded_model)
+    pipeline = load_feature_pipeline(artifact, loaded_model)
+
+    smoke_df = build_feature_frame([SMOKE_TENANT.dict()], pipeline)
+    probability = loaded_model.predict_proba(smoke_df[loaded_model.feature_names])
+    if not np.isfinite(probability).all():
+        raise ValueError("Smoke prediction returned a non-finite probability")
+
+    return ServingModel(model=loaded_model, feature_engineer=pipeline)
+
+
 @app.on_event("startup")
 async def load_model():
-    """Load model on startup"""
-    global model, feature_engineer
-
+    """Load model and fitted feature pipeline on startup"""
     try:
-        if MODEL_PATH.exists():
-            print(f"Loading model from {MODEL_PATH}")
-            model = XGBoostChurnModel.load(MODEL_PATH)
-            feature_engineer = TenantFeatureEngineer()
-            print("Model loaded successfully")
-        else:
-            print(f"Model not found at {MODEL_PATH}. Train a model first.")
-            model = None
-            feature_engineer = TenantFeatureEngineer()
+        model_slot.swap(load_serving_model())
+        print("Model loaded successfully")
+    except FileNotFoundError as e:
+        print(f"{e}. Train a model first.")
     except Exception as e:
         print(f"Error loading model: {e}")
-        model = None
-        feature_engineer = TenantFeatureEngineer()
 
 
 @app.get("/health")
@@ -149,7 +351,8 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
+        "model_loaded": model_slot.current is not None,
+        "inference_pending": inference_pool.pending + small_request_pool.pending,
         "timestamp": datetime.utcnow().isoformat(),
     }
 
@@ -157,114 +360,506 @@ async def health_check():
 @app.get("/health/ready")
 async def readiness_check():
     """Readiness check endpoint"""
-    if model is None:
+    serving = model_slot.current
+    if serving is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     return {
         "status": "ready",
-        "model_version": model.model_version,
+        "model_version": serving.model.model_version,
         "timestamp": datetime.utcnow().isoformat(),
     }
 
 
 @app.post("/predict", response_model=List[PredictionResponse])
-async def predict_churn(request: PredictionRequest):
+async def predict_churn(
+    request: PredictionRequest, accept: Optional[str] = Header(None)
+):
     """
     Predict churn probability for one or more tenants
 
-    Returns risk scores, churn probabilities, and optional explanations
+    Returns risk scores, churn probabilities, and optional explanations.
+    With Accept: application/x-ndjson or application/vnd.apache.arrow.stream
+    the predictions are streamed chunk by chunk as they are scored.
     """
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
+    media_type = negotiate_stream_format(accept)
+    if media_type is not None:
+        if request.include_explanation:
+            raise HTTPException(
+                status_code=422,
+                detail="include_explanation is not supported for streamed responses",
+            )
+        return await stream_predictions(
+            partial(score_tenant_chunk, request), len(request.tenants), media_type
+        )
+
+    # One snapshot for the whole request; a reload can't swap it midway
+    with model_slot.acquire() as serving:
+        if serving is None:
+            raise HTTPException(status_code=503, detail="Model not loaded")
+        small = len(request.tenants) <= SMALL_REQUEST_TENANTS
+        try:
+            # Explanations need each request's own feature rows, so those
+            # requests are never coalesced
+            if small and micro_batcher.enabled and not request.include_explanation:
+                content = await micro_batcher.submit(
+                    serving, request, len(request.tenants)
+                )
+            else:
+                pool = small_request_pool if small else inference_pool
+                content = await pool.run(score_tenants, request, serving)
+        except InferenceQueueFull as e:
+            raise queue_full_error(e)
+    return Response(content=content, media_type="application/json")
+
+
+def queue_full_error(e: InferenceQueueFull) -> HTTPException:
+    """503 asking the client to retry once the inference queue drains"""
+    return HTTPException(
+        status_code=503,
+        detail=f"Inference queue full: {e}",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+async def stream_predictions(
+    score_chunk: Callable[[int, ServingModel, str], bytes],
+    n_rows: int,
+    media_type: str,
+) -> StreamingResponse:
+    """
+    Score and send STREAM_CHUNK_ROWS tenants at a time
+
+    The first chunk is scored before the response starts, so a full queue or
+    a scoring error still gets a proper status code; later chunks wait their
+    turn for an inference slot, counted as pending so new requests are shed
+    meanwhile. The model snapshot is held until the stream ends.
 
+    Args:
+        score_chunk: Scores and encodes the chunk starting at a row offset
+        n_rows: Tenants in the request
+        media_type: Streamed media type from negotiate_stream_format()
+    """
+    stack = ExitStack()
+    serving = stack.enter_context(model_slot.acquire())
+    try:
+        if serving is None:
+            raise HTTPException(status_code=503, detail="Model not loaded")
+        try:
+            first = await inference_pool.run(score_chunk, 0, serving, media_type)
+        except InferenceQueueFull as e:
+            raise queue_full_error(e)
+    except BaseException:
+        stack.close()
+        raise
+
+    async def body():
+        with stack:
+            yield stream_header(media_type) + first
+            for start in range(STREAM_CHUNK_ROWS, n_rows, STREAM_CHUNK_ROWS):
+                yield await inference_pool.run(
+                    score_chunk, start, serving, media_type, wait=True
+                )
+            yield stream_footer(media_type)
+
+    return StreamingResponse(body(), media_type=media_type)
+
+
+def score_tenant_chunk(
+    request: PredictionRequest, start: int, serving: ServingModel, media_type: str
+) -> bytes:
+    """Score STREAM_CHUNK_ROWS request tenants from start and encode them"""
+    model = serving.model
+    tenants = request.tenants[start : start + STREAM_CHUNK_ROWS]
     try:
-        # Convert request to DataFrame
-        tenant_data = pd.DataFrame([t.dict() for t in request.tenants])
+        feature_df = build_feature_frame(
+            [t.dict() for t in tenants], serving.feature_engineer
+        )
+        probabilities = model.predict_proba(feature_df[model.feature_names])[:, 1]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+    predictions = prediction_frame(
+        {
+            "tenant_id": [t.tenant_id for t in tenants],
+            "property_id": [t.property_id for t in tenants],
+        },
+        probabilities,
+        request.risk_threshold_high,
+        request.risk_threshold_medium,
+    )
+    return encode_chunk(predictions, media_type)
+
+
+@app.post("/predict/columnar", response_model=List[PredictionResponse])
+async def predict_churn_columnar(
+    request: Request,
+    risk_threshold_high: int = 80,
+    risk_threshold_medium: int = 50,
+    accept: Optional[str] = Header(None),
+):
+    """
+    Predict churn for tenants sent as columns instead of one object per tenant
+
+    The body is a JSON object of equal-length arrays keyed by TenantData
+    field, or an Arrow IPC / Parquet table with those columns, chosen by
+    Content-Type. Columns are validated with whole-array checks and go
+    straight into the feature matrix. Responses follow /predict, including
+    streaming by Accept header; explanations are not available.
+    """
+    content_type = request.headers.get("content-type", "application/json")
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type not in COLUMNAR_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Send one of {', '.join(COLUMNAR_MEDIA_TYPES)}",
+        )
+
+    body = await request.body()
+    try:
+        frame = await inference_pool.run(read_tenant_columns, body, content_type)
+    except InferenceQueueFull as e:
+        raise queue_full_error(e)
+    except ColumnarValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+
+    thresholds = (risk_threshold_high, risk_threshold_medium)
+    media_type = negotiate_stream_format(accept)
+    if media_type is not None:
+        return await stream_predictions(
+            partial(score_column_chunk, frame, thresholds), len(frame), media_type
+        )
+
+    with model_slot.acquire() as serving:
+        if serving is None:
+            raise HTTPException(status_code=503, detail="Model not loaded")
+        try:
+            content = await inference_pool.run(
+                score_columns, frame, thresholds, serving
+            )
+        except InferenceQueueFull as e:
+            raise queue_full_error(e)
+    return Response(content=content, media_type="application/json")
+
+
+def read_tenant_columns(body: bytes, content_type: str) -> pd.DataFrame:
+    """Decode and validate a columnar request body into typed tenant rows"""
+    return validate_columns(read_columns(body, content_type), TENANT_COLUMNS)
+
+
+def score_column_rows(frame: pd.DataFrame, serving: ServingModel) -> np.ndarray:
+    """Churn probability of validated tenant rows"""
+    model = serving.model
+    try:
+        feature_df = build_column_features(frame, serving.feature_engineer)
+        return model.predict_proba(feature_df[model.feature_names])[:, 1]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
+def score_columns(
+    frame: pd.DataFrame, thresholds: tuple, serving: ServingModel
+) -> bytes:
+    """Score validated tenant rows into a /predict-shaped JSON array"""
+    predictions = prediction_frame(
+        {"tenant_id": frame["tenant_id"], "property_id": frame["property_id"]},
+        score_column_rows(frame, serving),
+        *thresholds,
+    )
+    return predictions_json(predictions)
+
+
+def score_column_chunk(
+    frame: pd.DataFrame,
+    thresholds: tuple,
+    start: int,
+    serving: ServingModel,
+    media_type: str,
+) -> bytes:
+    """Score STREAM_CHUNK_ROWS validated tenant rows from start and encode them"""
+    chunk = frame.iloc[start : start + STREAM_CHUNK_ROWS].reset_index(drop=True)
+    predictions = prediction_frame(
+        {"tenant_id": chunk["tenant_id"], "property_id": chunk["property_id"]},
+        score_column_rows(chunk, serving),
+        *thresholds,
+    )
+    return encode_chunk(predictions, media_type)
 
-        # Engineer features (simplified - in production would fetch full data)
-        # For now, use the raw features directly
-        feature_df = tenant_data.copy()
+
+def score_tenants(request: PredictionRequest, serving: ServingModel) -> bytes:
+    """Score request tenants with one served model into a JSON array"""
+    model = serving.model
+    try:
+        # Engineer features with the fitted training pipeline
+        feature_df = build_feature_frame(
+            [t.dict() for t in request.tenants], serving.feature_engineer
+        )
 
         # Get predictions
         probabilities = model.predict_proba(feature_df[model.feature_names])[:, 1]
-        predictions = (probabilities >= 0.5).astype(int)
 
-        # Calculate risk scores
-        risk_scores = (probabilities * 100).astype(int)
+        return predictions_json(
+            build_predictions(request, probabilities, model, feature_df)
+        )
 
-        # Determine risk levels
-        def get_risk_level(score: int) -> str:
-            if score >= request.risk_threshold_high:
-                return "HIGH"
-            elif score >= request.risk_threshold_medium:
-                return "MEDIUM"
-            else:
-                return "LOW"
-
-        risk_levels = [get_risk_level(score) for score in risk_scores]
-
-        # Calculate confidence (distance from decision boundary)
-        confidence = np.abs(probabilities - 0.5) * 2
-
-        # Build responses
-        responses = []
-        for i, tenant in enumerate(request.tenants):
-            response = PredictionResponse(
-                tenant_id=tenant.tenant_id,
-                property_id=tenant.property_id,
-                churn_probability=float(probabilities[i]),
-                risk_score=int(risk_scores[i]),
-                risk_level=risk_levels[i],
-                predicted_churn=bool(predictions[i]),
-                confidence=float(confidence[i]),
-                predicted_at=datetime.utcnow().isoformat(),
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
+def score_coalesced(
+    requests: List[PredictionRequest], serving: ServingModel
+) -> List[Union[bytes, HTTPException]]:
+    """
+    Score several requests as one feature matrix and split the results back
+
+    If the joint scoring fails, each request is rescored on its own, so a
+    bad payload only fails its own caller, as it would without coalescing.
+
+    Returns:
+        Per request, its JSON array or the HTTPException to raise for it
+    """
+    model = serving.model
+    try:
+        feature_df = build_feature_frame(
+            [t.dict() for request in requests for t in request.tenants],
+            serving.feature_engineer,
+        )
+        probabilities = model.predict_proba(feature_df[model.feature_names])[:, 1]
+
+        offsets = np.cumsum([len(request.tenants) for request in requests])[:-1]
+        return [
+            predictions_json(build_predictions(request, request_probabilities, model))
+            for request, request_probabilities in zip(
+                requests, np.split(probabilities, offsets)
             )
+        ]
+
+    except Exception as e:
+        if len(requests) == 1:
+            return [
+                HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+            ]
+
+        results = []
+        for request in requests:
+            try:
+                results.append(score_tenants(request, serving))
+            except HTTPException as request_error:
+                results.append(request_error)
+        return results
+
 
-            # Add explanation if requested
-            if request.include_explanation:
-                try:
-                    explanation = model.get_prediction_explanation(
-                        feature_df.iloc[[i]][model.feature_names]
-                    )
-                    response.explanation = explanation
-                except Exception as e:
-                    print(f"Error generating explanation: {e}")
+async def run_coalesced(
+    requests: List[PredictionRequest], serving: ServingModel
+) -> List[Union[bytes, HTTPException]]:
+    """Score one micro-batch on the small-request lane"""
+    return await small_request_pool.run(score_coalesced, requests, serving)
 
-            responses.append(response)
 
-        return responses
+micro_batcher = MicroBatcher(run_coalesced, MICRO_BATCH_WAIT_MS, MICRO_BATCH_MAX_ROWS)
 
+
+def build_predictions(
+    request: PredictionRequest,
+    probabilities: np.ndarray,
+    model: XGBoostChurnModel,
+    feature_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Prediction frame for the request's tenants
+
+    Args:
+        request: Request the probabilities were scored for
+        probabilities: Churn probability per request tenant
+        model: Model that scored them
+        feature_df: Request feature rows, needed for explanations
+    """
+    predictions = prediction_frame(
+        {
+            "tenant_id": [t.tenant_id for t in request.tenants],
+            "property_id": [t.property_id for t in request.tenants],
+        },
+        probabilities,
+        request.risk_threshold_high,
+        request.risk_threshold_medium,
+    )
+
+    # Add explanations if requested
+    if request.include_explanation and feature_df is not None:
+        predictions["explanation"] = [
+            explain_row(model, feature_df, i) for i in range(len(predictions))
+        ]
+
+    return predictions
+
+
+def explain_row(
+    model: XGBoostChurnModel, feature_df: pd.DataFrame, i: int
+) -> Optional[Dict[str, Any]]:
+    """Explanation of one scored row, or None if it can't be generated"""
+    try:
+        return model.get_prediction_explanation(
+            feature_df.iloc[[i]][model.feature_names]
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        print(f"Error generating explanation: {e}")
+        return None
 
 
-@app.post("/predict/batch")
-async def predict_batch(background_tasks: BackgroundTasks, lease_ids: List[str]):
+def prediction_frame(
+    keys: Dict[str, Any],
+    probabilities: np.ndarray,
+    risk_threshold_high: int = 80,
+    risk_threshold_medium: int = 50,
+) -> pd.DataFrame:
+    """
+    Prediction columns for scored rows, built with array operations
+
+    Every row of a batch shares one predicted_at timestamp.
+
+    Args:
+        keys: Identifying columns (tenant_id, property_id, ...) placed first
+        probabilities: Churn probability per row
+        risk_threshold_high: Lowest risk score banded HIGH
+        risk_threshold_medium: Lowest risk score banded MEDIUM
+    """
+    risk_scores = (probabilities * 100).astype(int)
+    return pd.DataFrame(
+        {
+            **keys,
+            "churn_probability": probabilities.astype(float),
+            "risk_score": risk_scores,
+            "risk_level": risk_levels(
+                risk_scores, risk_threshold_high, risk_threshold_medium
+            ),
+            "predicted_churn": probabilities >= 0.5,
+            "confidence": np.abs(probabilities - 0.5) * 2,
+            "predicted_at": datetime.utcnow().isoformat(),
+        }
+    )
+
+
+def predictions_json(predictions: pd.DataFrame) -> bytes:
+    """
+    /predict JSON array of a prediction frame, without PredictionResponse objects
+
+    The bytes are the same as FastAPI's serialization of the equivalent
+    List[PredictionResponse], full float precision included.
+    """
+    if "explanation" not in predictions:
+        predictions = predictions.assign(explanation=None)
+    return json_bytes(json_records(predictions[PREDICTION_FIELDS]))
+
+
+def score_lease_tables(
+    serving: ServingModel, tables: Dict[str, pd.DataFrame]
+) -> pd.DataFrame:
+    """Score the leases of one batch job chunk from their raw table rows"""
+    model = serving.model
+    feature_df = serving.feature_engineer.engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        is_training=False,
+    )
+    probabilities = model.predict_proba(feature_df[model.feature_names])[:, 1]
+
+    leases = tables["leases"]
+    return prediction_frame(
+        {
+            "lease_id": leases["lease_id"].to_numpy(),
+            "tenant_id": leases["tenant_id"].to_numpy(),
+            "property_id": leases["property_id"].to_numpy(),
+        },
+        probabilities,
+    )
+
+
+batch_jobs = BatchJobRunner(
+    BatchJobStore(BATCH_JOB_DB),
+    BATCH_RAW_DATA_DIR,
+    score_lease_tables,
+    chunk_size=BATCH_CHUNK_SIZE,
+    max_workers=BATCH_JOB_WORKERS,
+)
+
+
+@app.post("/predict/batch", status_code=202)
+async def predict_batch(lease_ids: List[str]):
     """
     Batch prediction endpoint for processing large datasets
-    Returns job ID for async processing
+    Returns job ID for async processing; poll GET /predict/batch/{job_id}
     """
-    if model is None:
+    serving = model_slot.current
+    if serving is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
-
-    # In production, this would queue a background job
-    job_id = f"batch_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+    if serving.feature_engineer is None:
+        raise HTTPException(
+            status_code=503, detail="Batch scoring needs the fitted feature pipeline"
+        )
+    if not BATCH_RAW_DATA_DIR.exists():
+        raise HTTPException(
+            status_code=503, detail=f"Portfolio data not found at {BATCH_RAW_DATA_DIR}"
+        )
+    if not lease_ids:
+        raise HTTPException(status_code=422, detail="No lease ids submitted")
+
+    loop = asyncio.get_running_loop()
+    job_id = await loop.run_in_executor(None, batch_jobs.submit, lease_ids, model_slot)
+    job = await loop.run_in_executor(None, batch_jobs.store.get_job, job_id)
 
     return {
         "job_id": job_id,
-        "status": "queued",
-        "lease_count": len(lease_ids),
-        "estimated_completion": "2 minutes",
+        "status": job["status"],
+        "lease_count": job["lease_count"],
+        "chunk_count": job["chunk_count"],
+        "status_url": f"/predict/batch/{job_id}",
     }
 
 
+@app.get("/predict/batch/{job_id}")
+async def get_batch_job(
+    job_id: str,
+    after: int = Query(-1, ge=-1),
+    limit: int = Query(BATCH_PAGE_SIZE, ge=1, le=BATCH_MAX_PAGE_SIZE),
+):
+    """
+    Status, progress and one page of results of a batch job
+
+    Results are available for every chunk scored so far, in submission
+    order, and are streamed from the result store row by row. Each row
+    carries its submission position; pass the last one as after= to read
+    the next page. next_after is null once the job has finished and its
+    last stored row has been returned.
+    """
+    loop = asyncio.get_running_loop()
+    job = await loop.run_in_executor(None, batch_jobs.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job {job_id} not found")
+    finished = job["status"] in (JOB_COMPLETED, JOB_FAILED)
+
+    def body():
+        yield '{"job": ' + json.dumps(job) + ', "results": ['
+        count, last = 0, after
+        for row in batch_jobs.store.iter_results(job_id, after, limit):
+            yield ("," if count else "") + json.dumps(row)
+            count, last = count + 1, row["position"]
+        next_after = None if finished and count < limit else last
+        yield '], "after": %d, "next_after": %s}' % (after, json.dumps(next_after))
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
 @app.get("/model/info")
 async def get_model_info() -> Dict[str, Any]:
     """Get model metadata and performance metrics"""
-    if model is None:
+    serving = model_slot.current
+    if serving is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
-    metadata = model.get_metadata()
+    metadata = serving.model.get_metadata()
 
     return {
         "model_version": metadata["model_version"],
@@ -278,11 +873,12 @@ async def get_model_info() -> Dict[str, Any]:
 @app.get("/model/features")
 async def get_feature_importance():
     """Get feature importance rankings"""
-    if model is None:
+    serving = model_slot.current
+    if serving is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     try:
-        importance_df = model.get_feature_importance()
+        importance_df = serving.model.get_feature_importance()
 
         return {
             "features": importance_df.to_dict(orient="records"),
@@ -294,21 +890,34 @@ async def get_feature_importance():
 
 @app.post("/model/reload")
 async def reload_model():
-    """Reload model from disk (useful after retraining)"""
-    global model
+    """
+    Reload model from disk (useful after retraining)
 
-    try:
-        if MODEL_PATH.exists():
-            model = XGBoostChurnModel.load(MODEL_PATH)
-            return {
-                "status": "success",
-                "message": "Model reloaded",
-                "model_version": model.model_version,
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Model file not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Reload error: {str(e)}")
+    The new model is loaded, warmed and smoke-tested on a worker thread while
+    the current one keeps serving, then swapped in atomically. Requests that
+    started on the old model finish on it; a failed load keeps it serving.
+    """
+    if not MODEL_PATH.exists():
+        raise HTTPException(status_code=404, detail="Model file not found")
+
+    async with reload_lock:
+        loop = asyncio.get_running_loop()
+        try:
+            serving = await loop.run_in_executor(None, load_serving_model)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Reload error: {str(e)}; previous model still serving",
+            )
+        previous = model_slot.swap(serving)
+
+    return {
+        "status": "success",
+        "message": "Model reloaded",
+        "model_version": serving.model.model_version,
+        "previous_model_version": previous.model.model_version if previous else None,
+        "previous_model_in_flight": model_slot.in_flight(previous) if previous else 0,
+    }
 
 
 @app.get("/metrics")
@@ -318,7 +927,9 @@ async def get_metrics():
     return {
         "predictions_total": 0,
         "prediction_latency_ms": 0,
-        "model_version": model.model_version if model else "none",
+        "model_version": (
+            model_slot.current.model.model_version if model_slot.current else "none"
+        ),
     }
 
 
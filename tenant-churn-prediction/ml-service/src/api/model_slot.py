@@ -0,0 +1,92 @@
+"""
+Serving Model Slot
+Atomic hot-swap of the served model with in-flight request tracking
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class ServingModel:
+    """A loaded model and the feature pipeline fitted with it, never mutated"""
+
+    model: Any
+    feature_engineer: Optional[Any] = None
+    loaded_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+class ModelSlot:
+    """
+    Holder of the served model, replaced in one reference assignment
+
+    Requests take a snapshot with acquire() and use it to the end, so a
+    reload never changes the model halfway through a request. A swapped-out
+    model is kept as retiring until its last in-flight request finishes.
+    """
+
+    def __init__(self):
+        self._current: Optional[ServingModel] = None
+        self._in_flight: Dict[int, int] = {}
+        self._retiring: List[ServingModel] = []
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[ServingModel]:
+        return self._current
+
+    @contextmanager
+    def acquire(self) -> Iterator[Optional[ServingModel]]:
+        """Snapshot of the current model, counted as in flight while held"""
+        with self._lock:
+            serving = self._current
+            if serving is not None:
+                self._in_flight[id(serving)] = self._in_flight.get(id(serving), 0) + 1
+        try:
+            yield serving
+        finally:
+            if serving is not None:
+                with self._lock:
+                    self._in_flight[id(serving)] -= 1
+                    self._release_retired()
+
+    def swap(self, serving: Optional[ServingModel]) -> Optional[ServingModel]:
+        """
+        Serve a new model; the previous one retires once idle
+
+        Args:
+            serving: Loaded and validated model (None unloads)
+
+        Returns:
+            The previously served model
+        """
+        with self._lock:
+            previous, self._current = self._current, serving
+            if previous is not None:
+                self._retiring.append(previous)
+            self._release_retired()
+        return previous
+
+    def in_flight(self, serving: ServingModel) -> int:
+        """Requests currently holding a snapshot of this model"""
+        with self._lock:
+            return self._in_flight.get(id(serving), 0)
+
+    @property
+    def retiring(self) -> List[ServingModel]:
+        """Swapped-out models still finishing requests"""
+        with self._lock:
+            return list(self._retiring)
+
+    def _release_retired(self) -> None:
+        """Drop retiring models with no requests left (caller holds the lock)"""
+        still_busy = []
+        for serving in self._retiring:
+            if self._in_flight.get(id(serving), 0) > 0:
+                still_busy.append(serving)
+            else:
+                self._in_flight.pop(id(serving), None)
+        self._retiring = still_busy
@@ -0,0 +1,122 @@
+"""
+Streamed Prediction Responses
+NDJSON and Arrow IPC encodings of scored chunks, selected by the Accept header
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+STREAM_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE)
+
+# One scored tenant; same fields as PredictionResponse without explanations
+PREDICTION_SCHEMA = pa.schema(
+    [
+        ("tenant_id", pa.string()),
+        ("property_id", pa.string()),
+        ("churn_probability", pa.float64()),
+        ("risk_score", pa.int64()),
+        ("risk_level", pa.string()),
+        ("predicted_churn", pa.bool_()),
+        ("confidence", pa.float64()),
+        ("predicted_at", pa.string()),
+    ]
+)
+
+# End-of-stream marker of the Arrow IPC streaming format
+ARROW_STREAM_END = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def negotiate_stream_format(accept: Optional[str]) -> Optional[str]:
+    """
+    Streamed media type the client prefers, or None for a plain JSON response
+
+    Args:
+        accept: Accept header value; media ranges are ranked by their q value
+
+    Returns:
+        NDJSON_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE or None
+    """
+    if not accept:
+        return None
+
+    ranked = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranked.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(ranked):
+        if media_type in STREAM_MEDIA_TYPES:
+            return media_type
+        if media_type in ("application/json", "application/*", "*/*"):
+            return None
+    return None
+
+
+def json_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Rows of a frame as dicts of Python values, converted a column at a time
+
+    Floats stay Python floats, so json.dumps writes their shortest
+    round-trip repr, as the per-row pydantic responses did.
+    """
+    columns = list(frame.columns)
+    return [
+        dict(zip(columns, row))
+        for row in zip(*(frame[column].tolist() for column in columns))
+    ]
+
+
+def json_bytes(value: Any) -> bytes:
+    """JSON encoded like FastAPI's JSONResponse (compact, no NaN)"""
+    return json.dumps(
+        value, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def stream_header(media_type: str) -> bytes:
+    """Bytes sent before the first chunk (the Arrow schema message)"""
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        return PREDICTION_SCHEMA.serialize().to_pybytes()
+    return b""
+
+
+def encode_chunk(predictions: pd.DataFrame, media_type: str) -> bytes:
+    """
+    Serialize one chunk of scored tenants
+
+    Args:
+        predictions: One row per tenant with the PREDICTION_SCHEMA columns
+        media_type: NDJSON_MEDIA_TYPE or ARROW_STREAM_MEDIA_TYPE
+
+    Returns:
+        NDJSON lines, or one Arrow record batch message
+    """
+    predictions = predictions[PREDICTION_SCHEMA.names]
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        batch = pa.RecordBatch.from_pandas(
+            predictions, schema=PREDICTION_SCHEMA, preserve_index=False
+        )
+        return batch.serialize().to_pybytes()
+
+    return b"".join(json_bytes(record) + b"\n" for record in json_records(predictions))
+
+
+def stream_footer(media_type: str) -> bytes:
+    """Bytes sent after the last chunk (the Arrow end-of-stream marker)"""
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        return ARROW_STREAM_END
+    return b""
@@ -0,0 +1,537 @@
+"""
+Incremental Payment and Maintenance Aggregates
+Per-lease and per-property running statistics folded in once per row id
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Bump when the saved store layout changes
+AGGREGATE_STORE_FORMAT_VERSION = 3
+
+# Column identifying a row, per table; each id is folded into the store once
+DEFAULT_ID_COLUMNS = {
+    "payments": "payment_id",
+    "maintenance": "request_id",
+}
+
+# Date each table's watermark advances on
+AGGREGATE_DATE_COLUMNS = {
+    "payments": "payment_date",
+    "maintenance": "request_date",
+}
+
+# Rows dated this many days before a table's watermark are still expected
+# (same-day and late-posted rows); their ids are kept in memory
+DEFAULT_LATE_WINDOW_DAYS = 35
+
+# Per-lease payment aggregates, in merged column order
+PAYMENT_AGGREGATE_COLUMNS = [
+    "total_paid",
+    "avg_payment",
+    "payment_std",
+    "payment_count",
+    "avg_days_late",
+    "max_days_late",
+    "total_days_late",
+    "last_payment_date",
+]
+
+# Per-property maintenance aggregates, in merged column order. One
+# "<type>_request_count" column per request_type seen follows these.
+MAINTENANCE_AGGREGATE_COLUMNS = [
+    "maintenance_count",
+    "high_priority_count",
+    "avg_resolution_days",
+    "total_maintenance_cost",
+    "avg_maintenance_cost",
+]
+
+REQUEST_TYPE_COUNT_SUFFIX = "_request_count"
+
+
+def aggregate_payments(payments: pd.DataFrame) -> pd.DataFrame:
+    """Per-lease payment aggregates over a full payment history"""
+    payment_agg = (
+        payments.groupby("lease_id")
+        .agg(
+            {
+                "amount": ["sum", "mean", "std", "count"],
+                "days_late": ["mean", "max", "sum"],
+                "payment_date": "max",
+            }
+        )
+        .reset_index()
+    )
+    payment_agg.columns = ["lease_id"] + PAYMENT_AGGREGATE_COLUMNS
+    return payment_agg
+
+
+def aggregate_maintenance(maintenance: pd.DataFrame) -> pd.DataFrame:
+    """Per-property maintenance aggregates over a full request history"""
+    return finalize_maintenance(maintenance_partials(maintenance))
+
+
+def payment_partials(payments: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mergeable per-lease payment statistics for a batch of rows
+
+    Amount spread is kept as the sum of squared deviations from the batch
+    mean (M2), which merges exactly across batches without the cancellation
+    a raw sum of squares suffers.
+    """
+    partial = (
+        payments.assign(payment_date=pd.to_datetime(payments["payment_date"]))
+        .groupby("lease_id")
+        .agg(
+            amount_count=("amount", "count"),
+            amount_sum=("amount", "sum"),
+            amount_var=("amount", "var"),
+            days_late_count=("days_late", "count"),
+            days_late_sum=("days_late", "sum"),
+            days_late_max=("days_late", "max"),
+            last_payment_date=("payment_date", "max"),
+        )
+    )
+    amount_m2 = partial.pop("amount_var") * (partial["amount_count"] - 1)
+    partial.insert(2, "amount_m2", amount_m2.fillna(0.0))
+    return partial
+
+
+def maintenance_partials(maintenance: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mergeable per-property maintenance statistics for a batch of rows
+
+    Every statistic is a per-row contribution (indicator or value) summed in
+    a single cythonized groupby pass, including one count column per
+    request_type.
+    """
+    contributions = {
+        "request_count": maintenance["request_id"].notna(),
+        "high_priority_count": maintenance["priority"] == "HIGH",
+        "resolution_days_count": maintenance["resolution_days"].notna(),
+        "resolution_days_sum": maintenance["resolution_days"],
+    }
+    if "cost" in maintenance.columns:
+        contributions["cost_count"] = maintenance["cost"].notna()
+        contributions["cost_sum"] = maintenance["cost"]
+
+    rows = pd.DataFrame(contributions, index=maintenance.index)
+    if "request_type" in maintenance.columns:
+        type_counts = request_type_indicators(maintenance["request_type"])
+        rows = pd.concat([rows, type_counts], axis=1)
+
+    return rows.groupby(maintenance["property_id"]).sum()
+
+
+def request_type_indicators(request_types: pd.Series) -> pd.DataFrame:
+    """One 0/1 column per normalized request type ("Pest Control" -> pest_control)"""
+    codes, uniques = pd.factorize(request_types)
+
+    # Normalize the few distinct labels, then merge labels that collide
+    labels = (
+        pd.Index(uniques.astype(str))
+        .str.lower()
+        .str.replace(r"[^a-z0-9]+", "_", regex=True)
+        .str.strip("_")
+    )
+    label_codes, names = pd.factorize(labels)
+
+    indicators = np.zeros((len(codes), len(names)), dtype=np.int64)
+    rows = np.flatnonzero(codes >= 0)
+    indicators[rows, label_codes[codes[rows]]] = 1
+
+    return pd.DataFrame(
+        indicators,
+        index=request_types.index,
+        columns=[f"{name}{REQUEST_TYPE_COUNT_SUFFIX}" for name in names],
+    )
+
+
+def combine_payment_partials(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Merge two per-lease payment states (Chan et al. pairwise variance)"""
+    if a.empty:
+        return b
+    if b.empty:
+        return a
+
+    index = a.index.union(b.index)
+    a, b = a.reindex(index), b.reindex(index)
+
+    n_a = a["amount_count"].fillna(0)
+    n_b = b["amount_count"].fillna(0)
+    n = n_a + n_b
+    delta = (b["amount_sum"] / n_b - a["amount_sum"] / n_a).fillna(0.0)
+
+    combined = pd.DataFrame(index=index)
+    combined["amount_count"] = n.astype(np.int64)
+    combined["amount_sum"] = a["amount_sum"].add(b["amount_sum"], fill_value=0)
+    combined["amount_m2"] = a["amount_m2"].add(
+        b["amount_m2"], fill_value=0
+    ) + delta**2 * n_a * n_b / n.where(n > 0, 1)
+    combined["days_late_count"] = (
+        a["days_late_count"].add(b["days_late_count"], fill_value=0).astype(np.int64)
+    )
+    combined["days_late_sum"] = a["days_late_sum"].add(b["days_late_sum"], fill_value=0)
+    combined["days_late_max"] = np.fmax(a["days_late_max"], b["days_late_max"])
+    combined["last_payment_date"] = pd.concat(
+        [a["last_payment_date"], b["last_payment_date"]], axis=1
+    ).max(axis=1)
+    return combined
+
+
+def combine_maintenance_partials(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Merge two per-property maintenance states (all statistics are additive)"""
+    if a.empty:
+        return b
+    if b.empty:
+        return a
+    # New properties and newly seen request types start from zero
+    index = a.index.union(b.index)
+    columns = a.columns.union(b.columns, sort=False)
+    combined = a.reindex(index=index, columns=columns, fill_value=0) + b.reindex(
+        index=index, columns=columns, fill_value=0
+    )
+    counts = [col for col in combined.columns if col.endswith("_count")]
+    combined[counts] = combined[counts].astype(np.int64)
+    return combined
+
+
+def finalize_payments(state: pd.DataFrame) -> pd.DataFrame:
+    """Per-lease payment aggregates (lease_id + aggregate columns)"""
+    count = state["amount_count"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(state["amount_m2"] / (count - 1)).where(count > 1)
+        aggregates = pd.DataFrame(
+            {
+                "lease_id": state.index,
+                "total_paid": state["amount_sum"],
+                "avg_payment": state["amount_sum"] / count,
+                "payment_std": std,
+                "payment_count": count,
+                "avg_days_late": state["days_late_sum"] / state["days_late_count"],
+                "max_days_late": state["days_late_max"],
+                "total_days_late": state["days_late_sum"],
+                "last_payment_date": state["last_payment_date"],
+            }
+        )
+    return aggregates.reset_index(drop=True)
+
+
+def finalize_maintenance(state: pd.DataFrame) -> pd.DataFrame:
+    """Per-property maintenance aggregates (property_id + aggregate columns)"""
+    cost_sum = state.get("cost_sum", pd.Series(np.nan, index=state.index))
+    cost_count = state.get("cost_count", pd.Series(np.nan, index=state.index))
+    type_columns = sorted(
+        col for col in state.columns if col.endswith(REQUEST_TYPE_COUNT_SUFFIX)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aggregates = pd.DataFrame(
+            {
+                "property_id": state.index,
+                "maintenance_count": state["request_count"],
+                "high_priority_count": state["high_priority_count"],
+                "avg_resolution_days": state["resolution_days_sum"]
+                / state["resolution_days_count"],
+                "total_maintenance_cost": cost_sum,
+                "avg_maintenance_cost": cost_sum / cost_count,
+            }
+        )
+    aggregates = pd.concat([aggregates, state[type_columns]], axis=1)
+    return aggregates.reset_index(drop=True)
+
+
+class FoldedIdIndex:
+    """
+    Ids of folded rows that have aged out of the store's late-arrival window
+
+    Kept in SQLite, keyed by (table, id), so the history of ids lives on
+    disk and is only probed for rows dated before the window.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite file (created if missing); None keeps the index in memory
+        """
+        self.path = None if path is None else Path(path)
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(":memory:" if path is None else str(path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS folded_ids (source TEXT NOT NULL, "
+            "row_id TEXT NOT NULL, PRIMARY KEY (source, row_id)) WITHOUT ROWID"
+        )
+
+    def contains(self, table: str, ids: pd.Series) -> np.ndarray:
+        """Whether each id has been recorded for the table"""
+        if ids.empty:
+            return np.zeros(0, dtype=bool)
+
+        keys = ids.astype(str)
+        self._conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS probe (row_id TEXT PRIMARY KEY)"
+        )
+        self._conn.execute("DELETE FROM probe")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO probe VALUES (?)", ((key,) for key in keys)
+        )
+        found = [
+            row_id
+            for (row_id,) in self._conn.execute(
+                "SELECT probe.row_id FROM probe JOIN folded_ids "
+                "ON folded_ids.source = ? AND folded_ids.row_id = probe.row_id",
+                (table,),
+            )
+        ]
+        return keys.isin(found).to_numpy()
+
+    def add(self, table: str, ids: pd.Series) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO folded_ids VALUES (?, ?)",
+            ((table, key) for key in ids.astype(str)),
+        )
+
+    def count(self, table: str) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM folded_ids WHERE source = ?", (table,)
+        ).fetchone()[0]
+
+    def save(self, path: Path) -> None:
+        """Commit in place, or copy the index to another file atomically"""
+        self._conn.commit()
+        path = Path(path)
+        if self.path is not None and path.resolve() == self.path.resolve():
+            return
+
+        staging = path.with_name(f".{path.name}.tmp")
+        staging.unlink(missing_ok=True)
+        target = sqlite3.connect(str(staging))
+        try:
+            self._conn.backup(target)
+        finally:
+            target.close()
+        os.replace(staging, path)
+
+
+def folded_id_path(filepath: Union[str, Path]) -> Path:
+    """SQLite side store saved next to an aggregate store file"""
+    return Path(filepath).with_suffix(".ids.sqlite")
+
+
+class AggregateStore:
+    """
+    Persistent payment/maintenance aggregates updated with unseen rows
+
+    Each table keeps a date watermark (the latest date folded) and, in
+    memory, the ids of folded rows dated within late_window_days of it.
+    update() folds a row unless its id was folded before: rows in the
+    window are checked against those ids, older (backdated) rows against
+    a FoldedIdIndex on disk that receives ids as they age out of the
+    window. A nightly build therefore costs a hash lookup per recent row,
+    a keyed probe per late row and the aggregation of new rows, with
+    memory bounded by the window rather than the history. A row that was
+    already folded is never folded again, so amending one needs a rebuild
+    from a fresh store.
+    """
+
+    def __init__(
+        self,
+        id_columns: Optional[Dict[str, str]] = None,
+        late_window_days: int = DEFAULT_LATE_WINDOW_DAYS,
+        id_index_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            id_columns: Row id column per table (default: DEFAULT_ID_COLUMNS)
+            late_window_days: Days before the watermark whose ids stay in memory
+            id_index_path: SQLite file for ids older than the window
+                (default: in memory until save())
+        """
+        if late_window_days < 0:
+            raise ValueError("late_window_days must be >= 0")
+
+        self.id_columns = {**DEFAULT_ID_COLUMNS, **(id_columns or {})}
+        self.late_window = pd.Timedelta(days=late_window_days)
+        self.watermarks: Dict[str, Optional[pd.Timestamp]] = {
+            "payments": None,
+            "maintenance": None,
+        }
+        # Folded row id -> row date, for rows inside each table's window
+        self.window_ids: Dict[str, pd.Series] = {
+            "payments": pd.Series(dtype="datetime64[ns]"),
+            "maintenance": pd.Series(dtype="datetime64[ns]"),
+        }
+        self.id_index = FoldedIdIndex(id_index_path)
+        self.payment_state = pd.DataFrame()
+        self.maintenance_state = pd.DataFrame()
+        self.updated_at: Optional[str] = None
+
+    def update(
+        self,
+        payments: Optional[pd.DataFrame] = None,
+        maintenance: Optional[pd.DataFrame] = None,
+    ) -> Dict[str, int]:
+        """
+        Fold payment and maintenance rows not folded before
+
+        Args:
+            payments: Payment rows (full history or just the latest extract)
+            maintenance: Maintenance request rows
+
+        Returns:
+            Number of rows folded per table
+        """
+        folded = {}
+
+        if payments is not None:
+            new_rows = self._new_rows("payments", payments)
+            if len(new_rows):
+                self.payment_state = combine_payment_partials(
+                    self.payment_state, payment_partials(new_rows)
+                )
+            folded["payments"] = len(new_rows)
+
+        if maintenance is not None:
+            new_rows = self._new_rows("maintenance", maintenance)
+            if len(new_rows):
+                self.maintenance_state = combine_maintenance_partials(
+                    self.maintenance_state, maintenance_partials(new_rows)
+                )
+            folded["maintenance"] = len(new_rows)
+
+        self.updated_at = datetime.utcnow().isoformat()
+        return folded
+
+    def folded_count(self, table: str) -> int:
+        """Rows of a table folded so far"""
+        return len(self.window_ids[table]) + self.id_index.count(table)
+
+    def _new_rows(self, table: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows whose id the store has not folded yet; records their ids"""
+        column = self.id_columns[table]
+        if column not in df.columns:
+            raise ValueError(f"{table} rows have no id column '{column}'")
+        date_column = AGGREGATE_DATE_COLUMNS[table]
+        if date_column not in df.columns:
+            raise ValueError(f"{table} rows have no date column '{date_column}'")
+
+        ids = df[column]
+        if ids.isna().any():
+            raise ValueError(f"{table} rows have missing '{column}' values")
+        dates = pd.to_datetime(df[date_column])
+
+        # Ids repeated within the batch count once, like re-sent rows
+        is_new = ~ids.duplicated().to_numpy()
+        watermark = self.watermarks[table]
+        if watermark is not None:
+            in_window = (dates >= watermark - self.late_window).to_numpy()
+            window = self.window_ids[table]
+            is_new[in_window] &= ~ids[in_window].isin(window.index).to_numpy()
+            is_new[~in_window] &= ~self.id_index.contains(table, ids[~in_window])
+
+        new_ids = pd.Series(dates[is_new].to_numpy(), index=ids[is_new].to_numpy())
+        self._record(table, new_ids)
+        return df[is_new]
+
+    def _record(self, table: str, new_ids: pd.Series) -> None:
+        """Advance the watermark and move ids that left the window to disk"""
+        latest = new_ids.max()
+        watermark = self.watermarks[table]
+        if pd.notna(latest) and (watermark is None or latest > watermark):
+            watermark = self.watermarks[table] = latest
+        if watermark is None:
+            self.id_index.add(table, new_ids.index.to_series())
+            return
+
+        ids = pd.concat([self.window_ids[table], new_ids])
+        # Undated rows can't age out, so they go straight to disk
+        keep = (ids >= watermark - self.late_window).to_numpy()
+        self.id_index.add(table, ids.index[~keep].to_series())
+        self.window_ids[table] = ids[keep]
+
+    def payment_aggregates(self) -> pd.DataFrame:
+        """Per-lease payment aggregates, as _merge_data_sources computes them"""
+        if self.payment_state.empty:
+            return pd.DataFrame(columns=["lease_id"] + PAYMENT_AGGREGATE_COLUMNS)
+        return finalize_payments(self.payment_state)
+
+    def maintenance_aggregates(self) -> pd.DataFrame:
+        """Per-property maintenance aggregates, as _merge_data_sources computes them"""
+        if self.maintenance_state.empty:
+            return pd.DataFrame(columns=["property_id"] + MAINTENANCE_AGGREGATE_COLUMNS)
+        return finalize_maintenance(self.maintenance_state)
+
+    def save(self, filepath: Path) -> None:
+        """
+        Save aggregate state and folded row ids to disk
+
+        Ids older than the window go to folded_id_path(filepath).
+
+        Args:
+            filepath: Path to save the store
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.id_index.save(folded_id_path(filepath))
+
+        store_data = {
+            "format_version": AGGREGATE_STORE_FORMAT_VERSION,
+            "id_columns": self.id_columns,
+            "late_window_days": self.late_window.days,
+            "watermarks": self.watermarks,
+            "window_ids": self.window_ids,
+            "payment_state": self.payment_state,
+            "maintenance_state": self.maintenance_state,
+            "updated_at": self.updated_at,
+        }
+
+        joblib.dump(store_data, filepath)
+        print(f"Aggregate store saved to {filepath}")
+
+    @classmethod
+    def load(cls, filepath: Path) -> "AggregateStore":
+        """
+        Load aggregate state from disk
+
+        Further updates write old ids to the side store saved with it.
+
+        Args:
+            filepath: Path to saved store
+
+        Returns:
+            Store ready for further update() calls
+        """
+        store_data = joblib.load(filepath)
+
+        format_version = store_data.get("format_version")
+        if format_version != AGGREGATE_STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported aggregate store format {format_version} "
+                f"(expected {AGGREGATE_STORE_FORMAT_VERSION})"
+            )
+
+        id_index_path = folded_id_path(filepath)
+        if not id_index_path.exists():
+            raise ValueError(f"Aggregate store {filepath} has no id index")
+
+        instance = cls(
+            store_data["id_columns"],
+            late_window_days=store_data["late_window_days"],
+            id_index_path=id_index_path,
+        )
+        instance.watermarks = store_data["watermarks"]
+        instance.window_ids = store_data["window_ids"]
+        instance.payment_state = store_data["payment_state"]
+        instance.maintenance_state = store_data["maintenance_state"]
+        instance.updated_at = store_data["updated_at"]
+
+        return instance
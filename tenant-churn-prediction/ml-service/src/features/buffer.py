@@ -0,0 +1,161 @@
+"""
+Columnar Feature Buffer
+Preallocated, fixed-schema storage for one feature matrix
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Dtype policy: float32 numerics, int8 0/1 flags, categoricals as pandas
+# Categorical (int8 codes for small vocabularies) over int32 working codes
+NUMERIC_DTYPE = np.float32
+FLAG_DTYPE = np.int8
+CODE_DTYPE = np.int32
+
+
+class FeatureBuffer:
+    """
+    Preallocated columnar storage for a feature matrix
+
+    Numeric features live in one column-major float32 block, 0/1 flags in an
+    int8 block and categorical features in an int32 code block. Feature
+    groups write their columns in place, missing-value handling and scaling
+    run on the numeric block, and the final DataFrame wraps the numeric and
+    flag blocks without copying them.
+    """
+
+    def __init__(
+        self,
+        index: pd.Index,
+        numeric_names: Iterable[str],
+        categorical_names: Iterable[str],
+        flag_names: Iterable[str] = (),
+    ):
+        self.index = index
+        self.numeric_names: List[str] = list(numeric_names)
+        self.flag_names: List[str] = list(flag_names)
+        self.categorical_names: List[str] = list(categorical_names)
+        self._numeric_positions = {n: i for i, n in enumerate(self.numeric_names)}
+        self._flag_positions = {n: i for i, n in enumerate(self.flag_names)}
+        self._code_positions = {n: i for i, n in enumerate(self.categorical_names)}
+
+        n_rows = len(index)
+        self.numeric = np.empty(
+            (n_rows, len(self.numeric_names)), dtype=NUMERIC_DTYPE, order="F"
+        )
+        self.flags = np.empty(
+            (n_rows, len(self.flag_names)), dtype=FLAG_DTYPE, order="F"
+        )
+        self.codes = np.empty(
+            (n_rows, len(self.categorical_names)), dtype=CODE_DTYPE, order="F"
+        )
+
+    @property
+    def names(self) -> List[str]:
+        """Output column order: numerics, flags, then categoricals"""
+        return self.numeric_names + self.flag_names + self.categorical_names
+
+    @property
+    def computed_names(self) -> List[str]:
+        """Features evaluated from the registry (numerics and flags)"""
+        return self.numeric_names + self.flag_names
+
+    def __contains__(self, name: str) -> bool:
+        return (
+            name in self._numeric_positions
+            or name in self._flag_positions
+            or name in self._code_positions
+        )
+
+    def __setitem__(self, name: str, values) -> None:
+        """Write a numeric or flag feature column (scalars broadcast)"""
+        if name in self._flag_positions:
+            self.flags[:, self._flag_positions[name]] = np.asarray(values)
+        else:
+            self.numeric[:, self._numeric_positions[name]] = np.asarray(values)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """View of a numeric or flag feature column"""
+        if name in self._flag_positions:
+            return self.flags[:, self._flag_positions[name]]
+        return self.numeric[:, self._numeric_positions[name]]
+
+    def set_codes(self, name: str, codes) -> None:
+        """Write integer codes for a categorical feature"""
+        self.codes[:, self._code_positions[name]] = codes
+
+    def medians(self) -> Dict[str, float]:
+        """Median of each numeric column, ignoring missing values"""
+        return {
+            name: float(pd.Series(self[name], copy=False).median())
+            for name in self.numeric_names
+        }
+
+    def fill_missing(self, fill_values: Dict[str, float]) -> None:
+        """Fill NaNs in place, falling back to the column median"""
+        for name in self.numeric_names:
+            column = self[name]
+            missing = np.isnan(column)
+            if missing.any():
+                if name in fill_values:
+                    value = fill_values[name]
+                else:
+                    value = pd.Series(column, copy=False).median()
+                column[missing] = value
+
+    def scale(self, names: List[str], mean: np.ndarray, scale: np.ndarray) -> None:
+        """Standardize the given numeric columns in place"""
+        for name, column_mean, column_scale in zip(names, mean, scale):
+            column = self[name]
+            column -= NUMERIC_DTYPE(column_mean)
+            column /= NUMERIC_DTYPE(column_scale)
+
+    def to_frame(
+        self, categories: Optional[Dict[str, Iterable[str]]] = None
+    ) -> pd.DataFrame:
+        """
+        Feature matrix sharing the numeric and flag blocks
+
+        Args:
+            categories: Fitted classes per categorical feature. Codes of these
+                columns become pandas Categoricals with fixed categories
+                (UNSEEN_CODE is the missing value); others stay int32 codes.
+
+        Returns:
+            Numeric, flag and categorical columns, in that order
+        """
+        numeric = pd.DataFrame(
+            self.numeric, index=self.index, columns=self.numeric_names, copy=False
+        )
+        flags = pd.DataFrame(
+            self.flags, index=self.index, columns=self.flag_names, copy=False
+        )
+        codes = pd.DataFrame(
+            self.codes, index=self.index, columns=self.categorical_names, copy=False
+        )
+        for name, classes in (categories or {}).items():
+            if name in self._code_positions:
+                codes[name] = pd.Categorical.from_codes(
+                    codes[name].to_numpy(), categories=pd.Index(classes)
+                )
+        return pd.concat([numeric, flags, codes], axis=1, copy=False)
+
+
+def bytes_per_row(features: pd.DataFrame) -> float:
+    """Feature matrix memory per row, including categorical codes"""
+    if len(features) == 0:
+        return 0.0
+    return features.memory_usage(index=False, deep=True).sum() / len(features)
+
+
+def has_more_than_two_values(column: np.ndarray) -> bool:
+    """Cheap nunique() > 2 check that stops after the third distinct value"""
+    values = column[~np.isnan(column)]
+    if len(values) == 0:
+        return False
+    rest = values[values != values[0]]
+    if len(rest) == 0:
+        return False
+    return bool(np.any(rest != rest[0]))
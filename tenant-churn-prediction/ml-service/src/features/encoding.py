@@ -0,0 +1,63 @@
+"""
+Categorical Encoding
+Fitted category vocabularies with vectorized lookup for inference
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+UNSEEN_CODE = -1
+
+
+class CategoricalVocabulary:
+    """
+    Fitted vocabulary for a single categorical column
+
+    Codes match ``LabelEncoder``: each category maps to its position in the
+    sorted class list. The classes are compiled into a hash index so a whole
+    column is encoded in one vectorized lookup, with unseen values mapped to
+    ``UNSEEN_CODE``.
+    """
+
+    def __init__(self, classes: Iterable[str]):
+        self.classes = np.asarray(list(classes), dtype=object)
+        self._index: Optional[pd.Index] = None
+
+    @classmethod
+    def from_label_encoder(cls, encoder: LabelEncoder) -> "CategoricalVocabulary":
+        """Compile a vocabulary from a fitted LabelEncoder"""
+        return cls(encoder.classes_)
+
+    @property
+    def index(self) -> pd.Index:
+        """Hash index over the classes (built on first use)"""
+        if self._index is None:
+            self._index = pd.Index(self.classes)
+        return self._index
+
+    def encode(self, values: pd.Series) -> np.ndarray:
+        """
+        Encode a column of values
+
+        Args:
+            values: Raw categorical values (converted to str like training)
+
+        Returns:
+            int64 codes, UNSEEN_CODE for categories not in the vocabulary
+        """
+        keys = values.astype(str).to_numpy()
+        return self.index.get_indexer(keys).astype(np.int64, copy=False)
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __getstate__(self):
+        # The hash index is cheap to rebuild; keep pickles small
+        return {"classes": self.classes}
+
+    def __setstate__(self, state):
+        self.classes = state["classes"]
+        self._index = None
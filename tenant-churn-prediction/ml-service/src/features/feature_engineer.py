@@ -4,22 +4,71 @@ Transforms raw data into ML-ready features
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
 
+import joblib
 import numpy as np
 import pandas as pd
 from category_encoders import TargetEncoder
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 
+from .aggregates import (
+    MAINTENANCE_AGGREGATE_COLUMNS,
+    PAYMENT_AGGREGATE_COLUMNS,
+    AggregateStore,
+    aggregate_maintenance,
+    aggregate_payments,
+)
+from .buffer import FeatureBuffer, has_more_than_two_values
+from .encoding import UNSEEN_CODE, CategoricalVocabulary
+from .registry import FrameColumns
+from .tenant_features import FEATURE_REGISTRY, default_feature_set
+
+# Bump when the saved pipeline layout changes
+PIPELINE_FORMAT_VERSION = 3
+
+# Aggregates produced by _merge_data_sources that feature groups read directly
+MERGED_AGGREGATE_COLUMNS = PAYMENT_AGGREGATE_COLUMNS + MAINTENANCE_AGGREGATE_COLUMNS
+
+# Rows per StandardScaler.partial_fit call when fitting on the buffer
+SCALER_FIT_CHUNK_ROWS = 262_144
+
+
+def fit_standard_scaler(chunks: Iterable[np.ndarray]) -> StandardScaler:
+    """
+    Fit a StandardScaler over row chunks
+
+    Chunks are made C-contiguous so the fitted statistics depend only on the
+    chunk values, not on how the caller laid them out.
+    """
+    scaler = StandardScaler()
+    for chunk in chunks:
+        scaler.partial_fit(np.ascontiguousarray(chunk))
+    return scaler
+
 
 class TenantFeatureEngineer:
     """Feature engineering for tenant churn prediction"""
 
-    def __init__(self):
+    def __init__(self, feature_set: Optional[List[str]] = None):
+        """
+        Args:
+            feature_set: Features to build at training time (default: all
+                registered features). Only these and their inputs are computed.
+        """
+        if feature_set is not None:
+            self._validate_feature_set(feature_set)
+        self.feature_set = feature_set
         self.scalers: Dict[str, StandardScaler] = {}
         self.encoders: Dict[str, LabelEncoder] = {}
+        self.vocabularies: Dict[str, CategoricalVocabulary] = {}
         self.target_encoder: Optional[TargetEncoder] = None
         self.feature_names: List[str] = []
+        self.scale_columns: List[str] = []
+        self.fill_values: Dict[str, Any] = {}
+        self.include_market_features: bool = False
+        self._row_transformer = None
 
     def engineer_features(
         self,
@@ -30,6 +79,8 @@ class TenantFeatureEngineer:
         maintenance: pd.DataFrame,
         market_data: pd.DataFrame = None,
         is_training: bool = True,
+        aggregate_store: Optional[AggregateStore] = None,
+        n_workers: int = 1,
     ) -> pd.DataFrame:
         """
         Generate all features for churn prediction
@@ -42,54 +93,184 @@ class TenantFeatureEngineer:
             maintenance: Maintenance requests
             market_data: Market/neighborhood analytics
             is_training: Whether this is for training (fits encoders) or prediction
+            aggregate_store: Incremental payment/maintenance aggregates. New
+                payment and maintenance rows are folded in and the stored
+                aggregates are merged instead of regrouping the full history.
+            n_workers: Worker processes for the merge and feature computation.
+                Leases are partitioned by property; the result is the same
+                as the single-process build.
 
         Returns:
             Feature matrix
         """
+        if n_workers > 1:
+            if aggregate_store is not None:
+                raise ValueError("n_workers > 1 does not support an aggregate store")
+
+            from .parallel import ParallelFeatureBuild
+
+            return ParallelFeatureBuild(self, n_workers).run(
+                tenants,
+                leases,
+                payments,
+                properties,
+                maintenance,
+                market_data,
+                is_training=is_training,
+            )
+
+        if aggregate_store is not None:
+            aggregate_store.update(payments, maintenance)
+
         # Merge all data sources
         df = self._merge_data_sources(
-            tenants, leases, payments, properties, maintenance, market_data
+            tenants,
+            leases,
+            payments,
+            properties,
+            maintenance,
+            market_data,
+            aggregate_store=aggregate_store,
         )
 
-        # Generate feature categories
-        features = pd.DataFrame(index=df.index)
-
-        # 1. Tenant Behavior Features (15 features)
-        features = pd.concat(
-            [features, self._tenant_behavior_features(df, payments, maintenance)],
-            axis=1,
+        return self._transform(
+            df,
+            include_market_features=market_data is not None,
+            is_training=is_training,
         )
 
-        # 2. Property Characteristics (12 features)
-        features = pd.concat(
-            [features, self._property_features(df, properties)], axis=1
-        )
+    def transform_merged(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform already-merged lease rows using the fitted pipeline state
 
-        # 3. Financial Features (8 features)
-        features = pd.concat([features, self._financial_features(df, payments)], axis=1)
+        Used at serving time where a request carries one flat row per lease
+        (tenant, property and payment/maintenance aggregates already joined).
+        Aggregate columns missing from the rows are treated as missing values.
 
-        # 4. Market Condition Features (10 features)
-        if market_data is not None:
-            features = pd.concat(
-                [features, self._market_features(df, market_data)], axis=1
+        Args:
+            df: One row per lease with merged source columns
+
+        Returns:
+            Feature matrix in the fitted feature order
+        """
+        if not self.is_fitted:
+            raise ValueError(
+                "Feature pipeline not fitted. Run engineer_features() in "
+                "training mode or load() a saved pipeline first."
             )
 
-        # 5. Temporal Features (5 features)
-        features = pd.concat([features, self._temporal_features(df, leases)], axis=1)
+        missing = [col for col in MERGED_AGGREGATE_COLUMNS if col not in df.columns]
+        if missing:
+            df = df.assign(**{col: np.nan for col in missing})
+
+        return self._transform(
+            df,
+            include_market_features=self.include_market_features,
+            is_training=False,
+        )
+
+    def transform_records(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Low-latency transform for a few merged lease rows
+
+        Same values as transform_merged(), computed with NumPy on row dicts
+        instead of DataFrame groups. Intended for request-sized batches.
+
+        Args:
+            records: One dict per lease with merged source columns
+
+        Returns:
+            Feature matrix in the fitted feature order
+        """
+        from .row_transform import RowFeatureTransformer
+
+        if self._row_transformer is None:
+            self._row_transformer = RowFeatureTransformer(self)
+        return self._row_transformer.transform(records)
+
+    def _transform(
+        self, df: pd.DataFrame, include_market_features: bool, is_training: bool
+    ) -> pd.DataFrame:
+        """Build, clean, encode and scale features from merged lease rows"""
+
+        # One preallocated buffer with a fixed schema; groups write in place
+        buffer = self._allocate_buffer(df.index, include_market_features, is_training)
+
+        # Numeric features from the registry; shared inputs are computed once
+        self._compute_numeric_features(df, buffer)
+
+        return self._finish_features(df, buffer, include_market_features, is_training)
+
+    def _finish_features(
+        self,
+        df: pd.DataFrame,
+        buffer: FeatureBuffer,
+        include_market_features: bool,
+        is_training: bool,
+    ) -> pd.DataFrame:
+        """Fill, encode and scale a buffer of raw numeric features"""
 
         # Handle missing values
-        features = self._handle_missing_values(features)
+        self._handle_missing_values(buffer, is_training)
 
         # Encode categorical variables
-        features = self._encode_categoricals(features, is_training)
+        self._encode_categoricals(df, buffer, is_training)
 
         # Scale numerical features
-        features = self._scale_features(features, is_training)
+        self._scale_features(buffer, is_training)
 
-        self.feature_names = list(features.columns)
+        features = buffer.to_frame(self.categories())
+
+        if is_training:
+            self.feature_names = list(features.columns)
+            self.include_market_features = include_market_features
+            self._row_transformer = None
 
         return features
 
+    def _allocate_buffer(
+        self, index: pd.Index, include_market_features: bool, is_training: bool
+    ) -> FeatureBuffer:
+        """Allocate the feature buffer for the fitted (or default) schema"""
+        if self.feature_names and not is_training:
+            return self.make_buffer(index)
+
+        names = self.feature_set or default_feature_set(include_market_features)
+        return self._buffer_for(index, names)
+
+    def make_buffer(self, index: pd.Index) -> FeatureBuffer:
+        """Empty buffer laid out in the fitted feature order"""
+        return self._buffer_for(index, self.feature_names)
+
+    @staticmethod
+    def _buffer_for(index: pd.Index, names: List[str]) -> FeatureBuffer:
+        """Buffer with numeric features first, then flags, then categorical codes"""
+        specs = [FEATURE_REGISTRY[n] for n in names]
+        return FeatureBuffer(
+            index,
+            [s.name for s in specs if not (s.is_categorical or s.is_flag)],
+            [s.name for s in specs if s.is_categorical],
+            flag_names=[s.name for s in specs if s.is_flag],
+        )
+
+    def categories(self) -> Dict[str, List[str]]:
+        """Fitted classes per categorical feature, in code order"""
+        return {
+            col: list(self._get_vocabulary(col).classes)
+            for col in dict.fromkeys([*self.vocabularies, *self.encoders])
+        }
+
+    @staticmethod
+    def _validate_feature_set(feature_set: List[str]) -> None:
+        """Reject duplicate, unknown and intermediate-only feature names"""
+        if len(set(feature_set)) != len(feature_set):
+            raise ValueError("Feature set contains duplicate names")
+
+        output_features = set(FEATURE_REGISTRY.names())
+        unknown = [n for n in feature_set if n not in output_features]
+        if unknown:
+            raise ValueError(f"Unknown features in feature set: {unknown}")
+
     def _merge_data_sources(
         self,
         tenants: pd.DataFrame,
@@ -98,6 +279,7 @@ class TenantFeatureEngineer:
         properties: pd.DataFrame,
         maintenance: pd.DataFrame,
         market_data: pd.DataFrame = None,
+        aggregate_store: Optional[AggregateStore] = None,
     ) -> pd.DataFrame:
         """Merge all data sources on common keys"""
 
@@ -113,48 +295,17 @@ class TenantFeatureEngineer:
         )
 
         # Aggregate payments per lease
-        payment_agg = (
-            payments.groupby("lease_id")
-            .agg(
-                {
-                    "amount": ["sum", "mean", "std", "count"],
-                    "days_late": ["mean", "max", "sum"],
-                    "payment_date": "max",
-                }
-            )
-            .reset_index()
-        )
-        payment_agg.columns = [
-            "lease_id",
-            "total_paid",
-            "avg_payment",
-            "payment_std",
-            "payment_count",
-            "avg_days_late",
-            "max_days_late",
-            "total_days_late",
-            "last_payment_date",
-        ]
+        if aggregate_store is not None:
+            payment_agg = aggregate_store.payment_aggregates()
+        else:
+            payment_agg = aggregate_payments(payments)
         df = df.merge(payment_agg, on="lease_id", how="left")
 
-        # Aggregate maintenance per lease
-        maint_agg = (
-            maintenance.groupby("property_id")
-            .agg(
-                {
-                    "request_id": "count",
-                    "priority": lambda x: (x == "HIGH").sum(),
-                    "resolution_days": "mean",
-                }
-            )
-            .reset_index()
-        )
-        maint_agg.columns = [
-            "property_id",
-            "maintenance_count",
-            "high_priority_count",
-            "avg_resolution_days",
-        ]
+        # Aggregate maintenance per property (one vectorized groupby pass)
+        if aggregate_store is not None:
+            maint_agg = aggregate_store.maintenance_aggregates()
+        else:
+            maint_agg = aggregate_maintenance(maintenance)
         df = df.merge(maint_agg, on="property_id", how="left")
 
         # Join market data if available
@@ -165,271 +316,181 @@ class TenantFeatureEngineer:
 
         return df
 
-    def _tenant_behavior_features(
-        self, df: pd.DataFrame, payments: pd.DataFrame, maintenance: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Generate tenant behavior-based features"""
-
-        features = pd.DataFrame(index=df.index)
-
-        # Payment behavior
-        features["avg_days_late"] = df["avg_days_late"].fillna(0)
-        features["max_days_late"] = df["max_days_late"].fillna(0)
-        features["late_payment_rate"] = (
-            df["total_days_late"] / df["payment_count"]
-        ).fillna(0)
-        features["payment_consistency"] = 1 / (1 + df["payment_std"].fillna(0))
-
-        # Payment recency
-        if "last_payment_date" in df.columns:
-            features["days_since_last_payment"] = (
-                pd.to_datetime("today") - pd.to_datetime(df["last_payment_date"])
-            ).dt.days
-        else:
-            features["days_since_last_payment"] = 0
-
-        # Auto-pay indicator
-        features["has_autopay"] = df.get("autopay_enabled", 0).astype(int)
-
-        # Portal engagement
-        features["portal_logins_per_month"] = df.get("portal_login_count", 0) / (
-            df.get("tenure_months", 1).clip(lower=1)
-        )
-
-        # Maintenance request behavior
-        features["maintenance_requests_per_year"] = df["maintenance_count"].fillna(
-            0
-        ) / (df.get("tenure_months", 12) / 12).clip(lower=1)
-        features["high_priority_requests"] = df["high_priority_count"].fillna(0)
-
-        # Communication responsiveness
-        features["avg_response_time_hours"] = df.get("avg_response_time_hours", 24)
-        features["missed_communication_count"] = df.get("missed_communication_count", 0)
-
-        # Complaint/escalation history
-        features["complaint_count"] = df.get("complaint_count", 0)
-        features["escalation_count"] = df.get("escalation_count", 0)
-
-        # Renewal history
-        features["previous_renewals"] = df.get("renewal_count", 0)
-        features["tenure_months"] = df.get("tenure_months", 0)
-
-        return features
-
-    def _property_features(
-        self, df: pd.DataFrame, properties: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Generate property characteristic features"""
-
-        features = pd.DataFrame(index=df.index)
+    def _compute_numeric_features(
+        self, df: pd.DataFrame, features: FeatureBuffer
+    ) -> None:
+        """Evaluate the buffer's numeric and flag features from merged lease rows"""
+        values = FEATURE_REGISTRY.evaluate(features.computed_names, FrameColumns(df))
+        for name, value in values.items():
+            features[name] = value
 
-        # Physical characteristics
-        features["square_feet"] = df.get("square_feet", 1500)
-        features["bedrooms"] = df.get("bedrooms", 3)
-        features["bathrooms"] = df.get("bathrooms", 2)
-        features["property_age"] = pd.to_datetime("today").year - df.get(
-            "year_built", 2000
-        )
-
-        # Location quality score (1-10)
-        features["location_score"] = df.get("location_score", 5)
-        features["school_rating"] = df.get("school_rating", 5)
-
-        # Amenities
-        features["has_garage"] = df.get("garage", False).astype(int)
-        features["has_yard"] = df.get("yard", False).astype(int)
-        features["has_ac"] = df.get("air_conditioning", False).astype(int)
-
-        # Property condition (1-5 scale)
-        features["property_condition"] = df.get("condition_rating", 3)
-
-        # Recent renovations
-        features["years_since_renovation"] = df.get("years_since_renovation", 10)
-
-        # Neighborhood type (encoded later)
-        features["neighborhood_type"] = df.get("neighborhood_type", "suburban")
-
-        return features
-
-    def _financial_features(
-        self, df: pd.DataFrame, payments: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Generate financial/economic features"""
-
-        features = pd.DataFrame(index=df.index)
+    def _handle_missing_values(
+        self, features: FeatureBuffer, is_training: bool
+    ) -> None:
+        """Fill missing numeric values with (training) medians"""
 
-        # Rent economics
-        features["monthly_rent"] = df.get("monthly_rent", 2000)
-        features["rent_per_sqft"] = features["monthly_rent"] / df.get(
-            "square_feet", 1500
-        )
-
-        # Rent-to-income ratio (if income data available)
-        if "annual_income" in df.columns:
-            features["rent_to_income_ratio"] = (
-                features["monthly_rent"] * 12 / df["annual_income"]
-            ).clip(upper=1.0)
-        else:
-            features["rent_to_income_ratio"] = 0.30  # Assume 30% default
-
-        # Rent changes
-        features["rent_increase_pct"] = df.get("last_rent_increase_pct", 0)
-        features["total_rent_increases"] = df.get("rent_increase_count", 0)
-
-        # Payment method (encoded later)
-        features["payment_method"] = df.get("primary_payment_method", "ach")
-
-        # Security deposit
-        features["security_deposit_months"] = (
-            df.get("security_deposit", 2000) / features["monthly_rent"]
-        )
-
-        # Late fees incurred
-        features["total_late_fees"] = df.get("total_late_fees", 0)
-
-        return features
-
-    def _market_features(
-        self, df: pd.DataFrame, market_data: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Generate market condition features"""
-
-        features = pd.DataFrame(index=df.index)
-
-        # Market rent comparison
-        features["market_rent_median"] = df.get("market_rent_median", 2000)
-        features["rent_vs_market"] = (
-            df.get("monthly_rent", 2000) / features["market_rent_median"]
-        )
-
-        # Vacancy rates
-        features["neighborhood_vacancy_rate"] = df.get("vacancy_rate", 0.05)
-
-        # Rent trends
-        features["market_rent_growth_1yr"] = df.get("rent_growth_1yr_pct", 0.03)
-        features["market_rent_growth_3yr"] = df.get("rent_growth_3yr_pct", 0.10)
-
-        # Supply/demand indicators
-        features["new_listings_count"] = df.get("new_listings_30d", 10)
-        features["avg_days_on_market"] = df.get("avg_days_on_market", 30)
-
-        # Demographics
-        features["median_household_income"] = df.get("median_hh_income", 75000)
-        features["population_growth_rate"] = df.get("population_growth_rate", 0.01)
+        if is_training:
+            # Remember training medians so serving fills the same way
+            self.fill_values = features.medians()
 
-        # Competition
-        features["competitor_properties_1mi"] = df.get("competitor_count_1mi", 50)
+        features.fill_missing(self.fill_values)
 
-        return features
+    def _encode_categoricals(
+        self, df: pd.DataFrame, features: FeatureBuffer, is_training: bool
+    ) -> None:
+        """Fill categorical values with their mode and write integer codes"""
 
-    def _temporal_features(
-        self, df: pd.DataFrame, leases: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Generate time-based features"""
+        for col in features.categorical_names:
+            values = self._categorical_values(df, col)
+            if is_training:
+                mode = values.mode()
+                if not mode.empty:
+                    self.fill_values[col] = mode[0]
 
-        features = pd.DataFrame(index=df.index)
+            if values.isna().any():
+                if col in self.fill_values:
+                    value = self.fill_values[col]
+                else:
+                    value = values.mode()[0]
+                values = values.fillna(value)
 
-        # Days until lease expiration
-        if "lease_end_date" in df.columns:
-            features["days_to_expiration"] = (
-                pd.to_datetime(df["lease_end_date"]) - pd.to_datetime("today")
-            ).dt.days
-        else:
-            features["days_to_expiration"] = 90
-
-        # Lease duration
-        features["lease_term_months"] = df.get("lease_term_months", 12)
-
-        # Seasonality
-        if "lease_end_date" in df.columns:
-            lease_end = pd.to_datetime(df["lease_end_date"])
-            features["lease_end_month"] = lease_end.dt.month
-            features["is_summer_expiration"] = lease_end.dt.month.isin(
-                [6, 7, 8]
-            ).astype(int)
-        else:
-            features["lease_end_month"] = 1
-            features["is_summer_expiration"] = 0
+            features.set_codes(col, self._encode_column(col, values, is_training))
 
-        # Tenure
-        features["tenure_months"] = df.get("tenure_months", 12)
+    @staticmethod
+    def _categorical_sources(df: pd.DataFrame, features: FeatureBuffer) -> pd.DataFrame:
+        """Source columns the buffer's categorical features read, where present"""
+        sources = [
+            FEATURE_REGISTRY[col].inputs[0] for col in features.categorical_names
+        ]
+        return df[[col for col in dict.fromkeys(sources) if col in df.columns]]
 
-        return features
+    def _categorical_values(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Raw (unfilled) source values of a categorical feature"""
+        spec = FEATURE_REGISTRY[col]
+        return self._column(df, spec.inputs[0], spec.default)
 
-    def _handle_missing_values(self, features: pd.DataFrame) -> pd.DataFrame:
-        """Handle missing values with appropriate strategies"""
+    def _encode_column(
+        self, col: str, values: pd.Series, is_training: bool
+    ) -> np.ndarray:
+        """Encode one categorical column"""
 
-        # Numerical: fill with median
-        numerical_cols = features.select_dtypes(include=[np.number]).columns
-        for col in numerical_cols:
-            if features[col].isna().any():
-                features[col].fillna(features[col].median(), inplace=True)
+        if is_training:
+            encoder = LabelEncoder()
+            codes = encoder.fit_transform(values.astype(str))
+            self.encoders[col] = encoder
+            self.vocabularies[col] = CategoricalVocabulary.from_label_encoder(encoder)
+            return codes
+
+        vocabulary = self._get_vocabulary(col)
+        if vocabulary is None:
+            return np.full(len(values), UNSEEN_CODE, dtype=np.int64)
+
+        # Vectorized lookup; unseen categories map to -1
+        return vocabulary.encode(values)
+
+    def _get_vocabulary(self, col: str) -> Optional[CategoricalVocabulary]:
+        """Return the compiled vocabulary for a column, building it if needed"""
+        if col not in self.vocabularies and col in self.encoders:
+            self.vocabularies[col] = CategoricalVocabulary.from_label_encoder(
+                self.encoders[col]
+            )
+        return self.vocabularies.get(col)
 
-        # Categorical: fill with mode
-        categorical_cols = features.select_dtypes(include=["object"]).columns
-        for col in categorical_cols:
-            if features[col].isna().any():
-                features[col].fillna(features[col].mode()[0], inplace=True)
+    def _scale_features(self, features: FeatureBuffer, is_training: bool) -> None:
+        """Standardize non-binary numeric features in place"""
 
-        return features
+        if is_training:
+            # Select features to scale (exclude binary flags)
+            scale_cols = [
+                col
+                for col in features.numeric_names
+                if has_more_than_two_values(features[col])
+            ]
+
+            # Fit in row chunks so no scaled copy of the block is materialized
+            positions = [features.numeric_names.index(col) for col in scale_cols]
+            chunks = (
+                features.numeric[start : start + SCALER_FIT_CHUNK_ROWS][:, positions]
+                for start in range(0, len(features.index), SCALER_FIT_CHUNK_ROWS)
+            )
+            self.scalers["standard"] = fit_standard_scaler(chunks)
+            self.scale_columns = scale_cols
+
+        # Reuse the training column list; a small batch can't tell which
+        # columns are binary from its own values
+        scaler = self.scalers.get("standard")
+        if scaler is not None and self.scale_columns:
+            features.scale(self.scale_columns, scaler.mean_, scaler.scale_)
+
+    @staticmethod
+    def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+        """Column as a Series, broadcasting the default when it is absent"""
+        if name in df.columns:
+            return df[name]
+        return pd.Series(default, index=df.index)
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether training-time state is available for transforms"""
+        return bool(self.feature_names)
 
-    def _encode_categoricals(
-        self, features: pd.DataFrame, is_training: bool
-    ) -> pd.DataFrame:
-        """Encode categorical variables"""
+    def get_feature_names(self) -> List[str]:
+        """Return list of feature names"""
+        return self.feature_names
 
-        categorical_cols = features.select_dtypes(include=["object"]).columns
+    def save(self, filepath: Path) -> None:
+        """
+        Save fitted pipeline state to disk
 
-        for col in categorical_cols:
-            if is_training:
-                encoder = LabelEncoder()
-                features[col] = encoder.fit_transform(features[col].astype(str))
-                self.encoders[col] = encoder
-            else:
-                if col in self.encoders:
-                    # Handle unseen categories
-                    encoder = self.encoders[col]
-                    features[col] = (
-                        features[col]
-                        .astype(str)
-                        .map(
-                            lambda x: (
-                                encoder.transform([x])[0]
-                                if x in encoder.classes_
-                                else -1
-                            )
-                        )
-                    )
-                else:
-                    features[col] = -1
+        Args:
+            filepath: Path to save the pipeline artifact
+        """
+        if not self.is_fitted:
+            raise ValueError("Feature pipeline not fitted. Nothing to save.")
+
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        pipeline_data = {
+            "format_version": PIPELINE_FORMAT_VERSION,
+            "feature_names": self.feature_names,
+            "scale_columns": self.scale_columns,
+            "fill_values": self.fill_values,
+            "vocabularies": self.vocabularies,
+            "scalers": self.scalers,
+            "include_market_features": self.include_market_features,
+            "saved_at": datetime.utcnow().isoformat(),
+        }
+
+        joblib.dump(pipeline_data, filepath)
+        print(f"Feature pipeline saved to {filepath}")
+
+    @classmethod
+    def load(cls, filepath: Path) -> "TenantFeatureEngineer":
+        """
+        Load fitted pipeline state from disk
 
-        return features
+        Args:
+            filepath: Path to saved pipeline artifact
 
-    def _scale_features(
-        self, features: pd.DataFrame, is_training: bool
-    ) -> pd.DataFrame:
-        """Scale numerical features"""
-
-        # Select features to scale (exclude binary/categorical)
-        scale_cols = [
-            col
-            for col in features.columns
-            if features[col].nunique() > 2
-            and np.issubdtype(features[col].dtype, np.number)
-        ]
+        Returns:
+            Fitted feature engineer ready for transform_merged()
+        """
+        pipeline_data = joblib.load(filepath)
 
-        if is_training:
-            scaler = StandardScaler()
-            features[scale_cols] = scaler.fit_transform(features[scale_cols])
-            self.scalers["standard"] = scaler
-        else:
-            if "standard" in self.scalers:
-                features[scale_cols] = self.scalers["standard"].transform(
-                    features[scale_cols]
-                )
+        format_version = pipeline_data.get("format_version")
+        if format_version != PIPELINE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported feature pipeline format {format_version} "
+                f"(expected {PIPELINE_FORMAT_VERSION})"
+            )
 
-        return features
+        instance = cls()
+        instance.feature_names = pipeline_data["feature_names"]
+        instance.scale_columns = pipeline_data["scale_columns"]
+        instance.fill_values = pipeline_data["fill_values"]
+        instance.vocabularies = pipeline_data["vocabularies"]
+        instance.scalers = pipeline_data["scalers"]
+        instance.include_market_features = pipeline_data["include_market_features"]
 
-    def get_feature_names(self) -> List[str]:
-        """Return list of feature names"""
-        return self.feature_names
+        return instance
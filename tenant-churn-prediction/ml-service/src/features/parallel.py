@@ -0,0 +1,215 @@
+"""
+Parallel Feature Engineering
+Merges and feature computation fanned out over lease partitions in worker processes
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .buffer import FeatureBuffer
+from .feature_engineer import TenantFeatureEngineer
+from .partitioned import partition_of, partition_rows
+
+# More partitions than workers keeps the pool busy when partitions are uneven
+PARTITIONS_PER_WORKER = 4
+
+# Partition shards sliced and in flight per worker; bounds the parent's copies
+SHARDS_IN_FLIGHT_PER_WORKER = 2
+
+# Set once per worker process by _init_worker; read-only afterwards
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    engineer: TenantFeatureEngineer,
+    market_data: Optional[pd.DataFrame],
+    include_market_features: bool,
+    is_training: bool,
+) -> None:
+    _worker_state.update(
+        engineer=engineer,
+        market_data=market_data,
+        include_market_features=include_market_features,
+        is_training=is_training,
+    )
+
+
+def _partition_features(
+    p: int, shard: Dict[str, pd.DataFrame], lease_rows: np.ndarray
+) -> Tuple[int, np.ndarray, np.ndarray, pd.DataFrame]:
+    """Raw numeric and flag features and categorical sources for one partition"""
+    engineer = _worker_state["engineer"]
+
+    merged = engineer._merge_data_sources(
+        shard["tenants"],
+        shard["leases"],
+        shard["payments"],
+        shard["properties"],
+        shard["maintenance"],
+        _worker_state["market_data"],
+    )
+    if len(merged) != len(lease_rows):
+        raise ValueError(
+            "Parallel builds need one tenant, property and market row per "
+            "lease; duplicate join keys found"
+        )
+    merged.index = pd.Index(lease_rows)
+
+    buffer = engineer._allocate_buffer(
+        merged.index,
+        _worker_state["include_market_features"],
+        _worker_state["is_training"],
+    )
+    engineer._compute_numeric_features(merged, buffer)
+    sources = engineer._categorical_sources(merged, buffer)
+    return p, buffer.numeric, buffer.flags, sources
+
+
+class ParallelFeatureBuild:
+    """
+    engineer_features() with the per-lease work spread over a process pool
+
+    Leases are partitioned by property_id hash, so every payment (per lease)
+    and maintenance request (per property) a partition needs lives in that
+    partition and its aggregates are exact. Workers receive the engineer and
+    the market table once, when the pool starts, and each task carries only
+    its partition's rows of the other tables; a few shards per worker are
+    sliced at a time. Workers return raw numeric features
+    and categorical source values. The parent reassembles them in lease
+    order and fills, encodes and scales them with the same code as the
+    single-process build, so training fits identical state and both modes
+    return identical features.
+    """
+
+    def __init__(
+        self,
+        engineer: TenantFeatureEngineer,
+        n_workers: int,
+        n_partitions: Optional[int] = None,
+    ):
+        """
+        Args:
+            engineer: Feature engineer to fit (training) or apply (inference)
+            n_workers: Worker processes
+            n_partitions: Lease partitions (default: PARTITIONS_PER_WORKER
+                per worker)
+        """
+        if n_workers < 1:
+            raise ValueError("n_workers must be at least 1")
+        self.engineer = engineer
+        self.n_workers = n_workers
+        self.n_partitions = n_partitions or n_workers * PARTITIONS_PER_WORKER
+
+    def run(
+        self,
+        tenants: pd.DataFrame,
+        leases: pd.DataFrame,
+        payments: pd.DataFrame,
+        properties: pd.DataFrame,
+        maintenance: pd.DataFrame,
+        market_data: pd.DataFrame = None,
+        is_training: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Build the feature matrix; arguments as in engineer_features()
+
+        Returns:
+            Feature matrix in lease order
+        """
+        engineer = self.engineer
+        include_market_features = market_data is not None
+        rows = self._partition_rows(leases, payments, properties, maintenance)
+        tables = {
+            "leases": leases,
+            "payments": payments,
+            "properties": properties,
+            "maintenance": maintenance,
+        }
+
+        def shards() -> Iterator[Tuple[int, Dict[str, pd.DataFrame]]]:
+            for p in range(self.n_partitions):
+                shard = {
+                    table: frame.iloc[rows[p][table]] for table, frame in tables.items()
+                }
+                shard["tenants"] = tenants[
+                    tenants["tenant_id"].isin(shard["leases"]["tenant_id"])
+                ]
+                yield p, shard
+
+        buffer = engineer._allocate_buffer(
+            pd.RangeIndex(len(leases)), include_market_features, is_training
+        )
+        sources = []
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(engineer, market_data, include_market_features, is_training),
+        ) as pool:
+            pending = set()
+            in_flight = self.n_workers * SHARDS_IN_FLIGHT_PER_WORKER
+            for p, shard in shards():
+                if len(pending) >= in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sources.append(_collect(future.result(), rows, buffer))
+                pending.add(
+                    pool.submit(_partition_features, p, shard, rows[p]["leases"])
+                )
+            for future in pending:
+                sources.append(_collect(future.result(), rows, buffer))
+
+        return engineer._finish_features(
+            pd.concat(sources).sort_index(),
+            buffer,
+            include_market_features,
+            is_training,
+        )
+
+    def _partition_rows(
+        self,
+        leases: pd.DataFrame,
+        payments: pd.DataFrame,
+        properties: pd.DataFrame,
+        maintenance: pd.DataFrame,
+    ) -> List[Dict[str, np.ndarray]]:
+        """Row positions of every table, per partition"""
+        if not leases["lease_id"].is_unique:
+            raise ValueError("Parallel builds need unique lease_id values")
+
+        n = self.n_partitions
+        lease_partitions = partition_of(leases["property_id"], n)
+
+        # Payments follow their lease; rows for unknown leases never merge
+        lease_of_payment = pd.Index(leases["lease_id"]).get_indexer(
+            payments["lease_id"]
+        )
+        payment_partitions = np.where(
+            lease_of_payment >= 0, lease_partitions[lease_of_payment], n
+        )
+
+        by_table = {
+            "leases": partition_rows(lease_partitions, n),
+            "payments": partition_rows(payment_partitions, n),
+            "properties": partition_rows(partition_of(properties["property_id"], n), n),
+            "maintenance": partition_rows(
+                partition_of(maintenance["property_id"], n), n
+            ),
+        }
+        return [
+            {table: parts[p] for table, parts in by_table.items()} for p in range(n)
+        ]
+
+
+def _collect(
+    result: Tuple[int, np.ndarray, np.ndarray, pd.DataFrame],
+    rows: List[Dict[str, np.ndarray]],
+    buffer: FeatureBuffer,
+) -> pd.DataFrame:
+    """Write one partition's features into the buffer; return its categoricals"""
+    p, numeric, flags, categorical = result
+    buffer.numeric[rows[p]["leases"]] = numeric
+    buffer.flags[rows[p]["leases"]] = flags
+    return categorical
@@ -0,0 +1,435 @@
+"""
+Partitioned Feature Engineering
+Out-of-core feature builds over hash partitions of the raw tables
+"""
+
+import shutil
+from functools import reduce
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from .aggregates import (
+    REQUEST_TYPE_COUNT_SUFFIX,
+    aggregate_payments,
+    finalize_maintenance,
+    maintenance_partials,
+)
+from .buffer import NUMERIC_DTYPE, FeatureBuffer, has_more_than_two_values
+from .encoding import CategoricalVocabulary
+from .feature_engineer import (
+    SCALER_FIT_CHUNK_ROWS,
+    TenantFeatureEngineer,
+    fit_standard_scaler,
+)
+from .tenant_features import FEATURE_REGISTRY
+
+DEFAULT_PARTITIONS = 16
+
+FEATURE_PARTITION_PATTERN = "features-*.parquet"
+
+# A large table passed whole or as an iterable of chunks (read_csv chunksize)
+Table = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def partition_of(keys: pd.Series, n_partitions: int) -> np.ndarray:
+    """Partition number per key; stable across chunks, runs and processes"""
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+
+def partition_rows(partitions: np.ndarray, n_partitions: int) -> List[np.ndarray]:
+    """Row positions of each partition, ascending (original order kept)"""
+    order = np.argsort(partitions, kind="stable")
+    bounds = np.searchsorted(partitions[order], np.arange(n_partitions + 1))
+    return [order[bounds[p] : bounds[p + 1]] for p in range(n_partitions)]
+
+
+def read_feature_partitions(
+    paths: Union[Path, str, Iterable[Union[Path, str]]]
+) -> pd.DataFrame:
+    """
+    Load feature partitions back into one matrix in lease order
+
+    Args:
+        paths: Feature partition files, or the directory holding them
+
+    Returns:
+        Feature matrix indexed like the in-memory engineer_features() output
+    """
+    if isinstance(paths, (str, Path)) and Path(paths).is_dir():
+        paths = sorted(Path(paths).glob(FEATURE_PARTITION_PATTERN))
+    frames = [pd.read_parquet(path) for path in paths]
+    if not frames:
+        raise ValueError("No feature partitions to read")
+    return pd.concat(frames).sort_index()
+
+
+class _PartitionAggregates:
+    """Precomputed aggregates for one lease partition, read like an AggregateStore"""
+
+    def __init__(self, payments: pd.DataFrame, maintenance: pd.DataFrame):
+        self._payments = payments
+        self._maintenance = maintenance
+
+    def payment_aggregates(self) -> pd.DataFrame:
+        return self._payments
+
+    def maintenance_aggregates(self) -> pd.DataFrame:
+        return self._maintenance
+
+
+class PartitionedFeatureBuilder:
+    """
+    Feature builds that never hold the payment or maintenance history in memory
+
+    Payments are spilled to disk by lease_id hash and maintenance requests by
+    property_id hash, one chunk at a time. Each lease partition is then
+    merged and transformed on its own, so peak memory follows the largest
+    partition rather than the full history. Leases, tenants and properties
+    (one row per lease or property) are kept in memory.
+
+    Training runs in two passes. The first writes raw numeric features per
+    partition; fill values, scaler statistics and vocabularies are then fitted
+    column by column over those files in the original lease order, and the
+    second pass encodes, scales and writes the feature partitions. The
+    reassembled features equal engineer_features() on the full tables.
+    """
+
+    def __init__(
+        self,
+        engineer: TenantFeatureEngineer,
+        work_dir: Path,
+        n_partitions: int = DEFAULT_PARTITIONS,
+    ):
+        """
+        Args:
+            engineer: Feature engineer to fit (training) or apply (inference)
+            work_dir: Scratch directory for spilled rows and raw features
+            n_partitions: Number of lease_id / property_id hash partitions
+        """
+        if n_partitions < 1:
+            raise ValueError("n_partitions must be at least 1")
+        self.engineer = engineer
+        self.work_dir = Path(work_dir)
+        self.n_partitions = n_partitions
+
+    def build(
+        self,
+        tenants: pd.DataFrame,
+        leases: pd.DataFrame,
+        payments: Table,
+        properties: pd.DataFrame,
+        maintenance: Table,
+        market_data: pd.DataFrame = None,
+        is_training: bool = True,
+        output_dir: Optional[Path] = None,
+    ) -> List[Path]:
+        """
+        Build features partition by partition and write them to disk
+
+        Args:
+            tenants: Tenant demographic data
+            leases: Lease contracts
+            payments: Payment history, whole or as chunks
+            properties: Property characteristics
+            maintenance: Maintenance requests, whole or as chunks
+            market_data: Market/neighborhood analytics
+            is_training: Whether to fit the engineer (training) or only apply it
+            output_dir: Where feature partitions go (default: work_dir/features)
+
+        Returns:
+            Paths of the written feature partitions, one per lease partition
+        """
+        if not is_training and not self.engineer.is_fitted:
+            raise ValueError(
+                "Feature pipeline not fitted. Partitioned inference needs a "
+                "fitted or loaded feature engineer."
+            )
+
+        output_dir = Path(output_dir or self.work_dir / "features")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        spill_dir = self.work_dir / "spill"
+        raw_dir = self.work_dir / "raw"
+
+        try:
+            payment_schema = self._spill(payments, "lease_id", spill_dir / "payments")
+            maintenance_schema = self._spill(
+                maintenance, "property_id", spill_dir / "maintenance"
+            )
+            maint_agg = self._maintenance_aggregates(
+                spill_dir / "maintenance", maintenance_schema
+            )
+
+            positions = partition_rows(
+                partition_of(leases["lease_id"], self.n_partitions), self.n_partitions
+            )
+
+            def merged_partitions() -> Iterator[pd.DataFrame]:
+                for p in range(self.n_partitions):
+                    payment_agg = aggregate_payments(
+                        self._read_spill(spill_dir / "payments", p, payment_schema)
+                    )
+                    yield self._merge_partition(
+                        tenants,
+                        leases,
+                        properties,
+                        market_data,
+                        positions[p],
+                        _PartitionAggregates(payment_agg, maint_agg),
+                    )
+
+            if is_training:
+                return self._build_training(
+                    merged_partitions(),
+                    positions,
+                    market_data is not None,
+                    raw_dir,
+                    output_dir,
+                )
+
+            paths = []
+            for p, merged in enumerate(merged_partitions()):
+                features = self.engineer.transform_merged(merged)
+                paths.append(self._write_features(features, output_dir, p))
+            return paths
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+            shutil.rmtree(raw_dir, ignore_errors=True)
+
+    def _spill(self, table: Table, key: str, spill_dir: Path) -> Optional[pd.DataFrame]:
+        """Write each chunk's rows to per-partition files; returns an empty schema frame"""
+        chunks = [table] if isinstance(table, pd.DataFrame) else table
+        schema = None
+        for i, chunk in enumerate(chunks):
+            if schema is None:
+                schema = chunk.iloc[:0]
+            if chunk.empty:
+                continue
+
+            partitions = partition_of(chunk[key], self.n_partitions)
+            for p, rows in enumerate(partition_rows(partitions, self.n_partitions)):
+                if len(rows) == 0:
+                    continue
+                part_dir = spill_dir / f"part-{p:05d}"
+                part_dir.mkdir(parents=True, exist_ok=True)
+                chunk.iloc[rows].to_parquet(
+                    part_dir / f"chunk-{i:06d}.parquet", index=False
+                )
+
+        if schema is None:
+            raise ValueError(f"No chunks to partition by {key}")
+        return schema
+
+    @staticmethod
+    def _read_spill(spill_dir: Path, p: int, schema: pd.DataFrame) -> pd.DataFrame:
+        """All spilled rows of one partition, in their original order"""
+        pieces = sorted((spill_dir / f"part-{p:05d}").glob("chunk-*.parquet"))
+        if not pieces:
+            return schema
+        return pd.concat(
+            [pd.read_parquet(piece) for piece in pieces], ignore_index=True
+        )
+
+    def _maintenance_aggregates(
+        self, spill_dir: Path, schema: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Per-property aggregates; partitions hold disjoint properties"""
+        partials = [maintenance_partials(schema)]
+        for p in range(self.n_partitions):
+            rows = self._read_spill(spill_dir, p, schema)
+            if not rows.empty:
+                partials.append(maintenance_partials(rows))
+
+        # Request types missing from a partition were never requested there
+        state = pd.concat(partials)
+        type_columns = [
+            col for col in state.columns if col.endswith(REQUEST_TYPE_COUNT_SUFFIX)
+        ]
+        state[type_columns] = state[type_columns].fillna(0)
+        counts = [col for col in state.columns if col.endswith("_count")]
+        state[counts] = state[counts].astype(np.int64)
+        return finalize_maintenance(state)
+
+    def _merge_partition(
+        self,
+        tenants: pd.DataFrame,
+        leases: pd.DataFrame,
+        properties: pd.DataFrame,
+        market_data: Optional[pd.DataFrame],
+        positions: np.ndarray,
+        aggregates: _PartitionAggregates,
+    ) -> pd.DataFrame:
+        """Merged rows for one lease partition, indexed by lease position"""
+        merged = self.engineer._merge_data_sources(
+            tenants,
+            leases.iloc[positions],
+            None,
+            properties,
+            None,
+            market_data,
+            aggregate_store=aggregates,
+        )
+        if len(merged) != len(positions):
+            raise ValueError(
+                "Partitioned builds need one tenant, property and market row "
+                "per lease; duplicate join keys found"
+            )
+        merged.index = pd.Index(positions)
+        return merged
+
+    def _build_training(
+        self,
+        merged_partitions: Iterable[pd.DataFrame],
+        positions: List[np.ndarray],
+        include_market_features: bool,
+        raw_dir: Path,
+        output_dir: Path,
+    ) -> List[Path]:
+        """Two-pass training build: raw features, fit, then encode and scale"""
+        engineer = self.engineer
+        raw_dir.mkdir(parents=True, exist_ok=True)
+
+        # Pass 1: raw numeric features and categorical source values
+        layout = None
+        for p, merged in enumerate(merged_partitions):
+            buffer = engineer._allocate_buffer(
+                merged.index, include_market_features, is_training=True
+            )
+            engineer._compute_numeric_features(merged, buffer)
+            np.save(raw_dir / f"numeric-{p:05d}.npy", buffer.numeric)
+            np.save(raw_dir / f"flags-{p:05d}.npy", buffer.flags)
+            engineer._categorical_sources(merged, buffer).to_parquet(
+                raw_dir / f"categorical-{p:05d}.parquet"
+            )
+            layout = buffer
+
+        numeric = [
+            np.load(raw_dir / f"numeric-{p:05d}.npy", mmap_mode="r+")
+            for p in range(self.n_partitions)
+        ]
+        flags = [
+            np.load(raw_dir / f"flags-{p:05d}.npy", mmap_mode="r")
+            for p in range(self.n_partitions)
+        ]
+        categorical = [
+            raw_dir / f"categorical-{p:05d}.parquet" for p in range(self.n_partitions)
+        ]
+
+        fill_values, scale_columns = self._fit_numeric(layout, numeric)
+        scaler = fit_standard_scaler(
+            self._row_chunks(
+                numeric,
+                positions,
+                [layout.numeric_names.index(col) for col in scale_columns],
+            )
+        )
+
+        encoders = {}
+        for col in layout.categorical_names:
+            mode, encoder = self._fit_categorical(col, categorical)
+            if mode is not None:
+                fill_values[col] = mode
+            encoders[col] = encoder
+
+        engineer.fill_values = fill_values
+        engineer.scale_columns = scale_columns
+        engineer.scalers["standard"] = scaler
+        engineer.encoders.update(encoders)
+        for col, encoder in encoders.items():
+            engineer.vocabularies[col] = CategoricalVocabulary.from_label_encoder(
+                encoder
+            )
+        engineer.feature_names = layout.names
+        engineer.include_market_features = include_market_features
+        engineer._row_transformer = None
+
+        # Pass 2: fill, encode and scale each partition with the fitted state
+        paths = []
+        for p in range(self.n_partitions):
+            index = pd.Index(positions[p])
+            buffer = engineer.make_buffer(index)
+            buffer.numeric[:] = numeric[p]
+            buffer.flags[:] = flags[p]
+            sources = pd.read_parquet(categorical[p]).set_axis(index)
+            engineer._encode_categoricals(sources, buffer, is_training=False)
+            engineer._scale_features(buffer, is_training=False)
+            features = buffer.to_frame(engineer.categories())
+            paths.append(self._write_features(features, output_dir, p))
+
+        return paths
+
+    @staticmethod
+    def _fit_numeric(layout: FeatureBuffer, numeric: List[np.ndarray]) -> tuple:
+        """
+        Median fill values and scaled columns, one assembled column at a time
+
+        Missing values are filled in the raw feature files as a side effect.
+        """
+        fill_values = {}
+        scale_columns = []
+        for j, name in enumerate(layout.numeric_names):
+            column = np.concatenate([block[:, j] for block in numeric])
+            median = float(pd.Series(column, copy=False).median())
+            fill_values[name] = median
+
+            missing = np.isnan(column)
+            if missing.any():
+                column[missing] = median
+                for block in numeric:
+                    block_column = block[:, j]
+                    block_column[np.isnan(block_column)] = median
+
+            if has_more_than_two_values(column):
+                scale_columns.append(name)
+
+        return fill_values, scale_columns
+
+    @staticmethod
+    def _row_chunks(
+        numeric: List[np.ndarray], positions: List[np.ndarray], columns: List[int]
+    ) -> Iterator[np.ndarray]:
+        """Rows of the given columns in lease order, SCALER_FIT_CHUNK_ROWS at a time"""
+        n_rows = sum(len(rows) for rows in positions)
+        for start in range(0, n_rows, SCALER_FIT_CHUNK_ROWS):
+            stop = min(start + SCALER_FIT_CHUNK_ROWS, n_rows)
+            chunk = np.empty((stop - start, len(columns)), dtype=NUMERIC_DTYPE)
+            for block, rows in zip(numeric, positions):
+                lo, hi = np.searchsorted(rows, [start, stop])
+                chunk[rows[lo:hi] - start] = block[lo:hi][:, columns]
+            yield chunk
+
+    def _fit_categorical(self, col: str, paths: List[Path]) -> tuple:
+        """Training mode and label encoder for one categorical feature"""
+        spec = FEATURE_REGISTRY[col]
+
+        def values(path: Path) -> pd.Series:
+            return self.engineer._column(
+                pd.read_parquet(path), spec.inputs[0], spec.default
+            )
+
+        counts = reduce(
+            lambda a, b: a.add(b, fill_value=0),
+            (values(path).value_counts() for path in paths),
+        )
+        mode = None
+        if not counts.empty:
+            # Series.mode() breaks ties by the smallest value
+            mode = counts[counts == counts.max()].index.sort_values()[0]
+
+        def filled(path: Path) -> pd.Series:
+            column = values(path)
+            return column if mode is None else column.fillna(mode)
+
+        classes = np.concatenate([filled(path).astype(str).unique() for path in paths])
+        encoder = LabelEncoder().fit(pd.Series(classes, dtype=object))
+        return mode, encoder
+
+    @staticmethod
+    def _write_features(features: pd.DataFrame, output_dir: Path, p: int) -> Path:
+        path = output_dir / f"features-{p:05d}.parquet"
+        features.to_parquet(path)
+        return path
@@ -0,0 +1,475 @@
+"""
+Raw Table Readers
+Typed Arrow/Parquet ingestion of the tenant, lease, payment, property and maintenance tables
+"""
+
+import argparse
+import csv
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from .tenant_features import FEATURE_REGISTRY, default_feature_set
+
+RAW_TABLES = ["tenants", "leases", "payments", "properties", "maintenance"]
+
+# Data generator columns named differently from what the feature pipeline reads
+RAW_COLUMN_ALIASES = {
+    "leases": {"end_date": "lease_end_date"},
+    "properties": {
+        "has_garage": "garage",
+        "has_yard": "yard",
+        "has_ac": "air_conditioning",
+    },
+}
+
+# Arrow type of every column the pipeline may read, by pipeline column name.
+# Columns a file lacks are skipped; their features fall back to defaults.
+RAW_TABLE_SCHEMAS: Dict[str, Dict[str, pa.DataType]] = {
+    "tenants": {
+        "tenant_id": pa.string(),
+        "annual_income": pa.float64(),
+        "portal_login_count": pa.int64(),
+        "autopay_enabled": pa.bool_(),
+        "primary_payment_method": pa.string(),
+        "avg_response_time_hours": pa.float64(),
+        "complaint_count": pa.int64(),
+        "tenure_months": pa.int64(),
+        "missed_communication_count": pa.int64(),
+        "escalation_count": pa.int64(),
+    },
+    "leases": {
+        "lease_id": pa.string(),
+        "tenant_id": pa.string(),
+        "property_id": pa.string(),
+        "lease_end_date": pa.date32(),
+        "lease_term_months": pa.int64(),
+        "monthly_rent": pa.float64(),
+        "security_deposit": pa.float64(),
+        "renewal_count": pa.int64(),
+        "renewal_status": pa.string(),
+        "last_rent_increase_pct": pa.float64(),
+        "rent_increase_count": pa.int64(),
+        "total_late_fees": pa.float64(),
+    },
+    "payments": {
+        "payment_id": pa.string(),
+        "lease_id": pa.string(),
+        "payment_date": pa.date32(),
+        "amount": pa.float64(),
+        "days_late": pa.int64(),
+    },
+    "properties": {
+        "property_id": pa.string(),
+        "zip_code": pa.string(),
+        "square_feet": pa.int64(),
+        "bedrooms": pa.int64(),
+        "bathrooms": pa.float64(),
+        "year_built": pa.int64(),
+        "years_since_renovation": pa.int64(),
+        "location_score": pa.int64(),
+        "school_rating": pa.int64(),
+        "garage": pa.bool_(),
+        "yard": pa.bool_(),
+        "air_conditioning": pa.bool_(),
+        "condition_rating": pa.int64(),
+        "neighborhood_type": pa.string(),
+        "market_rent_median": pa.float64(),
+        "vacancy_rate": pa.float64(),
+    },
+    "maintenance": {
+        "request_id": pa.string(),
+        "property_id": pa.string(),
+        "request_type": pa.string(),
+        "priority": pa.string(),
+        "resolution_days": pa.float64(),
+        "cost": pa.float64(),
+        "request_date": pa.date32(),
+    },
+}
+
+# Columns every file must have: join keys and payment/maintenance aggregate inputs
+RAW_TABLE_REQUIRED_COLUMNS = {
+    "tenants": ["tenant_id"],
+    "leases": ["lease_id", "tenant_id", "property_id"],
+    "payments": ["lease_id", "payment_date", "amount", "days_late"],
+    "properties": ["property_id"],
+    "maintenance": ["request_id", "property_id", "priority", "resolution_days"],
+}
+
+# Read whenever present, whatever the feature set: labels, the market join
+# key, optional aggregate inputs and the row ids the aggregate store tracks
+RAW_TABLE_OPTIONAL_COLUMNS = {
+    "tenants": [],
+    "leases": ["renewal_status"],
+    "payments": ["payment_id"],
+    "properties": ["zip_code"],
+    "maintenance": ["request_type", "cost", "request_date"],
+}
+
+# History tables that support date predicates, and the column filtered on
+RAW_TABLE_DATE_COLUMNS = {
+    "payments": "payment_date",
+    "maintenance": "request_date",
+}
+
+RAW_FILE_SUFFIXES = [".parquet", ".csv"]
+
+DEFAULT_BATCH_ROWS = 1_000_000
+
+DateLike = Union[str, date, pd.Timestamp]
+
+
+def raw_table_path(raw_dir: Path, table: str) -> Path:
+    """Parquet file for a table if present, otherwise its CSV"""
+    for suffix in RAW_FILE_SUFFIXES:
+        path = Path(raw_dir) / f"{table}{suffix}"
+        if path.exists():
+            return path
+    raise ValueError(f"No {table} table (.parquet or .csv) in {raw_dir}")
+
+
+def projected_columns(
+    table: str,
+    feature_set: Optional[Iterable[str]] = None,
+    include_market_features: bool = True,
+) -> List[str]:
+    """
+    Columns of a raw table needed to build a feature set
+
+    Args:
+        table: Raw table name
+        feature_set: Features to build (default: all registered features)
+        include_market_features: Whether the default set includes market features
+
+    Returns:
+        Pipeline column names in schema order
+    """
+    names = feature_set or default_feature_set(include_market_features)
+    needed = FEATURE_REGISTRY.source_columns(names)
+    needed.update(RAW_TABLE_REQUIRED_COLUMNS[table])
+    needed.update(RAW_TABLE_OPTIONAL_COLUMNS[table])
+    return [col for col in RAW_TABLE_SCHEMAS[table] if col in needed]
+
+
+def read_raw_table(
+    path: Path,
+    table: str,
+    columns: Optional[List[str]] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    memory_map: bool = True,
+    keys: Optional[Dict[str, Iterable]] = None,
+) -> pd.DataFrame:
+    """
+    Read one raw table with explicit dtypes
+
+    Parquet files are read with column projection, row-group pruning on the
+    date predicate and (for uncompressed files) zero-copy memory mapping.
+    CSV files are parsed by Arrow with the same projection and types; when
+    rows are filtered, each block is filtered as it is parsed so only the
+    kept rows are held in memory.
+
+    Args:
+        path: .parquet or .csv file
+        table: Raw table name (selects schema and aliases)
+        columns: Pipeline columns to read (default: every schema column present)
+        start_date: Earliest history date to keep, inclusive (history tables)
+        end_date: Latest history date to keep, inclusive (history tables)
+        memory_map: Memory-map Parquet files instead of reading them into buffers
+        keys: Keep only rows whose value in each pipeline column is one of
+            the given values, e.g. {"lease_id": lease_ids}
+
+    Returns:
+        Table with pipeline column names; dates as datetime64[ns]
+    """
+    path = Path(path)
+    file_columns = _resolve_columns(path, table, columns)
+    predicate = _and(
+        _date_predicate(table, file_columns, start_date, end_date),
+        _key_predicate(table, file_columns, keys),
+    )
+
+    if path.suffix == ".parquet":
+        arrow_table = pq.read_table(
+            path,
+            columns=list(file_columns),
+            filters=predicate,
+            memory_map=memory_map,
+        )
+    elif predicate is None:
+        arrow_table = pacsv.read_csv(
+            path, convert_options=_csv_options(table, file_columns)
+        )
+    else:
+        reader = pacsv.open_csv(path, convert_options=_csv_options(table, file_columns))
+        arrow_table = pa.concat_tables(
+            [pa.Table.from_batches([], schema=reader.schema)]
+            + [pa.Table.from_batches([batch]).filter(predicate) for batch in reader]
+        )
+
+    return _to_pandas(arrow_table, table, file_columns)
+
+
+def iter_raw_table(
+    path: Path,
+    table: str,
+    columns: Optional[List[str]] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream one raw table in typed chunks (for partitioned feature builds)
+
+    Args:
+        path: .parquet or .csv file
+        table: Raw table name
+        columns: Pipeline columns to read
+        start_date: Earliest history date to keep, inclusive
+        end_date: Latest history date to keep, inclusive
+        batch_rows: Rows per Parquet batch (CSV blocks are sized to match)
+
+    Yields:
+        DataFrames with the same columns and dtypes as read_raw_table()
+    """
+    path = Path(path)
+    file_columns = _resolve_columns(path, table, columns)
+    predicate = _date_predicate(table, file_columns, start_date, end_date)
+
+    if path.suffix == ".parquet":
+        batches = pq.ParquetFile(path, memory_map=True).iter_batches(
+            batch_size=batch_rows, columns=list(file_columns)
+        )
+    else:
+        batches = pacsv.open_csv(
+            path,
+            read_options=pacsv.ReadOptions(block_size=batch_rows * 64),
+            convert_options=_csv_options(table, file_columns),
+        )
+
+    for batch in batches:
+        arrow_table = pa.Table.from_batches([batch])
+        if predicate is not None:
+            arrow_table = arrow_table.filter(predicate)
+        yield _to_pandas(arrow_table, table, file_columns)
+
+
+def load_raw_tables(
+    raw_dir: Path,
+    feature_set: Optional[Iterable[str]] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    tables: Iterable[str] = RAW_TABLES,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read the raw tables a feature build needs, projected to its columns
+
+    Args:
+        raw_dir: Directory with <table>.parquet or <table>.csv files
+        feature_set: Features to build (default: all registered features)
+        start_date: Earliest payment/maintenance date to keep, inclusive
+        end_date: Latest payment/maintenance date to keep, inclusive
+        tables: Tables to read
+
+    Returns:
+        DataFrames keyed by table name
+    """
+    history = {"start_date": start_date, "end_date": end_date}
+    return {
+        table: read_raw_table(
+            raw_table_path(raw_dir, table),
+            table,
+            columns=projected_columns(table, feature_set),
+            **(history if table in RAW_TABLE_DATE_COLUMNS else {}),
+        )
+        for table in tables
+    }
+
+
+def convert_to_parquet(
+    raw_dir: Path,
+    output_dir: Path,
+    tables: Iterable[str] = RAW_TABLES,
+    row_group_rows: int = DEFAULT_BATCH_ROWS,
+    compression: Optional[str] = None,
+) -> List[Path]:
+    """
+    Convert raw CSV tables to typed Parquet files
+
+    Files are written uncompressed by default so memory-mapped reads are
+    zero-copy; pass compression="zstd" when disk space matters more.
+
+    Args:
+        raw_dir: Directory with <table>.csv files
+        output_dir: Directory for <table>.parquet files
+        tables: Tables to convert
+        row_group_rows: Rows per row group (the unit of date pruning)
+        compression: Parquet compression codec, None for uncompressed
+
+    Returns:
+        Paths of the written Parquet files
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for table in tables:
+        source = Path(raw_dir) / f"{table}.csv"
+        file_columns = _resolve_columns(source, table, None)
+        arrow_table = pacsv.read_csv(
+            source, convert_options=_csv_options(table, file_columns)
+        ).rename_columns([file_columns[col] for col in file_columns])
+
+        path = output_dir / f"{table}.parquet"
+        pq.write_table(
+            arrow_table,
+            path,
+            row_group_size=row_group_rows,
+            compression=compression or "NONE",
+        )
+        paths.append(path)
+    return paths
+
+
+def _resolve_columns(
+    path: Path, table: str, columns: Optional[List[str]]
+) -> Dict[str, str]:
+    """Map file column names to pipeline column names, in schema order"""
+    if path.suffix == ".parquet":
+        available = pq.read_schema(path, memory_map=True).names
+    else:
+        with open(path, newline="") as f:
+            available = next(csv.reader(f), [])
+
+    aliases = RAW_COLUMN_ALIASES.get(table, {})
+    by_name = {aliases.get(col, col): col for col in available}
+    wanted = RAW_TABLE_SCHEMAS[table] if columns is None else columns
+
+    missing = [
+        col
+        for col in RAW_TABLE_REQUIRED_COLUMNS[table]
+        if col in wanted and col not in by_name
+    ]
+    if missing:
+        raise ValueError(f"{path} is missing required {table} columns: {missing}")
+
+    return {by_name[col]: col for col in wanted if col in by_name}
+
+
+def _csv_options(table: str, file_columns: Dict[str, str]) -> pacsv.ConvertOptions:
+    schema = RAW_TABLE_SCHEMAS[table]
+    return pacsv.ConvertOptions(
+        column_types={
+            source: schema[name]
+            for source, name in file_columns.items()
+            if name in schema
+        },
+        include_columns=list(file_columns),
+    )
+
+
+def _date_predicate(
+    table: str,
+    file_columns: Dict[str, str],
+    start_date: Optional[DateLike],
+    end_date: Optional[DateLike],
+) -> Optional[pc.Expression]:
+    """Arrow filter on the table's history date column (None if unfiltered)"""
+    if start_date is None and end_date is None:
+        return None
+
+    date_column = RAW_TABLE_DATE_COLUMNS.get(table)
+    if date_column is None:
+        raise ValueError(f"The {table} table has no history date to filter on")
+    source = {name: col for col, name in file_columns.items()}.get(date_column)
+    if source is None:
+        raise ValueError(f"Date filter needs the {date_column} column")
+
+    field = pc.field(source)
+    predicate = None
+    if start_date is not None:
+        predicate = field >= pa.scalar(pd.Timestamp(start_date).date())
+    if end_date is not None:
+        upper = field <= pa.scalar(pd.Timestamp(end_date).date())
+        predicate = upper if predicate is None else predicate & upper
+    return predicate
+
+
+def _key_predicate(
+    table: str,
+    file_columns: Dict[str, str],
+    keys: Optional[Dict[str, Iterable]],
+) -> Optional[pc.Expression]:
+    """Arrow filter keeping rows whose key columns hold one of the given values"""
+    if not keys:
+        return None
+
+    sources = {name: col for col, name in file_columns.items()}
+    predicate = None
+    for name, values in keys.items():
+        if name not in sources:
+            raise ValueError(f"Key filter needs the {name} column of {table}")
+        allowed = pa.array(list(values), type=RAW_TABLE_SCHEMAS[table][name])
+        predicate = _and(predicate, pc.field(sources[name]).isin(allowed))
+    return predicate
+
+
+def _and(
+    left: Optional[pc.Expression], right: Optional[pc.Expression]
+) -> Optional[pc.Expression]:
+    if left is None or right is None:
+        return right if left is None else left
+    return left & right
+
+
+def _to_pandas(
+    arrow_table: pa.Table, table: str, file_columns: Dict[str, str]
+) -> pd.DataFrame:
+    """Cast to the declared types and convert with pipeline column names"""
+    schema = RAW_TABLE_SCHEMAS[table]
+    arrow_table = arrow_table.rename_columns(
+        [file_columns[col] for col in arrow_table.column_names]
+    )
+
+    # Dates become timestamp[ns] in Arrow so pandas gets datetime64[ns] directly
+    fields = []
+    for name in arrow_table.column_names:
+        arrow_type = schema.get(name, arrow_table.schema.field(name).type)
+        if pa.types.is_date(arrow_type):
+            arrow_type = pa.timestamp("ns")
+        fields.append(pa.field(name, arrow_type))
+    target = pa.schema(fields)
+    if not arrow_table.schema.equals(target):
+        arrow_table = arrow_table.cast(target)
+
+    return arrow_table.to_pandas(split_blocks=True)
+
+
+def main():
+    """Convert a directory of raw CSV tables to typed Parquet"""
+    parser = argparse.ArgumentParser(description="Convert raw CSV tables to Parquet")
+    parser.add_argument("raw_dir", type=str, help="Directory of raw CSV tables")
+    parser.add_argument("output_dir", type=str, help="Directory for Parquet tables")
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default=None,
+        help="Parquet codec (default: uncompressed, for zero-copy mmap reads)",
+    )
+    args = parser.parse_args()
+
+    for path in convert_to_parquet(
+        Path(args.raw_dir), Path(args.output_dir), compression=args.compression
+    ):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
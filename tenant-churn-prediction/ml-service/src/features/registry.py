@@ -0,0 +1,206 @@
+"""
+Declarative Feature Registry
+Feature specs with declared inputs, evaluated once per shared dependency
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .buffer import CODE_DTYPE, FLAG_DTYPE, NUMERIC_DTYPE
+
+# Source columns read as datetime64[ns] instead of float64
+DATE_COLUMNS = {"lease_end_date", "last_payment_date"}
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    One feature (or shared intermediate) and how to compute it
+
+    Inputs name other registered specs or, failing that, source columns. A
+    spec may read a source column with its own name, which is how a feature
+    passes a column through. When a source column input is absent the spec
+    evaluates to its default without calling compute; NaN defaults are left
+    for training-time fill.
+
+    Attributes:
+        name: Unique feature name
+        inputs: Registered spec names or source columns, in compute() order
+        compute: Function of the input arrays; None passes the single input through
+        default: Value used when a source column input is absent
+        dtype: NUMERIC_DTYPE for numeric features, FLAG_DTYPE for 0/1 flags,
+            CODE_DTYPE for categoricals
+        group: Feature group; None marks an intermediate that is never output
+    """
+
+    name: str
+    inputs: Tuple[str, ...] = ()
+    compute: Optional[Callable[..., Any]] = None
+    default: Any = np.nan
+    dtype: type = NUMERIC_DTYPE
+    group: Optional[str] = None
+
+    @property
+    def is_categorical(self) -> bool:
+        return self.dtype == CODE_DTYPE
+
+    @property
+    def is_flag(self) -> bool:
+        return self.dtype == FLAG_DTYPE
+
+
+class FrameColumns:
+    """Column source over a merged DataFrame"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def has(self, name: str) -> bool:
+        return name in self.df.columns
+
+    def numeric(self, name: str) -> np.ndarray:
+        return self.df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def dates(self, name: str) -> np.ndarray:
+        return pd.to_datetime(self.df[name]).to_numpy(dtype="datetime64[ns]")
+
+
+class FeatureRegistry:
+    """
+    Ordered collection of feature specs with dependency-aware evaluation
+
+    Registration order is output order. Evaluating a set of features computes
+    only those features and what they depend on, each spec and each source
+    column exactly once.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, FeatureSpec] = {}
+        self._plans: Dict[Tuple[str, ...], List[FeatureSpec]] = {}
+
+    def register(self, spec: FeatureSpec) -> FeatureSpec:
+        """Add a spec; names must be unique"""
+        if spec.name in self._specs:
+            raise ValueError(f"Feature '{spec.name}' is already registered")
+        self._specs[spec.name] = spec
+        self._plans.clear()
+        return spec
+
+    def feature(self, name: str, group: str, **kwargs) -> FeatureSpec:
+        """Register an output feature"""
+        return self.register(FeatureSpec(name, group=group, **kwargs))
+
+    def intermediate(self, name: str, **kwargs) -> FeatureSpec:
+        """Register a shared value that features can depend on"""
+        return self.register(FeatureSpec(name, **kwargs))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __getitem__(self, name: str) -> FeatureSpec:
+        return self._specs[name]
+
+    def names(self, groups: Optional[Iterable[str]] = None) -> List[str]:
+        """Output feature names in registration order, optionally by group"""
+        groups = None if groups is None else set(groups)
+        return [
+            spec.name
+            for spec in self._specs.values()
+            if spec.group is not None and (groups is None or spec.group in groups)
+        ]
+
+    def resolve(self, names: Iterable[str]) -> List[FeatureSpec]:
+        """
+        Specs needed to compute the given features, dependencies first
+
+        Args:
+            names: Requested feature names
+
+        Returns:
+            Specs in evaluation order
+        """
+        names = tuple(names)
+        if names not in self._plans:
+            self._plans[names] = self._resolve(names)
+        return self._plans[names]
+
+    def _resolve(self, names: Tuple[str, ...]) -> List[FeatureSpec]:
+        order: List[FeatureSpec] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Feature dependency cycle at '{name}'")
+            state[name] = "visiting"
+            spec = self._specs[name]
+            for dependency in self._dependencies(spec):
+                visit(dependency)
+            state[name] = "done"
+            order.append(spec)
+
+        for name in names:
+            if name not in self._specs:
+                raise ValueError(f"Unknown feature '{name}'")
+            visit(name)
+        return order
+
+    def source_columns(self, names: Iterable[str]) -> Set[str]:
+        """Source columns read when computing the given features"""
+        return {
+            column
+            for spec in self.resolve(names)
+            for column in spec.inputs
+            if not self._is_spec_input(spec, column)
+        }
+
+    def evaluate(self, names: Iterable[str], source) -> Dict[str, Any]:
+        """
+        Compute features from a column source
+
+        Args:
+            names: Requested numeric feature names
+            source: Object with has(name), numeric(name) and dates(name),
+                e.g. FrameColumns
+
+        Returns:
+            Dict of feature name -> float64 array (or scalar to broadcast)
+        """
+        names = tuple(names)
+        values: Dict[str, Any] = {}
+        columns: Dict[str, np.ndarray] = {}
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for spec in self.resolve(names):
+                values[spec.name] = self._compute(spec, source, values, columns)
+
+        return {name: values[name] for name in names}
+
+    def _compute(self, spec: FeatureSpec, source, values: dict, columns: dict):
+        args = []
+        for name in spec.inputs:
+            if self._is_spec_input(spec, name):
+                args.append(values[name])
+                continue
+            if not source.has(name):
+                return spec.default
+            if name not in columns:
+                if name in DATE_COLUMNS:
+                    columns[name] = source.dates(name)
+                else:
+                    columns[name] = source.numeric(name)
+            args.append(columns[name])
+
+        if spec.compute is None:
+            return args[0]
+        return spec.compute(*args)
+
+    def _is_spec_input(self, spec: FeatureSpec, name: str) -> bool:
+        return name != spec.name and name in self._specs
+
+    def _dependencies(self, spec: FeatureSpec) -> List[str]:
+        return [name for name in spec.inputs if self._is_spec_input(spec, name)]
@@ -0,0 +1,320 @@
+"""
+Tenant Churn Feature Definitions
+Registry of every churn feature with its inputs, default and dtype
+"""
+
+import numpy as np
+import pandas as pd
+
+from .buffer import CODE_DTYPE, FLAG_DTYPE
+from .registry import FeatureRegistry
+
+_NS_PER_DAY = 86_400 * 10**9
+
+SUMMER_MONTHS = [6, 7, 8]
+
+# Output order of feature groups; categoricals always come last
+FEATURE_GROUPS = ["behavior", "property", "financial", "market", "temporal"]
+MARKET_GROUP = "market"
+CATEGORICAL_GROUP = "categorical"
+
+
+def _days(later, earlier) -> np.ndarray:
+    """Whole days between datetimes, floored like Timedelta.days; NaT gives NaN"""
+    delta = np.asarray(later - earlier, dtype="timedelta64[ns]")
+    days = (delta.astype(np.int64) // _NS_PER_DAY).astype(np.float64)
+    days[np.isnat(delta)] = np.nan
+    return days
+
+
+def _months(dates: np.ndarray) -> np.ndarray:
+    """Calendar month (1-12) of each date; NaT gives NaN"""
+    months = (dates.astype("datetime64[M]").astype(np.int64) % 12 + 1).astype(
+        np.float64
+    )
+    months[np.isnat(dates)] = np.nan
+    return months
+
+
+def _zero_missing(values: np.ndarray) -> np.ndarray:
+    return np.nan_to_num(values, nan=0.0)
+
+
+def _as_flag(values: np.ndarray) -> np.ndarray:
+    """0/1 indicator of a truthy value; missing counts as 0"""
+    return np.nan_to_num(values, nan=0.0) != 0
+
+
+FEATURE_REGISTRY = FeatureRegistry()
+_r = FEATURE_REGISTRY
+
+# Shared intermediates
+_r.intermediate("now", compute=lambda: pd.Timestamp("today").to_datetime64())
+_r.intermediate("year_built", inputs=("year_built",), default=2000)
+_r.intermediate("security_deposit", inputs=("security_deposit",), default=2000)
+
+# 1. Tenant Behavior Features (15 features)
+# Payment behavior
+_r.feature(
+    "avg_days_late",
+    "behavior",
+    inputs=("avg_days_late",),
+    compute=_zero_missing,
+    default=0,
+)
+_r.feature(
+    "max_days_late",
+    "behavior",
+    inputs=("max_days_late",),
+    compute=_zero_missing,
+    default=0,
+)
+_r.feature(
+    "late_payment_rate",
+    "behavior",
+    inputs=("total_days_late", "payment_count"),
+    compute=lambda total_late, count: _zero_missing(total_late / count),
+    default=0,
+)
+_r.feature(
+    "payment_consistency",
+    "behavior",
+    inputs=("payment_std",),
+    compute=lambda std: 1 / (1 + _zero_missing(std)),
+    default=1,
+)
+# Payment recency
+_r.feature(
+    "days_since_last_payment",
+    "behavior",
+    inputs=("now", "last_payment_date"),
+    compute=_days,
+    default=0,
+)
+# Auto-pay indicator
+_r.feature(
+    "has_autopay",
+    "behavior",
+    inputs=("autopay_enabled",),
+    compute=_as_flag,
+    default=0,
+    dtype=FLAG_DTYPE,
+)
+# Portal engagement
+_r.feature(
+    "portal_logins_per_month",
+    "behavior",
+    inputs=("portal_login_count", "tenure_months"),
+    compute=lambda logins, tenure: logins / np.maximum(tenure, 1),
+    default=0,
+)
+# Maintenance request behavior
+_r.feature(
+    "maintenance_requests_per_year",
+    "behavior",
+    inputs=("maintenance_count", "tenure_months"),
+    compute=lambda count, tenure: _zero_missing(count) / np.maximum(tenure / 12, 1),
+    default=0,
+)
+_r.feature(
+    "high_priority_requests",
+    "behavior",
+    inputs=("high_priority_count",),
+    compute=_zero_missing,
+    default=0,
+)
+# Communication responsiveness
+_r.feature(
+    "avg_response_time_hours",
+    "behavior",
+    inputs=("avg_response_time_hours",),
+    default=24,
+)
+_r.feature(
+    "missed_communication_count",
+    "behavior",
+    inputs=("missed_communication_count",),
+    default=0,
+)
+# Complaint/escalation history
+_r.feature("complaint_count", "behavior", inputs=("complaint_count",), default=0)
+_r.feature("escalation_count", "behavior", inputs=("escalation_count",), default=0)
+# Renewal history
+_r.feature("previous_renewals", "behavior", inputs=("renewal_count",), default=0)
+_r.feature("tenure_months", "behavior", inputs=("tenure_months",), default=0)
+
+# 2. Property Characteristics (11 features)
+# Physical characteristics
+_r.feature("square_feet", "property", inputs=("square_feet",), default=1500)
+_r.feature("bedrooms", "property", inputs=("bedrooms",), default=3)
+_r.feature("bathrooms", "property", inputs=("bathrooms",), default=2)
+_r.feature(
+    "property_age",
+    "property",
+    inputs=("now", "year_built"),
+    compute=lambda now, year_built: (
+        now.astype("datetime64[Y]").astype(np.int64) + 1970 - year_built
+    ),
+)
+# Location quality score (1-10)
+_r.feature("location_score", "property", inputs=("location_score",), default=5)
+_r.feature("school_rating", "property", inputs=("school_rating",), default=5)
+# Amenities
+_r.feature(
+    "has_garage",
+    "property",
+    inputs=("garage",),
+    compute=_as_flag,
+    default=0,
+    dtype=FLAG_DTYPE,
+)
+_r.feature(
+    "has_yard",
+    "property",
+    inputs=("yard",),
+    compute=_as_flag,
+    default=0,
+    dtype=FLAG_DTYPE,
+)
+_r.feature(
+    "has_ac",
+    "property",
+    inputs=("air_conditioning",),
+    compute=_as_flag,
+    default=0,
+    dtype=FLAG_DTYPE,
+)
+# Property condition (1-5 scale)
+_r.feature("property_condition", "property", inputs=("condition_rating",), default=3)
+# Recent renovations
+_r.feature(
+    "years_since_renovation",
+    "property",
+    inputs=("years_since_renovation",),
+    default=10,
+)
+
+# 3. Financial Features (7 features)
+# Rent economics
+_r.feature("monthly_rent", "financial", inputs=("monthly_rent",), default=2000)
+_r.feature(
+    "rent_per_sqft",
+    "financial",
+    inputs=("monthly_rent", "square_feet"),
+    compute=lambda rent, square_feet: rent / square_feet,
+)
+# Rent-to-income ratio (if income data available)
+_r.feature(
+    "rent_to_income_ratio",
+    "financial",
+    inputs=("monthly_rent", "annual_income"),
+    compute=lambda rent, income: np.minimum(rent * 12 / income, 1.0),
+    default=0.30,  # Assume 30% default
+)
+# Rent changes
+_r.feature(
+    "rent_increase_pct", "financial", inputs=("last_rent_increase_pct",), default=0
+)
+_r.feature(
+    "total_rent_increases", "financial", inputs=("rent_increase_count",), default=0
+)
+# Security deposit
+_r.feature(
+    "security_deposit_months",
+    "financial",
+    inputs=("security_deposit", "monthly_rent"),
+    compute=lambda deposit, rent: deposit / rent,
+)
+# Late fees incurred
+_r.feature("total_late_fees", "financial", inputs=("total_late_fees",), default=0)
+
+# 4. Market Condition Features (10 features)
+# Market rent comparison
+_r.feature("market_rent_median", "market", inputs=("market_rent_median",), default=2000)
+_r.feature(
+    "rent_vs_market",
+    "market",
+    inputs=("monthly_rent", "market_rent_median"),
+    compute=lambda rent, market_rent: rent / market_rent,
+)
+# Vacancy rates
+_r.feature(
+    "neighborhood_vacancy_rate", "market", inputs=("vacancy_rate",), default=0.05
+)
+# Rent trends
+_r.feature(
+    "market_rent_growth_1yr", "market", inputs=("rent_growth_1yr_pct",), default=0.03
+)
+_r.feature(
+    "market_rent_growth_3yr", "market", inputs=("rent_growth_3yr_pct",), default=0.10
+)
+# Supply/demand indicators
+_r.feature("new_listings_count", "market", inputs=("new_listings_30d",), default=10)
+_r.feature("avg_days_on_market", "market", inputs=("avg_days_on_market",), default=30)
+# Demographics
+_r.feature(
+    "median_household_income", "market", inputs=("median_hh_income",), default=75000
+)
+_r.feature(
+    "population_growth_rate",
+    "market",
+    inputs=("population_growth_rate",),
+    default=0.01,
+)
+# Competition
+_r.feature(
+    "competitor_properties_1mi",
+    "market",
+    inputs=("competitor_count_1mi",),
+    default=50,
+)
+
+# 5. Temporal Features (4 features)
+# Days until lease expiration
+_r.feature(
+    "days_to_expiration",
+    "temporal",
+    inputs=("lease_end_date", "now"),
+    compute=_days,
+    default=90,
+)
+# Lease duration
+_r.feature("lease_term_months", "temporal", inputs=("lease_term_months",), default=12)
+# Seasonality
+_r.feature(
+    "lease_end_month",
+    "temporal",
+    inputs=("lease_end_date",),
+    compute=_months,
+    default=1,
+)
+_r.feature(
+    "is_summer_expiration",
+    "temporal",
+    inputs=("lease_end_month",),
+    compute=lambda month: np.isin(month, SUMMER_MONTHS),
+    default=0,
+    dtype=FLAG_DTYPE,
+)
+
+# Categorical features (2 features), encoded to integer codes
+_r.feature(
+    "neighborhood_type",
+    CATEGORICAL_GROUP,
+    inputs=("neighborhood_type",),
+    default="suburban",
+    dtype=CODE_DTYPE,
+)
+_r.feature(
+    "payment_method",
+    CATEGORICAL_GROUP,
+    inputs=("primary_payment_method",),
+    default="ach",
+    dtype=CODE_DTYPE,
+)
+
+
+def default_feature_set(include_market_features: bool):
+    """All registered features for a training run, numerics first"""
+    groups = [g for g in FEATURE_GROUPS if include_market_features or g != MARKET_GROUP]
+    return FEATURE_REGISTRY.names(groups) + FEATURE_REGISTRY.names([CATEGORICAL_GROUP])
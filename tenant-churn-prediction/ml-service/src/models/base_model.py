@@ -9,8 +9,38 @@ import pandas as pd
 from datetime import datetime
 import joblib
 import json
+import os
+import shutil
+import uuid
 from pathlib import Path
 
+MODEL_ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+FEATURE_IMPORTANCE_FILENAME = 'feature_importance.npy'
+FEATURE_PIPELINE_FILENAME = 'feature_pipeline.pkl'
+
+# Risk bands in ascending order of churn risk
+RISK_LEVELS = np.array(['LOW', 'MEDIUM', 'HIGH'])
+
+
+def risk_levels(values, high: float = 0.8, medium: float = 0.5) -> np.ndarray:
+    """
+    Risk band of every value in one searchsorted pass
+
+    HIGH at or above high, MEDIUM at or above medium, LOW below. As with
+    the scalar checks, high wins when medium is set above it.
+
+    Args:
+        values: Churn probabilities or risk scores
+        high: Lowest value banded HIGH
+        medium: Lowest value banded MEDIUM
+
+    Returns:
+        Array of risk level strings
+    """
+    thresholds = [min(medium, high), high]
+    return RISK_LEVELS[np.searchsorted(thresholds, np.asarray(values), side='right')]
+
 
 class BaseChurnModel(ABC):
     """Abstract base class for tenant churn prediction models"""
@@ -20,6 +50,8 @@ class BaseChurnModel(ABC):
         self.model = None
         self.feature_names: Optional[list] = None
         self.training_metadata: Dict[str, Any] = {}
+        # Importance table loaded with a saved artifact (memory-mapped)
+        self.feature_importances: Optional[np.ndarray] = None
         self.model_version = model_config.get('version', '1.0.0')
 
     @abstractmethod
@@ -70,6 +102,23 @@ class BaseChurnModel(ABC):
             X: Feature matrix
             y: True labels
 
+        Returns:
+            Dictionary of evaluation metrics
+        """
+        return self.evaluate_probabilities(y, self.predict_proba(X)[:, 1])
+
+    @staticmethod
+    def evaluate_probabilities(
+        y: pd.Series,
+        y_proba: np.ndarray
+    ) -> Dict[str, float]:
+        """
+        Evaluation metrics from already computed churn probabilities
+
+        Args:
+            y: True labels
+            y_proba: Churn probability per sample (predicted class at >= 0.5)
+
         Returns:
             Dictionary of evaluation metrics
         """
@@ -83,8 +132,7 @@ class BaseChurnModel(ABC):
             classification_report
         )
 
-        y_pred = self.predict(X)
-        y_proba = self.predict_proba(X)[:, 1]
+        y_pred = (y_proba >= 0.5).astype(int)
 
         metrics = {
             'accuracy': accuracy_score(y, y_pred),
@@ -113,49 +161,168 @@ class BaseChurnModel(ABC):
         Returns:
             DataFrame with features and their importance scores
         """
-        if not hasattr(self.model, 'feature_importances_'):
+        if self.feature_importances is not None:
+            importances = np.asarray(self.feature_importances)
+        elif hasattr(self.model, 'feature_importances_'):
+            importances = self.model.feature_importances_
+        else:
             raise NotImplementedError("Model does not support feature importance")
 
         importance_df = pd.DataFrame({
             'feature': self.feature_names,
-            'importance': self.model.feature_importances_
+            'importance': importances
         }).sort_values('importance', ascending=False)
 
         return importance_df
 
-    def save(self, filepath: Path) -> None:
+    def save(self, filepath: Path, feature_pipeline: Optional[Any] = None) -> None:
         """
-        Save model to disk
+        Save model to disk as an artifact directory
+
+        The directory holds the estimator in its native format (see
+        _save_estimator), feature_importance.npy, the fitted feature pipeline
+        when given, and manifest.json with the feature names, config, version
+        and training metadata.
+
+        Each save writes a new version directory next to the target
+        (.<name>.<id>), and filepath is a symlink to the current one,
+        switched with an atomic os.replace(). Readers therefore always find
+        a complete model at filepath. The version it replaced is kept for
+        loads still reading it and removed by the following save. An
+        artifact directory written before versioning is moved into a
+        version directory on its first save; that one move is not atomic.
 
         Args:
-            filepath: Path to save model
+            filepath: Artifact directory to create or replace
+            feature_pipeline: Fitted pipeline that builds this model's
+                features (anything with a save(path) method), published in
+                the same version as the estimator
         """
         filepath = Path(filepath)
+        if filepath.is_file():
+            raise ValueError(
+                f"{filepath} is a file (legacy joblib model); "
+                "save the model artifact to a directory path"
+            )
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        model_data = {
-            'model': self.model,
+        staging = filepath.with_name(f".{filepath.name}.{uuid.uuid4().hex[:12]}")
+        staging.mkdir()
+
+        files = self._save_estimator(staging)
+        if self.feature_importances is not None or hasattr(
+            self.model, 'feature_importances_'
+        ):
+            importances = self.get_feature_importance().sort_index()['importance']
+            np.save(
+                staging / FEATURE_IMPORTANCE_FILENAME,
+                importances.to_numpy(dtype=np.float32)
+            )
+            files['feature_importance'] = FEATURE_IMPORTANCE_FILENAME
+        if feature_pipeline is not None:
+            feature_pipeline.save(staging / FEATURE_PIPELINE_FILENAME)
+            files['feature_pipeline'] = FEATURE_PIPELINE_FILENAME
+
+        manifest = {
+            'format_version': MODEL_ARTIFACT_FORMAT_VERSION,
+            'model_type': self.__class__.__name__,
+            'files': files,
             'feature_names': self.feature_names,
             'model_config': self.model_config,
             'training_metadata': self.training_metadata,
             'model_version': self.model_version,
             'saved_at': datetime.utcnow().isoformat()
         }
+        (staging / MANIFEST_FILENAME).write_text(
+            json.dumps(manifest, indent=2, default=_json_default)
+        )
 
-        joblib.dump(model_data, filepath)
+        previous = None
+        if filepath.is_symlink():
+            previous = Path(os.readlink(filepath)).name
+        elif filepath.exists():
+            previous = f".{filepath.name}.{uuid.uuid4().hex[:12]}"
+            filepath.rename(filepath.with_name(previous))
+
+        # Relative target, so the model directory can be moved or mounted
+        link = filepath.with_name(f".{filepath.name}.link")
+        if link.is_symlink():
+            link.unlink()
+        link.symlink_to(staging.name)
+        os.replace(link, filepath)
+
+        # Versions older than the one just replaced, and failed saves
+        for stale in filepath.parent.glob(f".{filepath.name}.*"):
+            if stale.name not in (staging.name, previous) and not stale.is_symlink():
+                shutil.rmtree(stale, ignore_errors=True)
         print(f"Model saved to {filepath}")
 
+    @staticmethod
+    def read_manifest(filepath: Path) -> Dict[str, Any]:
+        """
+        Read a model artifact's manifest without loading the model
+
+        Args:
+            filepath: Model artifact directory
+
+        Returns:
+            Manifest with feature names, config, version and training metadata
+        """
+        manifest_path = Path(filepath) / MANIFEST_FILENAME
+        if not manifest_path.exists():
+            raise ValueError(f"No model manifest at {manifest_path}")
+
+        manifest = json.loads(manifest_path.read_text())
+        format_version = manifest.get('format_version')
+        if format_version != MODEL_ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model artifact format {format_version} "
+                f"(expected {MODEL_ARTIFACT_FORMAT_VERSION})"
+            )
+        return manifest
+
     @classmethod
     def load(cls, filepath: Path) -> 'BaseChurnModel':
         """
         Load model from disk
 
         Args:
-            filepath: Path to saved model
+            filepath: Model artifact directory (a legacy joblib file is
+                still read)
 
         Returns:
             Loaded model instance
         """
+        filepath = Path(filepath)
+        if filepath.is_file():
+            return cls._load_joblib(filepath)
+
+        # Read every file from one version, even if a save switches the link
+        filepath = filepath.resolve()
+        manifest = cls.read_manifest(filepath)
+        if manifest['model_type'] != cls.__name__:
+            raise ValueError(
+                f"{filepath} holds a {manifest['model_type']}, not a {cls.__name__}"
+            )
+
+        instance = cls(manifest['model_config'])
+        files = manifest['files']
+        instance._load_estimator(filepath, files)
+        instance.feature_names = manifest['feature_names']
+        instance.training_metadata = manifest['training_metadata']
+        instance.model_version = manifest['model_version']
+        if 'feature_importance' in files:
+            # Memory-mapped: explanations read it without touching the estimator
+            instance.feature_importances = np.load(
+                filepath / files['feature_importance'], mmap_mode='r'
+            )
+
+        return instance
+
+    @classmethod
+    def _load_joblib(cls, filepath: Path) -> 'BaseChurnModel':
+        """Load a model pickled by earlier versions of save()"""
+        print(f"Loading legacy joblib model {filepath}; re-save it as an artifact")
         model_data = joblib.load(filepath)
 
         instance = cls(model_data['model_config'])
@@ -166,6 +333,31 @@ class BaseChurnModel(ABC):
 
         return instance
 
+    def _save_estimator(self, directory: Path) -> Dict[str, str]:
+        """
+        Write the fitted estimator into an artifact directory
+
+        Subclasses override this with the estimator's native format.
+
+        Args:
+            directory: Artifact directory being written
+
+        Returns:
+            Manifest file entries (role -> file name)
+        """
+        joblib.dump(self.model, directory / 'estimator.joblib')
+        return {'estimator': 'estimator.joblib'}
+
+    def _load_estimator(self, directory: Path, files: Dict[str, str]) -> None:
+        """
+        Read the estimator written by _save_estimator
+
+        Args:
+            directory: Artifact directory
+            files: Manifest file entries
+        """
+        self.model = joblib.load(directory / files['estimator'])
+
     def get_prediction_explanation(
         self,
         X: pd.DataFrame,
@@ -187,8 +379,12 @@ class BaseChurnModel(ABC):
         proba = self.predict_proba(X)[0, 1]
         prediction = int(proba >= 0.5)
 
-        # Get feature contributions (simplified)
-        feature_values = X.iloc[0].to_dict()
+        # Get feature contributions (simplified); mixed-dtype rows hold numpy
+        # scalars, which are converted so the explanation serializes
+        feature_values = {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in X.iloc[0].to_dict().items()
+        }
         importance = self.get_feature_importance()
         top_features = importance.head(top_n)
 
@@ -210,7 +406,7 @@ class BaseChurnModel(ABC):
 
     @staticmethod
     def _get_risk_level(probability: float) -> str:
-        """Map probability to risk level"""
+        """Map probability to risk level (one value; see risk_levels for arrays)"""
         if probability >= 0.8:
             return 'HIGH'
         elif probability >= 0.5:
@@ -227,3 +423,12 @@ class BaseChurnModel(ABC):
             'feature_count': len(self.feature_names) if self.feature_names else 0,
             'config': self.model_config
         }
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoding for numpy scalars and arrays in config and metadata"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
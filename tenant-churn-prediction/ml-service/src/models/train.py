@@ -6,21 +6,38 @@ Train and evaluate tenant churn prediction models
 import argparse
 import json
 import sys
+import tempfile
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 from sklearn.model_selection import train_test_split
 
 # Add parent to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from src.features.aggregates import AggregateStore, folded_id_path
+from src.features.buffer import bytes_per_row
 from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.partitioned import PartitionedFeatureBuilder, read_feature_partitions
+from src.features.raw_tables import (
+    RAW_TABLES,
+    iter_raw_table,
+    projected_columns,
+    raw_table_path,
+    read_raw_table,
+)
+from src.models.base_model import FEATURE_PIPELINE_FILENAME
 from src.models.xgboost_model import XGBoostChurnModel
 from src.utils.data_loader import DataLoader
 from src.utils.snowflake_connector import SnowflakeConnector
 
+# History tables streamed in chunks for partitioned builds
+CHUNKED_RAW_TABLES = ["payments", "maintenance"]
+
 
 def load_training_data(source: str = "local") -> tuple:
     """
@@ -46,9 +63,13 @@ def load_training_data(source: str = "local") -> tuple:
         loader = DataLoader()
         df = loader.load_from_mongodb()
     else:
-        # Load from local CSV (for development)
+        # Load from local Parquet or CSV (for development)
         data_path = Path(__file__).parent.parent.parent / "data" / "processed"
-        df = pd.read_csv(data_path / "training_data.csv")
+        parquet_path = data_path / "training_data.parquet"
+        if parquet_path.exists():
+            df = pq.read_table(parquet_path, memory_map=True).to_pandas()
+        else:
+            df = pd.read_csv(data_path / "training_data.csv")
 
     # Separate features and target
     target_col = "churned"
@@ -75,11 +96,119 @@ def load_training_data(source: str = "local") -> tuple:
     return X, y, metadata
 
 
+def load_raw_training_data(
+    raw_dir: Path,
+    aggregate_store_path: Optional[Path] = None,
+    n_partitions: Optional[int] = None,
+    history_start: Optional[str] = None,
+) -> tuple:
+    """
+    Build training features from raw tables with a freshly fitted pipeline
+
+    Args:
+        raw_dir: Directory holding tenants/leases/payments/properties/maintenance
+            tables as Parquet (preferred) or CSV
+        aggregate_store_path: Incremental payment/maintenance aggregate store.
+            Only rows whose payment_id/request_id it has not folded are
+            aggregated; created if missing. Ids older than its late-arrival
+            window are kept in a SQLite file beside it.
+        n_partitions: Build features out of core over this many hash
+            partitions, streaming payments and maintenance in chunks
+        history_start: Earliest payment/maintenance date to read (YYYY-MM-DD)
+
+    Returns:
+        Tuple of (features, labels, metadata, fitted feature engineer)
+    """
+    print(f"Loading raw tables from {raw_dir}...")
+
+    if n_partitions is not None and aggregate_store_path is not None:
+        raise ValueError("Partitioned builds do not use an aggregate store")
+
+    # Typed reads of only the columns the feature set needs
+    tables = {}
+    for name in RAW_TABLES:
+        read = (
+            iter_raw_table
+            if n_partitions and name in CHUNKED_RAW_TABLES
+            else read_raw_table
+        )
+        tables[name] = read(
+            raw_table_path(raw_dir, name),
+            name,
+            columns=projected_columns(name),
+            start_date=history_start if name in CHUNKED_RAW_TABLES else None,
+        )
+
+    # Only leases with a known renewal outcome are labelled
+    leases = tables["leases"]
+    leases = leases[
+        leases["renewal_status"].isin(["renewed", "not-renewed"])
+    ].reset_index(drop=True)
+    y = (leases["renewal_status"] == "not-renewed").astype(int).rename("churned")
+
+    aggregate_store = None
+    if aggregate_store_path is not None:
+        if aggregate_store_path.exists():
+            aggregate_store = AggregateStore.load(aggregate_store_path)
+        else:
+            # Ids left by a discarded store would suppress rows it never folded
+            id_index_path = folded_id_path(aggregate_store_path)
+            id_index_path.unlink(missing_ok=True)
+            aggregate_store = AggregateStore(id_index_path=id_index_path)
+
+    feature_engineer = TenantFeatureEngineer()
+    if n_partitions is not None:
+        with tempfile.TemporaryDirectory() as work_dir:
+            paths = PartitionedFeatureBuilder(
+                feature_engineer, Path(work_dir), n_partitions
+            ).build(
+                tables["tenants"],
+                leases,
+                tables["payments"],
+                tables["properties"],
+                tables["maintenance"],
+                is_training=True,
+            )
+            X = read_feature_partitions(paths)
+    else:
+        X = feature_engineer.engineer_features(
+            tables["tenants"],
+            leases,
+            tables["payments"],
+            tables["properties"],
+            tables["maintenance"],
+            is_training=True,
+            aggregate_store=aggregate_store,
+        )
+
+    if aggregate_store is not None:
+        aggregate_store.save(aggregate_store_path)
+
+    metadata = {
+        "total_samples": len(X),
+        "churn_rate": y.mean(),
+        "feature_count": len(X.columns),
+        "feature_bytes_per_row": float(bytes_per_row(X)),
+        "data_source": "raw",
+        "loaded_at": datetime.utcnow().isoformat(),
+    }
+
+    print(f"Engineered {len(X.columns)} features for {len(X)} leases")
+    print(f"Feature matrix: {bytes_per_row(X):.1f} bytes/row")
+    print(f"Churn rate: {y.mean():.2%}")
+
+    return X, y, metadata, feature_engineer
+
+
 def train_model(
     X: pd.DataFrame,
     y: pd.Series,
     config: dict = None,
     tune_hyperparameters: bool = False,
+    use_dmatrix: bool = False,
+    matrix_cache_path: Optional[Path] = None,
+    cv_folds: int = 5,
+    tuning_options: Optional[dict] = None,
 ) -> XGBoostChurnModel:
     """
     Train churn prediction model
@@ -89,6 +218,11 @@ def train_model(
         y: Target labels
         config: Model configuration
         tune_hyperparameters: Whether to perform hyperparameter tuning
+        use_dmatrix: Train the final model on one binned matrix
+        matrix_cache_path: Binary training-matrix cache (implies use_dmatrix)
+        cv_folds: Cross-validation folds; 0 skips cross-validation
+        tuning_options: Keyword arguments for tune_hyperparameters (budgets,
+            resumable state file, parallel trials)
 
     Returns:
         Trained model
@@ -119,12 +253,19 @@ def train_model(
     # Hyperparameter tuning (optional)
     if tune_hyperparameters:
         print("\nPerforming hyperparameter tuning...")
-        model.tune_hyperparameters(X_train, y_train)
+        model.tune_hyperparameters(X_train, y_train, **(tuning_options or {}))
 
     # Train model
     print("\nTraining model...")
     training_results = model.train(
-        X_train, y_train, X_val, y_val, early_stopping_rounds=10
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        early_stopping_rounds=10,
+        use_dmatrix=use_dmatrix,
+        matrix_cache_path=matrix_cache_path,
+        cv_folds=cv_folds,
     )
 
     # Print results
@@ -135,7 +276,10 @@ def train_model(
     train_metrics = training_results["training_metrics"]
     val_metrics = training_results["validation_metrics"]
 
-    print(f"\nTraining Set:")
+    if training_results["metadata"]["training_metrics_source"] == "out_of_fold":
+        print(f"\nTraining Set (out-of-fold):")
+    else:
+        print(f"\nTraining Set (in-sample):")
     print(f"  AUC:       {train_metrics['roc_auc']:.4f}")
     print(f"  Accuracy:  {train_metrics['accuracy']:.4f}")
     print(f"  Precision: {train_metrics['precision']:.4f}")
@@ -161,13 +305,21 @@ def train_model(
     return model
 
 
-def save_model_and_metadata(model: XGBoostChurnModel, metadata: dict, output_dir: Path):
-    """Save trained model and metadata"""
+def save_model_and_metadata(
+    model: XGBoostChurnModel,
+    metadata: dict,
+    output_dir: Path,
+    feature_engineer: TenantFeatureEngineer = None,
+):
+    """Save trained model, fitted feature pipeline and metadata"""
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save model
-    model_path = output_dir / "xgboost_churn_model.pkl"
-    model.save(model_path)
+    # Save model artifact (booster, manifest, importance table and the fitted
+    # feature pipeline, so serving reuses the training transform); both are
+    # published in one version, so readers never pair a model with another
+    # training run's pipeline
+    model_path = output_dir / "xgboost_churn_model"
+    model.save(model_path, feature_pipeline=feature_engineer)
 
     # Save metadata
     metadata_path = output_dir / "model_metadata.json"
@@ -185,6 +337,8 @@ def save_model_and_metadata(model: XGBoostChurnModel, metadata: dict, output_dir
     print(f"  - Model: {model_path.name}")
     print(f"  - Metadata: {metadata_path.name}")
     print(f"  - Feature Importance: {importance_path.name}")
+    if feature_engineer is not None:
+        print(f"  - Feature Pipeline: {model_path.name}/{FEATURE_PIPELINE_FILENAME}")
 
 
 def main():
@@ -194,12 +348,79 @@ def main():
         "--data-source",
         type=str,
         default="local",
-        choices=["local", "snowflake", "mongodb"],
+        choices=["local", "snowflake", "mongodb", "raw"],
         help="Data source for training",
     )
+    parser.add_argument(
+        "--raw-data-dir",
+        type=str,
+        default="data/raw/denver_sample",
+        help="Directory of raw tables, <table>.parquet or <table>.csv; Parquet "
+        "is read when both exist (used with --data-source raw)",
+    )
+    parser.add_argument(
+        "--aggregate-store",
+        type=str,
+        default=None,
+        help="Incremental aggregate store file (used with --data-source raw)",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=None,
+        help="Build features out of core over N hash partitions (raw source only)",
+    )
+    parser.add_argument(
+        "--history-start",
+        type=str,
+        default=None,
+        help="Earliest payment/maintenance date to read, YYYY-MM-DD (raw source only)",
+    )
     parser.add_argument(
         "--tune", action="store_true", help="Perform hyperparameter tuning"
     )
+    parser.add_argument(
+        "--tune-budget-seconds",
+        type=float,
+        default=None,
+        help="Wall-time budget for hyperparameter tuning",
+    )
+    parser.add_argument(
+        "--tune-max-fits",
+        type=int,
+        default=None,
+        help="Fit budget for hyperparameter tuning",
+    )
+    parser.add_argument(
+        "--tune-state",
+        type=str,
+        default=None,
+        help="Tuning trial log; an interrupted search resumes from it",
+    )
+    parser.add_argument(
+        "--tune-parallel",
+        type=int,
+        default=1,
+        help="Tuning trials trained concurrently (cores are split across them)",
+    )
+    parser.add_argument(
+        "--dmatrix",
+        action="store_true",
+        help="Bin the training data once and reuse it for fit, CV and evaluation",
+    )
+    parser.add_argument(
+        "--matrix-cache",
+        type=str,
+        default=None,
+        help="Binary training-matrix cache file, reused while the data is unchanged",
+    )
+    parser.add_argument(
+        "--cv-folds",
+        type=int,
+        default=5,
+        help="Cross-validation folds (0 skips cross-validation). With CV the "
+        "reported training metrics are out-of-fold; with 0 they are in-sample",
+    )
     parser.add_argument(
         "--output-dir",
         type=str,
@@ -211,14 +432,36 @@ def main():
 
     try:
         # Load data
-        X, y, metadata = load_training_data(args.data_source)
+        feature_engineer = None
+        if args.data_source == "raw":
+            X, y, metadata, feature_engineer = load_raw_training_data(
+                Path(args.raw_data_dir),
+                Path(args.aggregate_store) if args.aggregate_store else None,
+                args.partitions,
+                args.history_start,
+            )
+        else:
+            X, y, metadata = load_training_data(args.data_source)
 
         # Train model
-        model = train_model(X, y, tune_hyperparameters=args.tune)
+        model = train_model(
+            X,
+            y,
+            tune_hyperparameters=args.tune,
+            use_dmatrix=args.dmatrix,
+            matrix_cache_path=Path(args.matrix_cache) if args.matrix_cache else None,
+            cv_folds=args.cv_folds,
+            tuning_options={
+                "budget_seconds": args.tune_budget_seconds,
+                "max_fits": args.tune_max_fits,
+                "state_path": Path(args.tune_state) if args.tune_state else None,
+                "n_parallel": args.tune_parallel,
+            },
+        )
 
         # Save model
         output_dir = Path(args.output_dir)
-        save_model_and_metadata(model, metadata, output_dir)
+        save_model_and_metadata(model, metadata, output_dir, feature_engineer)
 
         print("\n" + "=" * 60)
         print("TRAINING COMPLETE")
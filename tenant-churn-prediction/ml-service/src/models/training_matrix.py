@@ -0,0 +1,137 @@
+"""
+XGBoost Training Matrices
+Binned training data for the fit, CV folds and evaluation, plus phase timing
+"""
+
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.model_selection import StratifiedKFold
+
+MATRIX_CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_BIN = 256
+DEFAULT_CV_FOLDS = 5
+
+
+class PhaseTimer:
+    """Wall time per named training phase, in the order the phases ran"""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def __call__(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + (
+                time.perf_counter() - start
+            )
+
+
+def frame_fingerprint(X: pd.DataFrame, y: pd.Series) -> str:
+    """Content hash of a feature matrix and its labels (schema, values, order)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([list(X.columns), X.dtypes.astype(str).tolist()]).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def build_training_matrix(
+    X: pd.DataFrame,
+    y: pd.Series,
+    max_bin: int = DEFAULT_MAX_BIN,
+    cache_path: Optional[Path] = None,
+) -> xgb.DMatrix:
+    """
+    Training matrix whose histogram bins are built once
+
+    Without a cache this is a QuantileDMatrix: the DataFrame is sketched and
+    quantized straight into histogram bins, with no float copy kept. XGBoost
+    cannot serialize a QuantileDMatrix, so with a cache path the converted
+    matrix is stored in XGBoost's binary DMatrix format instead; its bins are
+    built on first use and then reused for every later fit on the same object.
+    A manifest next to the cache records a fingerprint of X and y, and a cache
+    whose fingerprint no longer matches is rebuilt.
+
+    Args:
+        X: Feature matrix (categorical columns as pandas Categoricals)
+        y: Target labels
+        max_bin: Histogram bins per feature
+        cache_path: Binary DMatrix file to load from or write to
+
+    Returns:
+        DMatrix carrying the labels
+    """
+    if cache_path is None:
+        return xgb.QuantileDMatrix(X, label=y, enable_categorical=True, max_bin=max_bin)
+
+    cache_path = Path(cache_path)
+    manifest_path = cache_path.with_suffix(cache_path.suffix + ".json")
+    manifest = {
+        "format_version": MATRIX_CACHE_FORMAT_VERSION,
+        "fingerprint": frame_fingerprint(X, y),
+        "rows": len(X),
+        "columns": list(X.columns),
+    }
+
+    if cache_path.exists() and manifest_path.exists():
+        if json.loads(manifest_path.read_text()) == manifest:
+            print(f"Loading cached training matrix from {cache_path}")
+            return xgb.DMatrix(str(cache_path))
+
+    matrix = xgb.DMatrix(X, label=y, enable_categorical=True)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    matrix.save_binary(str(cache_path))
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    print(f"Training matrix cached to {cache_path}")
+    return matrix
+
+
+def fold_matrices(
+    X: pd.DataFrame,
+    y: pd.Series,
+    n_folds: int,
+    random_state: Optional[int] = None,
+    max_bin: int = DEFAULT_MAX_BIN,
+) -> Iterator[Tuple[xgb.DMatrix, xgb.DMatrix, np.ndarray]]:
+    """
+    Stratified folds as a training matrix and a held-out matrix each
+
+    Each fold's histogram cuts are sketched from its training rows only, and
+    the held-out rows are quantized with those cuts (ref=), so no held-out
+    value shapes the bins the fold's trees split on. One fold's matrices
+    are built at a time.
+
+    Args:
+        X: Feature matrix
+        y: Target labels
+        n_folds: Number of folds
+        random_state: Shuffle seed
+        max_bin: Histogram bins per feature
+
+    Yields:
+        (training matrix, held-out matrix, held-out row positions)
+    """
+    labels = np.asarray(y)
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    for train, held_out in folds.split(np.zeros(len(labels)), labels):
+        dtrain = xgb.QuantileDMatrix(
+            X.iloc[train],
+            label=labels[train],
+            enable_categorical=True,
+            max_bin=max_bin,
+        )
+        dheld = xgb.QuantileDMatrix(
+            X.iloc[held_out], enable_categorical=True, ref=dtrain
+        )
+        yield dtrain, dheld, held_out
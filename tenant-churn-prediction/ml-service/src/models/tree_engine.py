@@ -0,0 +1,330 @@
+"""
+Flat Tree Inference Engine
+Trained XGBoost trees compiled into flat arrays and evaluated with vectorized NumPy
+"""
+
+import json
+from pathlib import Path
+from typing import List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+SUPPORTED_OBJECTIVE = "binary:logistic"
+ROW_CHUNK = 512
+
+# Node arrays saved as .npy files, memory-mapped on load
+ENGINE_ARRAYS = (
+    "children",
+    "feature",
+    "threshold",
+    "default_left",
+    "category_row",
+    "category_table",
+    "value",
+    "roots",
+)
+ENGINE_META_FILENAME = "engine.json"
+
+
+class FlatTreeEnsemble:
+    """
+    Array-based copy of a binary:logistic XGBoost tree ensemble
+
+    All trees are concatenated into one set of node arrays. Leaves point to
+    themselves, so a batch is scored by stepping every (row, tree) cursor
+    max_depth times with a handful of NumPy gathers, then summing the leaf
+    values. With no DMatrix to build this is several times faster than the
+    booster for single rows and small batches; the booster's C++ predictor
+    stays ahead on large batches. Split semantics follow XGBoost: numeric splits go left when the
+    value is below the threshold (compared in float32), categorical splits go
+    right when the category is in the node's set, and missing values follow
+    the node's default direction. Categorical inputs are pandas category
+    codes, the values XGBoost itself was trained on.
+    """
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        children: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        default_left: np.ndarray,
+        category_row: np.ndarray,
+        category_table: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_margin: float,
+    ):
+        self.feature_names = list(feature_names)
+        self.children = children
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.category_row = category_row
+        self.category_table = category_table
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self._categorical = category_row >= 0
+        # Category sets flattened, with a trailing "not in any set" slot
+        self._category_bits = np.append(category_table.ravel(), False)
+
+    @classmethod
+    def from_booster(cls, booster: xgb.Booster) -> "FlatTreeEnsemble":
+        """
+        Compile a trained booster
+
+        Args:
+            booster: gbtree booster with the binary:logistic objective
+
+        Returns:
+            Engine producing the booster's probabilities
+        """
+        learner = json.loads(booster.save_raw("json"))["learner"]
+        objective = learner["objective"]["name"]
+        if objective != SUPPORTED_OBJECTIVE:
+            raise ValueError(
+                f"Flat inference supports {SUPPORTED_OBJECTIVE} models, "
+                f"not {objective}"
+            )
+        if learner["gradient_booster"]["name"] != "gbtree":
+            raise ValueError("Flat inference supports gbtree boosters only")
+
+        base_score = float(learner["learner_model_param"]["base_score"])
+        base_margin = float(np.log(base_score / (1 - base_score)))
+
+        arrays = {
+            name: []
+            for name in [
+                "children",
+                "feature",
+                "threshold",
+                "default_left",
+                "category_row",
+                "value",
+            ]
+        }
+        category_sets = []
+        roots = []
+        max_depth = 0
+        offset = 0
+        for tree in learner["gradient_booster"]["model"]["trees"]:
+            left = np.asarray(tree["left_children"], dtype=np.int32)
+            right = np.asarray(tree["right_children"], dtype=np.int32)
+            n_nodes = len(left)
+            leaf = left == -1
+            nodes = np.arange(n_nodes, dtype=np.int32)
+
+            # Leaves loop to themselves so every cursor can step max_depth times;
+            # children are interleaved, node n goes to 2n (left) or 2n + 1 (right)
+            children = np.column_stack(
+                [np.where(leaf, nodes, left), np.where(leaf, nodes, right)]
+            )
+            arrays["children"].append(children.ravel() + offset)
+            arrays["feature"].append(np.asarray(tree["split_indices"], dtype=np.int32))
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            arrays["threshold"].append(np.where(leaf, np.nan, conditions))
+            arrays["value"].append(np.where(leaf, conditions, 0.0))
+            arrays["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+
+            category_row = np.full(n_nodes, -1, dtype=np.int32)
+            split_type = np.asarray(tree.get("split_type", [0] * n_nodes))
+            segments = zip(
+                tree.get("categories_nodes", []),
+                tree.get("categories_segments", []),
+                tree.get("categories_sizes", []),
+            )
+            for node, start, size in segments:
+                if split_type[node] == 1:
+                    category_row[node] = len(category_sets)
+                    category_sets.append(tree["categories"][start : start + size])
+            arrays["category_row"].append(category_row)
+
+            roots.append(offset)
+            max_depth = max(max_depth, _tree_depth(left, right))
+            offset += n_nodes
+
+        n_categories = 1 + max((max(s) for s in category_sets if s), default=0)
+        category_table = np.zeros((max(1, len(category_sets)), n_categories), bool)
+        for row, categories in enumerate(category_sets):
+            category_table[row, categories] = True
+
+        return cls(
+            feature_names=booster.feature_names
+            or [f"f{i}" for i in range(booster.num_features())],
+            children=np.concatenate(arrays["children"]).astype(np.int32),
+            feature=np.concatenate(arrays["feature"]),
+            threshold=np.concatenate(arrays["threshold"]).astype(np.float32),
+            default_left=np.concatenate(arrays["default_left"]),
+            category_row=np.concatenate(arrays["category_row"]),
+            category_table=category_table,
+            value=np.concatenate(arrays["value"]).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            base_margin=base_margin,
+        )
+
+    def save(self, directory: Path) -> None:
+        """
+        Write the compiled arrays so loading skips the JSON dump and compile
+
+        Args:
+            directory: Directory to create for the arrays
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ENGINE_ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        meta = {
+            "feature_names": self.feature_names,
+            "max_depth": self.max_depth,
+            "base_margin": self.base_margin,
+        }
+        (directory / ENGINE_META_FILENAME).write_text(json.dumps(meta, indent=2))
+
+    @classmethod
+    def load(cls, directory: Path) -> "FlatTreeEnsemble":
+        """
+        Engine saved by save(), with the node arrays memory-mapped
+
+        Args:
+            directory: Directory written by save()
+
+        Returns:
+            Loaded engine
+        """
+        directory = Path(directory)
+        meta = json.loads((directory / ENGINE_META_FILENAME).read_text())
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in ENGINE_ARRAYS
+        }
+        return cls(**meta, **arrays)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def to_matrix(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        float32 input matrix in the model's feature order
+
+        Args:
+            X: DataFrame with the model's feature columns (categoricals as
+                pandas Categoricals, unseen codes missing) or an array already
+                in feature order
+
+        Returns:
+            Row-major float32 matrix with NaN for missing values
+        """
+        if not isinstance(X, pd.DataFrame):
+            return np.asarray(X, dtype=np.float32).reshape(-1, len(self.feature_names))
+
+        matrix = np.empty((len(X), len(self.feature_names)), dtype=np.float32)
+        for j, name in enumerate(self.feature_names):
+            column = X[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes = column.cat.codes.to_numpy()
+                matrix[:, j] = np.where(codes < 0, np.nan, codes)
+            else:
+                matrix[:, j] = column.to_numpy(dtype=np.float32, na_value=np.nan)
+        return matrix
+
+    def margin(self, matrix: np.ndarray) -> np.ndarray:
+        """Raw margin (log-odds) per row of a float32 feature matrix"""
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        margins = np.empty(len(matrix))
+        # Row chunks keep the (rows x trees) cursor arrays cache-sized
+        for start in range(0, len(matrix), ROW_CHUNK):
+            chunk = matrix[start : start + ROW_CHUNK]
+            margins[start : start + len(chunk)] = self._chunk_margin(chunk)
+        return margins + self.base_margin
+
+    def _chunk_margin(self, matrix: np.ndarray) -> np.ndarray:
+        n_rows, n_features = matrix.shape
+        flat = matrix.ravel()
+        offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        node = np.repeat(self.roots[None, :], n_rows, axis=0)
+
+        for _ in range(self.max_depth):
+            values = np.take(flat, np.take(self.feature, node) + offsets)
+            # NaN compares False: missing values take the default branch below
+            go_right = values >= np.take(self.threshold, node)
+            missing = np.isnan(values)
+            if missing.any():
+                go_right |= missing & ~np.take(self.default_left, node)
+            categorical = np.flatnonzero(np.take(self._categorical, node))
+            if len(categorical):
+                self._route_categorical(node, values, go_right, categorical)
+            node = np.take(self.children, 2 * node + go_right)
+
+        return np.take(self.value, node).sum(axis=1)
+
+    def _route_categorical(
+        self,
+        node: np.ndarray,
+        values: np.ndarray,
+        go_right: np.ndarray,
+        positions: np.ndarray,
+    ) -> None:
+        """Categories in a node's set go right, other known or unseen codes left"""
+        codes = values.ravel()[positions]
+        rows = self.category_row[node.ravel()[positions]]
+        n_categories = self.category_table.shape[1]
+        known = (codes >= 0) & (codes < n_categories)
+        bits = np.where(
+            known,
+            rows * n_categories + np.where(known, codes, 0).astype(np.int64),
+            len(self._category_bits) - 1,
+        )
+        flat = go_right.ravel()
+        flat[positions] = np.where(
+            np.isnan(codes), flat[positions], self._category_bits[bits]
+        )
+
+    def predict_proba(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Class probabilities like XGBClassifier.predict_proba
+
+        Args:
+            X: Feature DataFrame or float matrix in feature order
+
+        Returns:
+            Probability matrix [no_churn_prob, churn_prob]
+        """
+        churn = _sigmoid(self.margin(self.to_matrix(X)))
+        return np.column_stack([1 - churn, churn])
+
+    def predict_row(self, values: Sequence[float]) -> float:
+        """
+        Churn probability of one row, without pandas
+
+        Args:
+            values: Feature values in feature order (categoricals as codes,
+                NaN for missing)
+
+        Returns:
+            Churn probability
+        """
+        matrix = np.asarray(values, dtype=np.float32).reshape(1, -1)
+        return float(_sigmoid(self.margin(matrix))[0])
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Edges on the longest root-to-leaf path"""
+    depth = 0
+    level = [0]
+    while True:
+        children = [c for n in level for c in (left[n], right[n]) if c != -1]
+        if not children:
+            return depth
+        depth += 1
+        level = children
+
+
+def _sigmoid(margin: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-margin))
@@ -0,0 +1,336 @@
+"""
+Hyperparameter Search
+Hyperband over boosting rounds with early stopping, budgets and resumable state
+"""
+
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.model_selection import train_test_split
+
+from .training_matrix import DEFAULT_MAX_BIN
+
+TUNING_STATE_FORMAT_VERSION = 1
+
+DEFAULT_SEARCH_SPACE = {
+    "max_depth": [4, 6, 8],
+    "learning_rate": [0.01, 0.1, 0.2],
+    "subsample": [0.7, 0.8, 0.9],
+    "colsample_bytree": [0.7, 0.8, 0.9],
+    "min_child_weight": [1, 3, 5],
+}
+
+
+def trial_threads(n_parallel: int, n_jobs: Optional[int] = None) -> int:
+    """
+    XGBoost threads per trial so parallel trials don't oversubscribe cores
+
+    Args:
+        n_parallel: Trials running at once
+        n_jobs: Total threads to use (None or <= 0 means all cores)
+
+    Returns:
+        nthread for each trial (at least 1)
+    """
+    total = n_jobs if n_jobs and n_jobs > 0 else os.cpu_count() or 1
+    return max(1, total // max(1, n_parallel))
+
+
+class HyperbandTuner:
+    """
+    Hyperband search over an XGBoost parameter grid
+
+    Boosting rounds are the resource. Each bracket samples configurations
+    and runs successive halving: every configuration trains for a few
+    rounds with early stopping on the validation AUC, the best 1/eta move
+    on with eta times more rounds, up to max_rounds. Brackets trade many
+    cheap configurations against few fully trained ones.
+
+    Training and validation data are binned once into QuantileDMatrix
+    objects shared by every trial. Completed trials are written to the
+    state file as they finish, so an interrupted or budget-limited search
+    resumes where it stopped: the sampling is seeded, so a rerun plans the
+    same trials and only trains those without a recorded result.
+    """
+
+    def __init__(
+        self,
+        base_params: Dict[str, Any],
+        search_space: Optional[Dict[str, list]] = None,
+        max_rounds: int = 200,
+        min_rounds: int = 8,
+        eta: int = 3,
+        early_stopping_rounds: int = 10,
+        budget_seconds: Optional[float] = None,
+        max_fits: Optional[int] = None,
+        state_path: Optional[Path] = None,
+        n_parallel: int = 1,
+        n_jobs: Optional[int] = None,
+        validation_fraction: float = 0.2,
+        random_state: int = 42,
+    ):
+        """
+        Args:
+            base_params: Native XGBoost parameters shared by every trial
+            search_space: Candidate values per parameter
+            max_rounds: Boosting rounds for a fully trained configuration
+            min_rounds: Fewest rounds any configuration is trained for
+            eta: Halving rate; 1/eta of each rung is promoted
+            early_stopping_rounds: Patience on the validation AUC
+            budget_seconds: Wall-time budget for this run (None: unlimited)
+            max_fits: Fit budget for this run (None: unlimited)
+            state_path: JSON trial log to resume from and append to
+            n_parallel: Trials trained concurrently
+            n_jobs: Total XGBoost threads, split across parallel trials
+            validation_fraction: Held-out share of rows for the validation AUC
+            random_state: Seed for configuration sampling and the split
+        """
+        if eta < 2:
+            raise ValueError(f"eta must be at least 2, got {eta}")
+        if not 1 <= min_rounds <= max_rounds:
+            raise ValueError("Need 1 <= min_rounds <= max_rounds")
+
+        self.base_params = dict(base_params)
+        self.search_space = dict(search_space or DEFAULT_SEARCH_SPACE)
+        self.max_rounds = max_rounds
+        self.min_rounds = min_rounds
+        self.eta = eta
+        self.early_stopping_rounds = early_stopping_rounds
+        self.budget_seconds = budget_seconds
+        self.max_fits = max_fits
+        self.state_path = Path(state_path) if state_path else None
+        self.n_parallel = max(1, n_parallel)
+        self.nthread = trial_threads(self.n_parallel, n_jobs)
+        self.validation_fraction = validation_fraction
+        self.random_state = random_state
+
+        self.trials: Dict[str, Dict[str, Any]] = {}
+        self.fits = 0
+        self.budget_exhausted = False
+        self._started = 0.0
+        self._lock = threading.Lock()
+
+    def brackets(self) -> List[List[tuple]]:
+        """
+        Successive-halving plan of each Hyperband bracket
+
+        Returns:
+            Per bracket, its rungs as (n_configurations, rounds)
+        """
+        ratio = self.max_rounds / self.min_rounds
+        s_max = int(math.floor(math.log(ratio, self.eta) + 1e-9))
+        plan = []
+        for s in range(s_max, -1, -1):
+            n = int(math.ceil((s_max + 1) / (s + 1) * self.eta**s))
+            rungs = []
+            for i in range(s + 1):
+                rounds = int(round(self.max_rounds * self.eta ** (i - s)))
+                rungs.append((max(1, n // self.eta**i), max(1, rounds)))
+            plan.append(rungs)
+        return plan
+
+    def run(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
+        """
+        Search the space and return the best configuration
+
+        Args:
+            X: Feature matrix
+            y: Target labels
+
+        Returns:
+            Best params, validation AUC and rounds, plus the trial log
+        """
+        self._load_state()
+        self._started = time.perf_counter()
+        self.fits = 0
+        self.budget_exhausted = False
+
+        X_train, X_val, y_train, y_val = train_test_split(
+            X,
+            y,
+            test_size=self.validation_fraction,
+            random_state=self.random_state,
+            stratify=y,
+        )
+        max_bin = self.base_params.get("max_bin") or DEFAULT_MAX_BIN
+        dtrain = xgb.QuantileDMatrix(
+            X_train, label=y_train, enable_categorical=True, max_bin=max_bin
+        )
+        dval = xgb.QuantileDMatrix(
+            X_val, label=y_val, enable_categorical=True, ref=dtrain
+        )
+
+        candidates = self._sample_configurations()
+        with ThreadPoolExecutor(max_workers=self.n_parallel) as pool:
+            for bracket, rungs in enumerate(self.brackets()):
+                configs = [next(candidates) for _ in range(rungs[0][0])]
+                for n_configs, rounds in rungs:
+                    configs = configs[:n_configs]
+                    results = list(
+                        pool.map(
+                            lambda params: self._trial(
+                                params, rounds, bracket, dtrain, dval
+                            ),
+                            configs,
+                        )
+                    )
+                    if self.budget_exhausted:
+                        break
+                    ranked = sorted(
+                        zip(results, configs), key=lambda r: -r[0]["validation_auc"]
+                    )
+                    configs = [params for _, params in ranked]
+                if self.budget_exhausted:
+                    break
+
+        return self._results()
+
+    def _trial(
+        self,
+        params: Dict[str, Any],
+        rounds: int,
+        bracket: int,
+        dtrain: xgb.DMatrix,
+        dval: xgb.DMatrix,
+    ) -> Dict[str, Any]:
+        """Train one configuration for a number of rounds (or reuse its result)"""
+        key = self._trial_key(params, rounds)
+        with self._lock:
+            if key in self.trials:
+                return self.trials[key]
+            if self._out_of_budget():
+                self.budget_exhausted = True
+                return {"validation_auc": -np.inf}
+            self.fits += 1
+
+        start = time.perf_counter()
+        booster = xgb.train(
+            {
+                **self.base_params,
+                **params,
+                "eval_metric": "auc",
+                "nthread": self.nthread,
+            },
+            dtrain,
+            num_boost_round=rounds,
+            evals=[(dval, "validation")],
+            early_stopping_rounds=self.early_stopping_rounds,
+            verbose_eval=False,
+        )
+        trial = {
+            "params": params,
+            "rounds": rounds,
+            "bracket": bracket,
+            "validation_auc": float(booster.best_score),
+            "best_iteration": int(booster.best_iteration),
+            "seconds": time.perf_counter() - start,
+        }
+        with self._lock:
+            self.trials[key] = trial
+            self._save_state()
+        return trial
+
+    def _sample_configurations(self):
+        """Seeded, non-repeating configurations from the search space grid"""
+        names = sorted(self.search_space)
+        grid = list(itertools.product(*(self.search_space[n] for n in names)))
+        rng = np.random.default_rng(self.random_state)
+        while True:
+            for i in rng.permutation(len(grid)):
+                yield {name: _plain(v) for name, v in zip(names, grid[i])}
+
+    def _out_of_budget(self) -> bool:
+        if self.max_fits is not None and self.fits >= self.max_fits:
+            return True
+        if self.budget_seconds is not None:
+            return time.perf_counter() - self._started >= self.budget_seconds
+        return False
+
+    @staticmethod
+    def _trial_key(params: Dict[str, Any], rounds: int) -> str:
+        return json.dumps({"params": params, "rounds": rounds}, sort_keys=True)
+
+    def _settings(self) -> Dict[str, Any]:
+        """Everything that determines the trial plan and its results"""
+        return {
+            "base_params": {k: _plain(v) for k, v in self.base_params.items()},
+            "search_space": {
+                k: [_plain(v) for v in values]
+                for k, values in sorted(self.search_space.items())
+            },
+            "max_rounds": self.max_rounds,
+            "min_rounds": self.min_rounds,
+            "eta": self.eta,
+            "early_stopping_rounds": self.early_stopping_rounds,
+            "validation_fraction": self.validation_fraction,
+            "random_state": self.random_state,
+        }
+
+    def _load_state(self) -> None:
+        self.trials = {}
+        if self.state_path is None or not self.state_path.exists():
+            return
+
+        state = json.loads(self.state_path.read_text())
+        if state.get("format_version") != TUNING_STATE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported tuning state format {state.get('format_version')} "
+                f"(expected {TUNING_STATE_FORMAT_VERSION})"
+            )
+        if state["settings"] != json.loads(json.dumps(self._settings())):
+            raise ValueError(
+                f"Tuning state {self.state_path} was written for a different "
+                "search; use a new state file"
+            )
+        for trial in state["trials"]:
+            self.trials[self._trial_key(trial["params"], trial["rounds"])] = trial
+        print(f"Resuming tuning with {len(self.trials)} completed trials")
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+
+        state = {
+            "format_version": TUNING_STATE_FORMAT_VERSION,
+            "settings": self._settings(),
+            "trials": list(self.trials.values()),
+        }
+        # Write then rename so an interrupted run never leaves a torn file
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2))
+        tmp_path.replace(self.state_path)
+
+    def _results(self) -> Dict[str, Any]:
+        if not self.trials:
+            raise ValueError("Tuning budget exhausted before any trial completed")
+
+        trials = pd.DataFrame(list(self.trials.values()))
+        # Rank by AUC; among equals prefer the configuration trained longest
+        best = trials.sort_values(
+            ["validation_auc", "rounds"], ascending=False, kind="stable"
+        ).iloc[0]
+        return {
+            "best_params": dict(best["params"]),
+            "best_score": float(best["validation_auc"]),
+            "best_num_boost_round": int(best["best_iteration"]) + 1,
+            "trials": trials,
+            "fits": self.fits,
+            "elapsed_seconds": time.perf_counter() - self._started,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+def _plain(value):
+    """JSON-friendly Python scalar"""
+    return value.item() if isinstance(value, np.generic) else value
@@ -3,14 +3,27 @@ XGBoost Churn Prediction Model
 Primary production model with hyperparameter tuning
 """
 
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import xgboost as xgb
-from sklearn.model_selection import cross_val_score
+from sklearn.metrics import roc_auc_score
 
-from .base_model import BaseChurnModel
+from .base_model import BaseChurnModel, risk_levels
+from .training_matrix import (
+    DEFAULT_CV_FOLDS,
+    DEFAULT_MAX_BIN,
+    PhaseTimer,
+    build_training_matrix,
+    fold_matrices,
+)
+from .tree_engine import FlatTreeEnsemble
+from .tuning import DEFAULT_SEARCH_SPACE, HyperbandTuner
+
+BOOSTER_FILENAME = "booster.ubj"
+TREE_ENGINE_DIRNAME = "tree_engine"
 
 
 class XGBoostChurnModel(BaseChurnModel):
@@ -32,8 +45,14 @@ class XGBoostChurnModel(BaseChurnModel):
         "random_state": 42,
         "n_jobs": -1,
         "tree_method": "hist",
+        "enable_categorical": True,  # Categorical feature columns
     }
 
+    # "booster" scores through XGBoost, "numpy" through the compiled
+    # FlatTreeEnsemble, "auto" through the engine up to AUTO_ENGINE_MAX_ROWS rows
+    INFERENCE_BACKENDS = ("booster", "numpy", "auto")
+    AUTO_ENGINE_MAX_ROWS = 500
+
     def __init__(self, model_config: Dict[str, Any] = None):
         """
         Initialize XGBoost model
@@ -47,6 +66,10 @@ class XGBoostChurnModel(BaseChurnModel):
 
         super().__init__(config)
         self.model = xgb.XGBClassifier(**self.model_config)
+        # n_jobs in model_config is the training thread count; serving sets its own
+        self.inference_threads: Optional[int] = None
+        self.inference_backend = "booster"
+        self._engine: Optional[FlatTreeEnsemble] = None
 
     def train(
         self,
@@ -55,6 +78,9 @@ class XGBoostChurnModel(BaseChurnModel):
         X_val: pd.DataFrame = None,
         y_val: pd.Series = None,
         early_stopping_rounds: int = 10,
+        use_dmatrix: bool = False,
+        matrix_cache_path: Optional[Path] = None,
+        cv_folds: int = DEFAULT_CV_FOLDS,
     ) -> Dict[str, Any]:
         """
         Train XGBoost model with optional validation set
@@ -64,64 +90,211 @@ class XGBoostChurnModel(BaseChurnModel):
             y: Training labels
             X_val: Validation features (optional)
             y_val: Validation labels (optional)
-            early_stopping_rounds: Early stopping patience
+            early_stopping_rounds: Early stopping patience on the validation
+                AUC; the final model keeps only the trees up to the best
+                iteration. Needs a validation set; None or 0 disables it
+            use_dmatrix: Train the final model natively on one binned
+                training matrix
+            matrix_cache_path: Binary matrix cache for retraining on unchanged
+                data (implies use_dmatrix)
+            cv_folds: Cross-validation folds; 0 skips cross-validation
+
+        Both paths run CV on per-fold binned matrices whose cuts come from
+        the fold's training rows (see fold_matrices). With cv_folds set, the
+        reported training
+        metrics come from the folds' out-of-fold predictions; with
+        cv_folds=0 they are in-sample predictions of the final model.
+        metadata["training_metrics_source"] records which.
 
         Returns:
             Training metrics
         """
-        from datetime import datetime
+        if cv_folds == 1 or cv_folds < 0:
+            raise ValueError(f"cv_folds must be 0 or at least 2, got {cv_folds}")
+
+        # A compiled engine or saved importances would describe the previous trees
+        self._engine = None
+        self.feature_importances = None
+        # Fit with the training threads even if serving threads were set
+        self.model.set_params(n_jobs=self.model_config["n_jobs"])
+
+        if use_dmatrix or matrix_cache_path is not None:
+            results = self._train_on_matrix(
+                X, y, X_val, y_val, early_stopping_rounds, matrix_cache_path, cv_folds
+            )
+            self._apply_inference_threads()
+            return results
 
-        from sklearn.model_selection import cross_val_score
+        from datetime import datetime
 
         print(f"Training XGBoost model on {len(X)} samples...")
 
         # Store feature names
         self.feature_names = list(X.columns)
 
-        # Prepare evaluation set
+        # Prepare evaluation set; early stopping watches the last one
         eval_set = [(X, y)]
         if X_val is not None and y_val is not None:
             eval_set.append((X_val, y_val))
+        early_stopping = self._early_stopping(early_stopping_rounds, X_val, y_val)
 
         # Train model
+        phases = PhaseTimer()
         start_time = datetime.utcnow()
 
-        self.model.fit(X, y, eval_set=eval_set, verbose=False)
+        with phases("fit"):
+            self.model.set_params(early_stopping_rounds=early_stopping)
+            try:
+                self.model.fit(X, y, eval_set=eval_set, verbose=False)
+            finally:
+                # Later fits without a validation set must not early-stop
+                self.model.set_params(early_stopping_rounds=None)
+            best_iteration = None
+            if early_stopping:
+                best_iteration = self._truncate_to_best_iteration(
+                    self.model.get_booster()
+                )
 
         training_time = (datetime.utcnow() - start_time).total_seconds()
 
-        # Cross-validation score
-        cv_scores = cross_val_score(
-            self.model, X, y, cv=5, scoring="roc_auc", n_jobs=-1
-        )
+        # Cross-validation on binned fold matrices instead of refitting clones
+        cv_scores = np.array([])
+        oof_proba = None
+        if cv_folds:
+            with phases("cross_validation"):
+                cv_scores, oof_proba = self._cross_validate(X, y, cv_folds)
+
+        # Training metrics: out-of-fold when CV ran, else in-sample
+        with phases("evaluation"):
+            if oof_proba is not None:
+                train_metrics = self.evaluate_probabilities(y, oof_proba)
+            else:
+                train_metrics = self.evaluate(X, y)
+
+        # Evaluate on validation set if provided
+        val_metrics = {}
+        if X_val is not None and y_val is not None:
+            with phases("validation"):
+                val_metrics = self.evaluate(X_val, y_val)
 
         # Store training metadata
         self.training_metadata = {
             "training_samples": len(X),
             "training_time_seconds": training_time,
-            "cv_mean_auc": float(cv_scores.mean()),
-            "cv_std_auc": float(cv_scores.std()),
+            **self._cv_summary(cv_scores, cv_folds),
+            "training_metrics_source": (
+                "out_of_fold" if oof_proba is not None else "in_sample"
+            ),
+            "phase_seconds": phases.seconds,
             "n_features": len(self.feature_names),
-            "best_iteration": self.model.best_iteration
-            if hasattr(self.model, "best_iteration")
-            else None,
+            "best_iteration": best_iteration,
+            "n_trees": self.model.get_booster().num_boosted_rounds(),
             "trained_at": datetime.utcnow().isoformat(),
         }
 
-        # Evaluate on training set
-        train_metrics = self.evaluate(X, y)
+        self._print_summary(training_time, train_metrics, val_metrics, cv_scores)
+        self._apply_inference_threads()
+
+        return {
+            "training_metrics": train_metrics,
+            "validation_metrics": val_metrics,
+            "metadata": self.training_metadata,
+        }
+
+    def _train_on_matrix(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        X_val: Optional[pd.DataFrame],
+        y_val: Optional[pd.Series],
+        early_stopping_rounds: Optional[int],
+        matrix_cache_path: Optional[Path],
+        cv_folds: int,
+    ) -> Dict[str, Any]:
+        """
+        Native training on one binned matrix
+
+        The DataFrame is converted and binned once for the final booster.
+        Each CV fold trains on its own matrix binned from its training rows
+        and predicts its held-out rows. Those out-of-fold predictions
+        give the CV AUC and the reported training metrics, so there is no
+        extra in-sample prediction pass; without CV the training metrics come
+        from one pass of the final booster over the matrix. The booster is
+        loaded into the sklearn estimator so predict(), save() and feature
+        importance work unchanged.
+        """
+        from datetime import datetime
+
+        print(f"Training XGBoost model on {len(X)} samples (binned matrix)...")
+
+        self.feature_names = list(X.columns)
+        params = self.model.get_xgb_params()
+        num_boost_round = self.model_config["n_estimators"]
+
+        phases = PhaseTimer()
+        start_time = datetime.utcnow()
+        with phases("matrix_build"):
+            dtrain = build_training_matrix(
+                X,
+                y,
+                max_bin=self.model_config.get("max_bin", DEFAULT_MAX_BIN),
+                cache_path=matrix_cache_path,
+            )
+
+        cv_scores = np.array([])
+        oof_proba = None
+        if cv_folds:
+            with phases("cross_validation"):
+                cv_scores, oof_proba = self._cross_validate(X, y, cv_folds)
+
+        with phases("fit"):
+            early_stopping = self._early_stopping(early_stopping_rounds, X_val, y_val)
+            evals = []
+            if early_stopping:
+                evals = [(self._validation_matrix(dtrain, X_val, y_val), "validation")]
+            booster = xgb.train(
+                params,
+                dtrain,
+                num_boost_round=num_boost_round,
+                evals=evals,
+                early_stopping_rounds=early_stopping,
+                verbose_eval=False,
+            )
+            best_iteration = None
+            if early_stopping:
+                best_iteration = self._truncate_to_best_iteration(booster)
+                booster = self.model.get_booster()
+            else:
+                self.model.load_model(bytearray(booster.save_raw("json")))
+        training_time = (datetime.utcnow() - start_time).total_seconds()
+
+        with phases("evaluation"):
+            if oof_proba is not None:
+                train_metrics = self.evaluate_probabilities(y, oof_proba)
+            else:
+                train_metrics = self.evaluate_probabilities(y, booster.predict(dtrain))
 
-        # Evaluate on validation set if provided
         val_metrics = {}
         if X_val is not None and y_val is not None:
-            val_metrics = self.evaluate(X_val, y_val)
+            with phases("validation"):
+                val_metrics = self.evaluate(X_val, y_val)
 
-        print(f"Training complete in {training_time:.2f}s")
-        print(f"Training AUC: {train_metrics['roc_auc']:.4f}")
-        print(f"CV AUC: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
+        self.training_metadata = {
+            "training_samples": len(X),
+            "training_time_seconds": training_time,
+            "training_matrix": type(dtrain).__name__,
+            **self._cv_summary(cv_scores, cv_folds),
+            "training_metrics_source": (
+                "out_of_fold" if oof_proba is not None else "in_sample"
+            ),
+            "phase_seconds": phases.seconds,
+            "n_features": len(self.feature_names),
+            "best_iteration": best_iteration,
+            "n_trees": booster.num_boosted_rounds(),
+            "trained_at": datetime.utcnow().isoformat(),
+        }
 
-        if val_metrics:
-            print(f"Validation AUC: {val_metrics['roc_auc']:.4f}")
+        self._print_summary(training_time, train_metrics, val_metrics, cv_scores)
 
         return {
             "training_metrics": train_metrics,
@@ -129,6 +302,153 @@ class XGBoostChurnModel(BaseChurnModel):
             "metadata": self.training_metadata,
         }
 
+    def _cross_validate(
+        self, X: pd.DataFrame, y: pd.Series, cv_folds: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stratified CV with each fold's bins cut from its training rows
+
+        Returns:
+            (AUC per fold, out-of-fold probability per row)
+        """
+        params = self.model.get_xgb_params()
+        num_boost_round = self.model_config["n_estimators"]
+        labels = np.asarray(y)
+
+        oof_proba = np.empty(len(labels), dtype=np.float64)
+        scores = []
+        for dtrain, dheld, held_out in fold_matrices(
+            X,
+            labels,
+            cv_folds,
+            self.model_config.get("random_state"),
+            max_bin=self.model_config.get("max_bin", DEFAULT_MAX_BIN),
+        ):
+            fold_booster = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+            oof_proba[held_out] = fold_booster.predict(dheld)
+            scores.append(roc_auc_score(labels[held_out], oof_proba[held_out]))
+        return np.asarray(scores), oof_proba
+
+    @staticmethod
+    def _early_stopping(
+        early_stopping_rounds: Optional[int],
+        X_val: Optional[pd.DataFrame],
+        y_val: Optional[pd.Series],
+    ) -> Optional[int]:
+        """Patience to use, or None when early stopping is off or has no data"""
+        if not early_stopping_rounds:
+            return None
+        if X_val is None or y_val is None:
+            print("No validation set; training all trees without early stopping")
+            return None
+        return early_stopping_rounds
+
+    @staticmethod
+    def _validation_matrix(
+        dtrain: xgb.DMatrix, X_val: pd.DataFrame, y_val: pd.Series
+    ) -> xgb.DMatrix:
+        """Validation matrix binned with the training matrix's cuts"""
+        if isinstance(dtrain, xgb.QuantileDMatrix):
+            return xgb.QuantileDMatrix(
+                X_val, label=y_val, enable_categorical=True, ref=dtrain
+            )
+        return xgb.DMatrix(X_val, label=y_val, enable_categorical=True)
+
+    def _truncate_to_best_iteration(self, booster: xgb.Booster) -> int:
+        """
+        Keep only the trees up to the early-stopping best iteration
+
+        The trees boosted after it (the patience window) would still be
+        stored and walked by every later prediction; slicing them off makes
+        the saved model and each predict_proba call proportionally cheaper.
+
+        Returns:
+            The best iteration (0-based)
+        """
+        best_iteration = int(booster.best_iteration)
+        truncated = booster[: best_iteration + 1]
+        self.model.load_model(bytearray(truncated.save_raw("json")))
+        return best_iteration
+
+    @staticmethod
+    def _cv_summary(cv_scores: np.ndarray, cv_folds: int) -> Dict[str, Any]:
+        """CV metadata; AUC fields are None when cross-validation was skipped"""
+        if not len(cv_scores):
+            return {"cv_folds": 0, "cv_mean_auc": None, "cv_std_auc": None}
+        return {
+            "cv_folds": cv_folds,
+            "cv_mean_auc": float(cv_scores.mean()),
+            "cv_std_auc": float(cv_scores.std()),
+        }
+
+    def _print_summary(
+        self,
+        training_time: float,
+        train_metrics: Dict[str, float],
+        val_metrics: Dict[str, float],
+        cv_scores: np.ndarray,
+    ) -> None:
+        source = self.training_metadata["training_metrics_source"]
+        label = "Out-of-fold" if source == "out_of_fold" else "Training"
+
+        print(f"Training complete in {training_time:.2f}s")
+        print(f"{label} AUC: {train_metrics['roc_auc']:.4f}")
+        if len(cv_scores):
+            print(f"CV AUC: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
+
+        if val_metrics:
+            print(f"Validation AUC: {val_metrics['roc_auc']:.4f}")
+
+        phases = ", ".join(
+            f"{name} {seconds:.2f}s"
+            for name, seconds in self.training_metadata["phase_seconds"].items()
+        )
+        print(f"Phases: {phases}")
+
+    def _save_estimator(self, directory: Path) -> Dict[str, str]:
+        """
+        Native UBJSON booster, plus the compiled tree engine when supported
+
+        Args:
+            directory: Artifact directory being written
+
+        Returns:
+            Manifest file entries
+        """
+        self.model.save_model(directory / BOOSTER_FILENAME)
+        files = {"booster": BOOSTER_FILENAME}
+        try:
+            self._compiled_engine().save(directory / TREE_ENGINE_DIRNAME)
+            files["tree_engine"] = TREE_ENGINE_DIRNAME
+        except ValueError as e:
+            print(f"Tree engine not saved: {e}")
+        return files
+
+    def _load_estimator(self, directory: Path, files: Dict[str, str]) -> None:
+        self.model = xgb.XGBClassifier(**self.model_config)
+        self.model.load_model(directory / files["booster"])
+        if "tree_engine" in files:
+            self._engine = FlatTreeEnsemble.load(directory / files["tree_engine"])
+
+    @classmethod
+    def load(
+        cls, filepath: Path, inference_threads: Optional[int] = None
+    ) -> "XGBoostChurnModel":
+        """
+        Load model from disk and set its prediction threads
+
+        Args:
+            filepath: Model artifact directory (or legacy joblib file)
+            inference_threads: nthread for the loaded booster (None keeps the
+                training setting saved with the model)
+
+        Returns:
+            Loaded model instance
+        """
+        instance = super().load(filepath)
+        instance.set_inference_threads(inference_threads)
+        return instance
+
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict churn class (0 or 1)
@@ -142,6 +462,9 @@ class XGBoostChurnModel(BaseChurnModel):
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
 
+        if self._uses_engine(X):
+            return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
         return self.model.predict(X)
 
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
@@ -157,8 +480,80 @@ class XGBoostChurnModel(BaseChurnModel):
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
 
+        if self._uses_engine(X):
+            return self._compiled_engine().predict_proba(X)
+
         return self.model.predict_proba(X)
 
+    def predict_row(self, values: List[float]) -> float:
+        """
+        Churn probability of one row given in feature order, without pandas
+
+        Args:
+            values: Feature values ordered like feature_names (categoricals as
+                category codes, NaN for missing)
+
+        Returns:
+            Churn probability
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        return self._compiled_engine().predict_row(values)
+
+    def set_inference_backend(self, backend: str) -> None:
+        """
+        Choose how predictions are scored
+
+        "numpy" compiles the trained trees into flat arrays evaluated with
+        vectorized NumPy: no DMatrix construction per call, so single rows
+        and small batches are several times faster, while XGBoost's predictor
+        wins on large batches. "auto" picks per call by batch size.
+        Probabilities match the booster within float32 rounding.
+
+        Args:
+            backend: One of INFERENCE_BACKENDS
+        """
+        if backend not in self.INFERENCE_BACKENDS:
+            raise ValueError(
+                f"Unknown inference backend {backend!r}; "
+                f"expected one of {self.INFERENCE_BACKENDS}"
+            )
+        if backend != "booster":
+            self._compiled_engine()
+        self.inference_backend = backend
+
+    def set_inference_threads(self, n_threads: Optional[int]) -> None:
+        """
+        Threads XGBoost uses for predictions
+
+        Training keeps model_config["n_jobs"]; this sets nthread on the
+        trained booster (and the estimator's n_jobs for its DMatrix fallback)
+        so several API worker processes don't each claim every core. The
+        setting is per process and is not saved with the model.
+
+        Args:
+            n_threads: Prediction threads; None keeps the training setting
+        """
+        if n_threads is not None and n_threads < 1 and n_threads != -1:
+            raise ValueError("n_threads must be positive, or -1 for all cores")
+        self.inference_threads = n_threads
+        self._apply_inference_threads()
+
+    def _apply_inference_threads(self) -> None:
+        if self.inference_threads is not None and self.model.__sklearn_is_fitted__():
+            self.model.set_params(n_jobs=self.inference_threads)
+
+    def _uses_engine(self, X: pd.DataFrame) -> bool:
+        if self.inference_backend == "auto":
+            return len(X) <= self.AUTO_ENGINE_MAX_ROWS
+        return self.inference_backend == "numpy"
+
+    def _compiled_engine(self) -> FlatTreeEnsemble:
+        if self._engine is None:
+            self._engine = FlatTreeEnsemble.from_booster(self.model.get_booster())
+        return self._engine
+
     def predict_risk_score(self, X: pd.DataFrame) -> pd.DataFrame:
         """
         Predict churn with risk scoring (0-100 scale)
@@ -175,7 +570,7 @@ class XGBoostChurnModel(BaseChurnModel):
             {
                 "churn_probability": probabilities,
                 "risk_score": (probabilities * 100).astype(int),
-                "risk_level": [self._get_risk_level(p) for p in probabilities],
+                "risk_level": risk_levels(probabilities),
                 "predicted_churn": (probabilities >= 0.5).astype(int),
             }
         )
@@ -187,51 +582,72 @@ class XGBoostChurnModel(BaseChurnModel):
         X: pd.DataFrame,
         y: pd.Series,
         param_grid: Dict[str, list] = None,
-        cv: int = 5,
+        budget_seconds: Optional[float] = None,
+        max_fits: Optional[int] = None,
+        state_path: Optional[Path] = None,
+        n_parallel: int = 1,
     ) -> Dict[str, Any]:
         """
-        Perform hyperparameter tuning using GridSearchCV
+        Perform hyperparameter tuning with Hyperband
+
+        Configurations train with early stopping on a held-out validation
+        AUC; successive halving promotes the best to more boosting rounds.
 
         Args:
             X: Feature matrix
             y: Target labels
-            param_grid: Parameter grid for search
-            cv: Number of cross-validation folds
+            param_grid: Candidate values per parameter; an n_estimators entry
+                sets the most rounds a configuration is trained for
+            budget_seconds: Wall-time budget (None: unlimited)
+            max_fits: Fit budget (None: unlimited)
+            state_path: Trial log to resume from and append to
+            n_parallel: Trials trained concurrently (threads split across them)
 
         Returns:
             Best parameters and scores
         """
-        from sklearn.model_selection import GridSearchCV
-
-        if param_grid is None:
-            param_grid = {
-                "max_depth": [4, 6, 8],
-                "learning_rate": [0.01, 0.1, 0.2],
-                "n_estimators": [100, 200, 300],
-                "subsample": [0.7, 0.8, 0.9],
-                "colsample_bytree": [0.7, 0.8, 0.9],
-            }
-
-        print(f"Tuning hyperparameters with {cv}-fold CV...")
-
-        grid_search = GridSearchCV(
-            self.model, param_grid, cv=cv, scoring="roc_auc", n_jobs=-1, verbose=1
+        search_space = dict(param_grid or DEFAULT_SEARCH_SPACE)
+        max_rounds = max(
+            search_space.pop("n_estimators", [self.model_config["n_estimators"]])
         )
 
-        grid_search.fit(X, y)
+        base_params = self.model.get_xgb_params()
+        base_params.pop("n_jobs", None)
+        n_jobs = self.model_config.get("n_jobs")
+
+        tuner = HyperbandTuner(
+            base_params,
+            search_space,
+            max_rounds=max_rounds,
+            budget_seconds=budget_seconds,
+            max_fits=max_fits,
+            state_path=state_path,
+            n_parallel=n_parallel,
+            n_jobs=n_jobs,
+            random_state=self.model_config.get("random_state", 42),
+        )
+        n_configs = sum(rungs[0][0] for rungs in tuner.brackets())
+        print(
+            f"Tuning hyperparameters with Hyperband: {n_configs} configurations, "
+            f"up to {max_rounds} rounds, {tuner.n_parallel} parallel x "
+            f"{tuner.nthread} threads..."
+        )
 
-        # Update model with best parameters
-        self.model_config.update(grid_search.best_params_)
-        self.model = grid_search.best_estimator_
+        results = tuner.run(X, y)
 
-        results = {
-            "best_params": grid_search.best_params_,
-            "best_score": grid_search.best_score_,
-            "cv_results": pd.DataFrame(grid_search.cv_results_),
-        }
+        # Update model with best parameters and the early-stopped round count
+        self.model_config.update(results["best_params"])
+        self.model_config["n_estimators"] = results["best_num_boost_round"]
+        self.model = xgb.XGBClassifier(**self.model_config)
+        self._engine = None
 
-        print(f"Best AUC: {grid_search.best_score_:.4f}")
-        print(f"Best params: {grid_search.best_params_}")
+        print(
+            f"Tuning finished: {results['fits']} fits in "
+            f"{results['elapsed_seconds']:.1f}s"
+            + (" (budget exhausted)" if results["budget_exhausted"] else "")
+        )
+        print(f"Best AUC: {results['best_score']:.4f}")
+        print(f"Best params: {results['best_params']}")
 
         return results
 
@@ -0,0 +1,108 @@
+"""
+Shared fixtures for ML service tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_raw_tables(n_leases: int = 200, seed: int = 42) -> dict:
+    """Generate small, consistent tenant/lease/payment/property/maintenance tables"""
+    rng = np.random.default_rng(seed)
+    n = n_leases
+
+    tenants = pd.DataFrame(
+        {
+            "tenant_id": [f"TENANT-{i:06d}" for i in range(n)],
+            "annual_income": rng.integers(40000, 150000, n).astype(float),
+            "portal_login_count": rng.integers(5, 100, n),
+            "autopay_enabled": rng.random(n) > 0.4,
+            "primary_payment_method": rng.choice(["ach", "credit_card", "check"], n),
+            "avg_response_time_hours": rng.integers(1, 48, n),
+            "complaint_count": rng.integers(0, 4, n),
+            "tenure_months": rng.integers(1, 60, n),
+        }
+    )
+
+    properties = pd.DataFrame(
+        {
+            "property_id": [f"PROP-{i:06d}" for i in range(n)],
+            "zip_code": rng.choice(["80202", "80203", "80209"], n),
+            "square_feet": rng.integers(800, 3000, n),
+            "bedrooms": rng.integers(1, 5, n),
+            "bathrooms": rng.choice([1.0, 1.5, 2.0, 2.5], n),
+            "year_built": rng.integers(1950, 2020, n),
+            "location_score": rng.integers(1, 11, n),
+            "school_rating": rng.integers(1, 11, n),
+            "garage": rng.random(n) > 0.3,
+            "yard": rng.random(n) > 0.2,
+            "air_conditioning": rng.random(n) > 0.4,
+            "condition_rating": rng.integers(1, 6, n),
+            "neighborhood_type": rng.choice(["urban", "suburban"], n),
+        }
+    )
+
+    end_dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(
+        rng.integers(0, 700, n), unit="D"
+    )
+    leases = pd.DataFrame(
+        {
+            "lease_id": [f"LEASE-{i:06d}" for i in range(n)],
+            "tenant_id": tenants["tenant_id"],
+            "property_id": properties["property_id"],
+            "lease_end_date": end_dates.strftime("%Y-%m-%d"),
+            "lease_term_months": rng.choice([6, 12, 24], n),
+            "monthly_rent": rng.uniform(1500, 3500, n).round(2),
+            "security_deposit": rng.uniform(1500, 5000, n).round(2),
+            "renewal_count": rng.integers(0, 5, n),
+            "last_rent_increase_pct": rng.uniform(0, 0.08, n).round(3),
+        }
+    )
+
+    n_payments = n * 6
+    payment_dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        rng.integers(0, 600, n_payments), unit="D"
+    )
+    payments = pd.DataFrame(
+        {
+            "payment_id": [f"PAY-{i:08d}" for i in range(n_payments)],
+            # Leave a few leases without any payment history
+            "lease_id": rng.choice(leases["lease_id"].iloc[: n - 5], n_payments),
+            "payment_date": payment_dates.strftime("%Y-%m-%d"),
+            "amount": rng.uniform(1500, 3500, n_payments).round(2),
+            "days_late": rng.integers(0, 15, n_payments),
+        }
+    )
+
+    n_requests = n * 2
+    maintenance = pd.DataFrame(
+        {
+            "request_id": [f"MAINT-{i:08d}" for i in range(n_requests)],
+            "property_id": rng.choice(properties["property_id"], n_requests),
+            "request_type": rng.choice(
+                ["plumbing", "electrical", "hvac", "appliance"], n_requests
+            ),
+            "priority": rng.choice(["LOW", "MEDIUM", "HIGH"], n_requests),
+            "resolution_days": rng.integers(1, 14, n_requests),
+            "cost": rng.integers(50, 1000, n_requests),
+            "request_date": (
+                pd.Timestamp("2024-01-01")
+                + pd.to_timedelta(rng.integers(0, 600, n_requests), unit="D")
+            ).strftime("%Y-%m-%d"),
+        }
+    )
+
+    return {
+        "tenants": tenants,
+        "leases": leases,
+        "payments": payments,
+        "properties": properties,
+        "maintenance": maintenance,
+    }
+
+
+@pytest.fixture
+def raw_tables():
+    """Raw source tables keyed by name"""
+    return make_raw_tables()
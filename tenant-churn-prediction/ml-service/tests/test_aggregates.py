@@ -0,0 +1,295 @@
+"""
+Unit Tests for Incremental Payment/Maintenance Aggregates
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.features.aggregates import (
+    AggregateStore,
+    aggregate_payments,
+    finalize_maintenance,
+    maintenance_partials,
+)
+from src.features.feature_engineer import TenantFeatureEngineer
+
+
+def _groupby_aggregates(tables):
+    """Aggregates from the full-history groupby in _merge_data_sources"""
+    merged = TenantFeatureEngineer()._merge_data_sources(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+    )
+    return merged.assign(last_payment_date=pd.to_datetime(merged["last_payment_date"]))
+
+
+def _store_aggregates(tables, store):
+    return TenantFeatureEngineer()._merge_data_sources(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        aggregate_store=store,
+    )
+
+
+def _split(df, column, cutoffs):
+    """Split rows into consecutive batches at the given date cutoffs"""
+    stamps = pd.to_datetime(df[column])
+    bounds = [pd.Timestamp.min] + [pd.Timestamp(c) for c in cutoffs]
+    bounds.append(pd.Timestamp.max)
+    return [df[(stamps > lo) & (stamps <= hi)] for lo, hi in zip(bounds, bounds[1:])]
+
+
+def test_full_load_matches_groupby(raw_tables):
+    """One update over the full history reproduces the groupby aggregates"""
+    store = AggregateStore()
+    store.update(raw_tables["payments"], raw_tables["maintenance"])
+
+    pd.testing.assert_frame_equal(
+        _store_aggregates(raw_tables, store),
+        _groupby_aggregates(raw_tables),
+        check_dtype=False,
+    )
+
+
+def test_incremental_batches_match_full_history(raw_tables):
+    """Folding monthly extracts gives the same aggregates as one full groupby"""
+    cutoffs = ["2024-04-30", "2024-09-30", "2025-02-28"]
+    payment_batches = _split(raw_tables["payments"], "payment_date", cutoffs)
+    maintenance_batches = _split(raw_tables["maintenance"], "request_date", cutoffs)
+
+    store = AggregateStore()
+    for payments, maintenance in zip(payment_batches, maintenance_batches):
+        folded = store.update(payments, maintenance)
+        assert folded == {"payments": len(payments), "maintenance": len(maintenance)}
+
+    pd.testing.assert_frame_equal(
+        _store_aggregates(raw_tables, store),
+        _groupby_aggregates(raw_tables),
+        check_dtype=False,
+    )
+
+
+def test_update_skips_rows_already_folded(raw_tables):
+    """Re-sending the full history only folds rows not seen before"""
+    payments = raw_tables["payments"]
+    old, new = _split(payments, "payment_date", ["2025-01-31"])
+
+    store = AggregateStore()
+    store.update(payments=old)
+    before = store.payment_aggregates()
+
+    assert store.update(payments=old) == {"payments": 0}
+    pd.testing.assert_frame_equal(store.payment_aggregates(), before)
+
+    assert store.update(payments=payments) == {"payments": len(new)}
+    assert store.folded_count("payments") == len(payments)
+
+
+def test_same_day_and_late_rows_are_folded(raw_tables):
+    """Rows dated on or before the latest folded date still count once"""
+    payments = raw_tables["payments"]
+    dates = pd.to_datetime(payments["payment_date"])
+    cutoff = dates.value_counts().idxmax()
+
+    # The first extract stops part way through the cutoff day and misses
+    # a few older payments that are only loaded later
+    held_back = ((dates == cutoff) & dates.duplicated()) | (
+        np.arange(len(payments)) % 17 == 0
+    )
+    first = payments[(dates <= cutoff) & ~held_back]
+    second = pd.concat([payments[~payments.index.isin(first.index)], first.head(50)])
+    assert (pd.to_datetime(second["payment_date"]) == cutoff).any()
+
+    store = AggregateStore()
+    store.update(payments=first)
+    assert store.update(payments=second) == {"payments": len(payments) - len(first)}
+
+    expected = aggregate_payments(payments).assign(
+        last_payment_date=lambda df: pd.to_datetime(df["last_payment_date"])
+    )
+    pd.testing.assert_frame_equal(
+        store.payment_aggregates().sort_values("lease_id").reset_index(drop=True),
+        expected.sort_values("lease_id").reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_window_bounds_ids_in_memory(raw_tables):
+    """Only ids near the watermark stay in memory; late rows are probed on disk"""
+    payments = raw_tables["payments"]
+    dates = pd.to_datetime(payments["payment_date"])
+    late = np.arange(len(payments)) % 11 == 0
+
+    store = AggregateStore(late_window_days=30)
+    assert store.update(payments=payments[~late]) == {"payments": (~late).sum()}
+
+    watermark = store.watermarks["payments"]
+    assert watermark == dates[~late].max()
+    window = store.window_ids["payments"]
+    assert (window >= watermark - pd.Timedelta(days=30)).all()
+    assert len(window) < (~late).sum() / 4
+    assert store.folded_count("payments") == (~late).sum()
+
+    # Backdated rows are folded once; re-sending the full history folds nothing
+    assert store.update(payments=payments) == {"payments": late.sum()}
+    assert store.update(payments=payments) == {"payments": 0}
+
+    expected = aggregate_payments(payments).assign(
+        last_payment_date=lambda df: pd.to_datetime(df["last_payment_date"])
+    )
+    pd.testing.assert_frame_equal(
+        store.payment_aggregates().sort_values("lease_id").reset_index(drop=True),
+        expected.sort_values("lease_id").reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_engineer_features_with_store(raw_tables):
+    """Features built from the store equal those from the full groupby"""
+    args = [
+        raw_tables[name]
+        for name in ["tenants", "leases", "payments", "properties", "maintenance"]
+    ]
+
+    expected = TenantFeatureEngineer().engineer_features(*args)
+    actual = TenantFeatureEngineer().engineer_features(
+        *args, aggregate_store=AggregateStore()
+    )
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_store_save_load_roundtrip(raw_tables, tmp_path):
+    """A reloaded store keeps its folded ids and continues folding"""
+    old, new = _split(raw_tables["payments"], "payment_date", ["2024-12-31"])
+
+    store = AggregateStore()
+    store.update(payments=old, maintenance=raw_tables["maintenance"])
+    store.save(tmp_path / "aggregates.pkl")
+
+    loaded = AggregateStore.load(tmp_path / "aggregates.pkl")
+    assert (tmp_path / "aggregates.ids.sqlite").exists()
+    assert loaded.watermarks == store.watermarks
+    for table, ids in store.window_ids.items():
+        assert loaded.window_ids[table].equals(ids)
+        assert loaded.folded_count(table) == store.folded_count(table)
+    assert loaded.update(payments=raw_tables["payments"]) == {"payments": len(new)}
+
+    # Saving in place keeps the ids folded since loading
+    loaded.save(tmp_path / "aggregates.pkl")
+    reloaded = AggregateStore.load(tmp_path / "aggregates.pkl")
+    assert reloaded.update(payments=raw_tables["payments"]) == {"payments": 0}
+
+    (tmp_path / "aggregates.ids.sqlite").unlink()
+    with pytest.raises(ValueError, match="no id index"):
+        AggregateStore.load(tmp_path / "aggregates.pkl")
+
+    full = AggregateStore()
+    full.update(payments=raw_tables["payments"])
+    np.testing.assert_allclose(
+        loaded.payment_aggregates()["payment_std"],
+        full.payment_aggregates()["payment_std"],
+    )
+
+
+def test_update_requires_row_ids(raw_tables):
+    """Rows without the configured id column, or with null ids, are rejected"""
+    store = AggregateStore(id_columns={"payments": "load_row_id"})
+    with pytest.raises(ValueError, match="no id column 'load_row_id'"):
+        store.update(payments=raw_tables["payments"])
+
+    payments = raw_tables["payments"].copy()
+    payments.loc[3, "payment_id"] = None
+    with pytest.raises(ValueError, match="missing 'payment_id' values"):
+        AggregateStore().update(payments=payments)
+
+    with pytest.raises(ValueError, match="no date column 'payment_date'"):
+        AggregateStore().update(payments=payments.drop(columns=["payment_date"]))
+
+
+def test_maintenance_aggregation_matches_reference(raw_tables):
+    """Vectorized maintenance statistics equal a plain per-group reference"""
+    maintenance = raw_tables["maintenance"].copy()
+    maintenance.loc[::7, "resolution_days"] = np.nan
+    maintenance.loc[::11, "request_type"] = "Pest Control"
+    maintenance.loc[::13, "request_type"] = "pest control"
+
+    actual = finalize_maintenance(maintenance_partials(maintenance)).set_index(
+        "property_id"
+    )
+
+    grouped = maintenance.groupby("property_id")
+    expected = pd.DataFrame(
+        {
+            "maintenance_count": grouped["request_id"].count(),
+            "high_priority_count": grouped["priority"].agg(
+                lambda x: (x == "HIGH").sum()
+            ),
+            "avg_resolution_days": grouped["resolution_days"].mean(),
+            "total_maintenance_cost": grouped["cost"].sum(),
+            "avg_maintenance_cost": grouped["cost"].mean(),
+        }
+    )
+    types = maintenance["request_type"].str.lower().str.replace(" ", "_")
+    type_counts = pd.crosstab(maintenance["property_id"], types)
+    type_counts.columns = [f"{t}_request_count" for t in type_counts.columns]
+    expected = expected.join(type_counts)
+
+    assert list(actual.columns) == list(expected.columns)
+    assert "pest_control_request_count" in actual.columns
+    pd.testing.assert_frame_equal(
+        actual, expected, check_dtype=False, check_names=False
+    )
+
+
+def test_maintenance_aggregation_without_optional_columns():
+    """Cost and request-type statistics are optional; new types fold in later"""
+    base = pd.DataFrame(
+        {
+            "request_id": ["M1", "M2", "M3"],
+            "property_id": ["P1", "P1", "P2"],
+            "priority": ["HIGH", "LOW", "HIGH"],
+            "resolution_days": [2, 4, 6],
+            "request_date": ["2025-01-01", "2025-01-02", "2025-01-03"],
+        }
+    )
+    aggregates = finalize_maintenance(maintenance_partials(base))
+    assert aggregates["maintenance_count"].tolist() == [2, 1]
+    assert aggregates["total_maintenance_cost"].isna().all()
+
+    store = AggregateStore()
+    store.update(maintenance=base.assign(request_type="HVAC", cost=100.0))
+    store.update(
+        maintenance=pd.DataFrame(
+            {
+                "request_id": ["M4"],
+                "property_id": ["P2"],
+                "priority": ["LOW"],
+                "resolution_days": [1],
+                "request_date": ["2025-02-01"],
+                "request_type": ["Roof"],
+                "cost": [400.0],
+            }
+        )
+    )
+    folded = store.maintenance_aggregates().set_index("property_id")
+    assert folded["hvac_request_count"].tolist() == [2, 1]
+    assert folded["roof_request_count"].tolist() == [0, 1]
+    assert folded["total_maintenance_cost"].tolist() == [200.0, 500.0]
+    assert folded["avg_maintenance_cost"].tolist() == [100.0, 250.0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
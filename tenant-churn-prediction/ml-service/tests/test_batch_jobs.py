@@ -0,0 +1,159 @@
+"""
+Unit Tests for Background Batch Scoring Jobs
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api import main
+from src.api.batch_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    RESULT_COLUMNS,
+    BatchJobRunner,
+    BatchJobStore,
+)
+from src.api.model_slot import ModelSlot, ServingModel
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.raw_tables import RAW_TABLES
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+def scored_rows(lease_ids):
+    return pd.DataFrame(
+        {
+            "lease_id": lease_ids,
+            "tenant_id": [f"T-{i}" for i in lease_ids],
+            "property_id": [f"P-{i}" for i in lease_ids],
+            "churn_probability": np.linspace(0, 1, len(lease_ids)),
+            "risk_score": np.arange(len(lease_ids)),
+            "risk_level": "LOW",
+            "predicted_churn": np.arange(len(lease_ids)) % 2 == 0,
+            "confidence": 0.5,
+            "predicted_at": "2026-01-01T00:00:00",
+        }
+    )
+
+
+def test_store_pages_chunks_in_submission_order(tmp_path):
+    """Chunks are stored with progress and read back page by page"""
+    store = BatchJobStore(tmp_path / "jobs.sqlite")
+    job_id = store.create_job(lease_count=5, chunk_count=2)
+    store.mark_running(job_id, "1.0.0")
+
+    store.add_chunk(job_id, 0, scored_rows(["L0", "L1", "L2"]), missing=0)
+    job = store.get_job(job_id)
+    assert (job["scored_count"], job["progress"]) == (3, 0.5)
+
+    store.add_chunk(job_id, 3, scored_rows(["L3"]), missing=1)
+    store.finish(job_id)
+
+    job = store.get_job(job_id)
+    assert job["status"] == JOB_COMPLETED
+    assert (job["scored_count"], job["missing_count"]) == (4, 1)
+    first = list(store.iter_results(job_id, limit=3))
+    rest = list(store.iter_results(job_id, after=first[-1]["position"], limit=3))
+    assert [r["lease_id"] for r in first + rest] == ["L0", "L1", "L2", "L3"]
+    assert [r["position"] for r in first + rest] == [0, 1, 2, 3]
+    assert list(first[0]) == ["position"] + RESULT_COLUMNS
+    assert first[0]["predicted_churn"] is True
+    assert store.get_job("batch_unknown") is None
+
+
+def test_unfinished_jobs_fail_after_restart(tmp_path):
+    """A job left running by a dead process isn't reported as running forever"""
+    store = BatchJobStore(tmp_path / "jobs.sqlite")
+    job_id = store.create_job(lease_count=1, chunk_count=1)
+    store.mark_running(job_id, "1.0.0")
+
+    restarted = BatchJobStore(tmp_path / "jobs.sqlite")
+    job = restarted.get_job(job_id)
+    assert job["status"] == JOB_FAILED
+    assert "restart" in job["error"]
+
+
+def wait_for_job(client, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/predict/batch/{job_id}", params={"limit": 1}).json()["job"]
+        if job["status"] in (JOB_COMPLETED, JOB_FAILED):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(f"Batch job {job_id} did not finish")
+
+
+def test_batch_job_scores_portfolio_in_chunks(raw_tables, tmp_path, monkeypatch):
+    """Submitted leases are scored in chunks and paged back in order"""
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    for name in RAW_TABLES:
+        raw_tables[name].to_csv(raw_dir / f"{name}.csv", index=False)
+
+    engineer = TenantFeatureEngineer()
+    X = engineer.engineer_features(*[raw_tables[name] for name in RAW_TABLES])
+    y = (np.random.default_rng(0).random(len(X)) > 0.7).astype(int)
+    model = XGBoostChurnModel({"n_estimators": 10, "n_jobs": 1})
+    model.train(X, y, cv_folds=0)
+
+    slot = ModelSlot()
+    monkeypatch.setattr(main, "MODEL_PATH", Path("/nonexistent/model"))
+    monkeypatch.setattr(main, "model_slot", slot)
+    monkeypatch.setattr(main, "BATCH_RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(
+        main,
+        "batch_jobs",
+        BatchJobRunner(
+            BatchJobStore(tmp_path / "jobs.sqlite"),
+            raw_dir,
+            main.score_lease_tables,
+            chunk_size=64,
+        ),
+    )
+
+    lease_ids = list(raw_tables["leases"]["lease_id"].sample(frac=1, random_state=1))
+    with TestClient(main.app) as client:
+        assert client.post("/predict/batch", json=lease_ids).status_code == 503
+
+        slot.swap(ServingModel(model=model, feature_engineer=engineer))
+        response = client.post("/predict/batch", json=lease_ids + ["LEASE-MISSING"])
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["chunk_count"] == -(-(len(lease_ids) + 1) // 64)
+
+        job = wait_for_job(client, job_id)
+        assert job["status"] == JOB_COMPLETED, job["error"]
+        assert job["scored_count"] == len(lease_ids)
+        assert job["missing_count"] == 1
+        assert job["progress"] == 1.0
+
+        results, after = [], -1
+        while after is not None:
+            page = client.get(
+                f"/predict/batch/{job_id}", params={"after": after, "limit": 50}
+            ).json()
+            assert len(page["results"]) <= 50
+            results.extend(page["results"])
+            after = page["next_after"]
+
+        assert client.get("/predict/batch/batch_unknown").status_code == 404
+
+    assert [r["lease_id"] for r in results] == lease_ids
+    expected = model.predict_proba(X[model.feature_names])[:, 1]
+    by_lease = dict(zip(raw_tables["leases"]["lease_id"], expected))
+    np.testing.assert_allclose(
+        [r["churn_probability"] for r in results],
+        [by_lease[lease_id] for lease_id in lease_ids],
+        rtol=1e-6,
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,220 @@
+"""
+Unit Tests for Columnar /predict Requests
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api import main
+from src.api.columnar import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    ColumnarValidationError,
+    read_columns,
+    validate_columns,
+)
+from src.api.model_slot import ModelSlot, ServingModel
+from src.api.streaming import NDJSON_MEDIA_TYPE
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.raw_tables import RAW_TABLES
+from src.models.xgboost_model import XGBoostChurnModel
+
+N_TENANTS = 30
+
+ROWS = [
+    {
+        "tenant_id": f"T{i}",
+        "property_id": f"P{i}",
+        "lease_id": f"L{i}",
+        "lease_end_date": f"2026-{i % 12 + 1:02d}-01",
+        "avg_days_late": float(i % 9),
+        "payment_count": 6 + i % 7,
+        "autopay_enabled": bool(i % 2),
+        "location_score": 1 + i % 10,
+        "property_condition": 1 + i % 5,
+        "has_garage": i % 3 == 0,
+        "annual_income": None if i % 4 == 0 else 40000.0 + 1000 * i,
+        "payment_method": ["ach", "check", "credit_card"][i % 3],
+    }
+    for i in range(N_TENANTS)
+]
+COLUMNS = {name: [row[name] for row in ROWS] for name in ROWS[0]}
+
+
+def test_validation_reports_bad_rows_per_column():
+    """Range, type and null checks run per column and name the failing rows"""
+    columns = {
+        **COLUMNS,
+        "location_score": [11] + COLUMNS["location_score"][1:],
+        "property_condition": [0, 6] + COLUMNS["property_condition"][2:],
+        "bedrooms": [2.5] * N_TENANTS,
+        "tenant_id": [None] + COLUMNS["tenant_id"][1:],
+    }
+    del columns["lease_id"]
+
+    with pytest.raises(ColumnarValidationError) as info:
+        validate_columns(columns, main.TENANT_COLUMNS)
+
+    errors = {e["loc"][1]: e for e in info.value.errors}
+    assert set(errors) == {
+        "tenant_id",
+        "lease_id",
+        "location_score",
+        "property_condition",
+        "bedrooms",
+    }
+    assert errors["location_score"]["rows"] == [0]
+    assert errors["property_condition"]["rows"] == [0, 1]
+    assert errors["lease_id"]["msg"] == "Field required"
+
+
+def test_validation_fills_defaults_and_types_columns():
+    frame = validate_columns(COLUMNS, main.TENANT_COLUMNS)
+
+    assert list(frame.columns) == list(main.TenantData.model_fields)
+    assert (frame["square_feet"] == 1500).all()
+    assert frame["location_score"].dtype == np.int64
+    assert frame["annual_income"].isna().sum() == (N_TENANTS + 3) // 4
+    row = main.TenantData(**ROWS[5]).dict()
+    assert frame.iloc[5].to_dict() == pytest.approx(row)
+
+
+def test_validation_coerces_like_row_model():
+    """Numeric strings and 0/1 booleans coerce as pydantic's lax mode does"""
+    lax = [
+        {
+            **row,
+            "avg_days_late": str(row["avg_days_late"]),
+            "payment_count": f"{row['payment_count']}.0",
+            "location_score": str(row["location_score"]),
+            "autopay_enabled": ["no", "yes", 0, 1][i % 4],
+            "has_garage": int(row["has_garage"]),
+            "annual_income": row["annual_income"] and str(row["annual_income"]),
+            "bedrooms": True,
+        }
+        for i, row in enumerate(ROWS)
+    ]
+    columns = {name: [row[name] for row in lax] for name in lax[0]}
+
+    frame = validate_columns(columns, main.TENANT_COLUMNS)
+    assert frame["payment_count"].dtype == np.int64
+    for i in (1, 2, 3):
+        expected = main.TenantData(**lax[i]).dict()
+        assert frame.iloc[i].to_dict() == pytest.approx(expected)
+
+    bad = {**columns, "payment_count": ["12.5"] + columns["payment_count"][1:]}
+    bad["autopay_enabled"] = ["maybe", 2] + columns["autopay_enabled"][2:]
+    with pytest.raises(ColumnarValidationError) as info:
+        validate_columns(bad, main.TENANT_COLUMNS)
+    errors = {e["loc"][1]: e for e in info.value.errors}
+    assert errors["payment_count"]["rows"] == [0]
+    assert errors["autopay_enabled"]["rows"] == [0, 1]
+
+
+def test_arrow_date_column_reads_as_iso_string():
+    """A date32 lease_end_date column validates like the row model's strings"""
+    dates = pd.to_datetime(COLUMNS["lease_end_date"]).date
+    table = pa.Table.from_pydict(
+        {**COLUMNS, "lease_end_date": pa.array(dates, type=pa.date32())}
+    )
+    body = pa.BufferOutputStream()
+    with pa.ipc.new_stream(body, table.schema) as writer:
+        writer.write_table(table)
+
+    columns = read_columns(body.getvalue().to_pybytes(), ARROW_STREAM_MEDIA_TYPE)
+    frame = validate_columns(columns, main.TENANT_COLUMNS)
+    assert frame["lease_end_date"].tolist() == COLUMNS["lease_end_date"]
+
+    columns["lease_end_date"] = columns["lease_end_date"].astype("datetime64[s]")
+    columns["lease_end_date"][3] += np.timedelta64(90, "m")
+    with pytest.raises(ColumnarValidationError) as info:
+        validate_columns(columns, main.TENANT_COLUMNS)
+    assert info.value.errors[0]["loc"] == ["columns", "lease_end_date"]
+
+
+@pytest.fixture
+def client(raw_tables, monkeypatch):
+    """API serving a small trained model with its feature pipeline"""
+    engineer = TenantFeatureEngineer()
+    X = engineer.engineer_features(*[raw_tables[name] for name in RAW_TABLES])
+    y = (np.random.default_rng(0).random(len(X)) > 0.7).astype(int)
+    model = XGBoostChurnModel({"n_estimators": 10, "n_jobs": 1})
+    model.train(X, y, cv_folds=0)
+
+    monkeypatch.setattr(main, "MODEL_PATH", Path("/nonexistent/model"))
+    monkeypatch.setattr(main, "model_slot", ModelSlot())
+    monkeypatch.setattr(main, "STREAM_CHUNK_ROWS", 8)
+    with TestClient(main.app) as client:
+        main.model_slot.swap(ServingModel(model=model, feature_engineer=engineer))
+        yield client
+
+
+def test_columnar_bodies_match_row_predictions(client):
+    """JSON, Arrow and Parquet columns score exactly like the row request"""
+    expected = client.post(
+        "/predict", json={"tenants": ROWS, "risk_threshold_high": 30}
+    ).json()
+
+    table = pa.Table.from_pydict(COLUMNS)
+    arrow_body = pa.BufferOutputStream()
+    with pa.ipc.new_stream(arrow_body, table.schema) as writer:
+        writer.write_table(table)
+    parquet_body = io.BytesIO()
+    pq.write_table(table, parquet_body)
+
+    bodies = [
+        ("application/json", None, COLUMNS),
+        (ARROW_STREAM_MEDIA_TYPE, arrow_body.getvalue().to_pybytes(), None),
+        (PARQUET_MEDIA_TYPE, parquet_body.getvalue(), None),
+    ]
+    for content_type, content, json_body in bodies:
+        response = client.post(
+            "/predict/columnar",
+            params={"risk_threshold_high": 30},
+            content=content,
+            json=json_body,
+            headers={"Content-Type": content_type},
+        )
+        assert response.status_code == 200, response.text
+        actual = response.json()
+        assert [list(row) for row in actual] == [list(row) for row in expected]
+        for row, expected_row in zip(actual, expected):
+            assert row["churn_probability"] == pytest.approx(
+                expected_row["churn_probability"], rel=1e-12
+            )
+            assert row["risk_level"] == expected_row["risk_level"]
+
+    streamed = client.post(
+        "/predict/columnar",
+        params={"risk_threshold_high": 30},
+        json=COLUMNS,
+        headers={"Accept": NDJSON_MEDIA_TYPE},
+    )
+    ndjson = pd.read_json(io.StringIO(streamed.text), lines=True)
+    assert list(ndjson["tenant_id"]) == [row["tenant_id"] for row in expected]
+
+
+def test_invalid_columns_rejected_before_scoring(client):
+    bad = {**COLUMNS, "location_score": [0] * N_TENANTS}
+    response = client.post("/predict/columnar", json=bad)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["columns", "location_score"]
+
+    response = client.post(
+        "/predict/columnar", content=b"a,b", headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 415
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,390 @@
+"""
+Unit Tests for Tenant Feature Engineering
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.features.buffer import FeatureBuffer, bytes_per_row
+from src.features.encoding import UNSEEN_CODE, CategoricalVocabulary
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.registry import FeatureRegistry, FrameColumns
+from src.features.tenant_features import FEATURE_REGISTRY
+
+
+@pytest.fixture
+def categorical_columns():
+    """Training and scoring values for categorical columns"""
+    np.random.seed(42)
+    train = {
+        "payment_method": pd.Series(
+            np.random.choice(["ach", "credit_card", "check"], 500)
+        ),
+        "neighborhood_type": pd.Series(
+            np.random.choice(["urban", "suburban", None], 500)
+        ),
+    }
+    score = {
+        "payment_method": pd.Series(["ach", "wire", "check", "credit_card", "cash"]),
+        "neighborhood_type": pd.Series(["rural", "urban", None, "suburban", "urban"]),
+    }
+    return train, score
+
+
+def test_encode_column_matches_label_encoder(categorical_columns):
+    """Vectorized inference encoding is identical to per-row LabelEncoder lookups"""
+    train, score = categorical_columns
+
+    engineer = TenantFeatureEngineer()
+    for col, values in train.items():
+        engineer._encode_column(col, values, is_training=True)
+
+    for col, values in score.items():
+        encoded = engineer._encode_column(col, values, is_training=False)
+
+        encoder = LabelEncoder().fit(train[col].astype(str))
+        expected = values.astype(str).map(
+            lambda x: encoder.transform([x])[0] if x in encoder.classes_ else -1
+        )
+        np.testing.assert_array_equal(encoded, expected.to_numpy())
+        assert encoded.dtype == expected.dtype
+
+
+def test_encode_column_unseen_and_unknown_columns(categorical_columns):
+    """Unseen categories and columns without an encoder map to -1"""
+    train, score = categorical_columns
+
+    engineer = TenantFeatureEngineer()
+    engineer._encode_column("payment_method", train["payment_method"], True)
+
+    payment = engineer._encode_column("payment_method", score["payment_method"], False)
+    neighborhood = engineer._encode_column(
+        "neighborhood_type", score["neighborhood_type"], False
+    )
+
+    assert payment[1] == UNSEEN_CODE
+    assert payment[4] == UNSEEN_CODE
+    assert (neighborhood == UNSEEN_CODE).all()
+
+
+def test_vocabulary_pickle_roundtrip():
+    """Vocabularies pickle without their hash index and still encode"""
+    vocabulary = CategoricalVocabulary(["ach", "check", "credit_card"])
+    restored = pickle.loads(pickle.dumps(vocabulary))
+
+    codes = restored.encode(pd.Series(["check", "wire", "ach"]))
+
+    assert codes.tolist() == [1, UNSEEN_CODE, 0]
+    assert codes.dtype == np.int64
+    assert len(restored) == 3
+
+
+def _engineer(tables, engineer, is_training=True):
+    return engineer.engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+        is_training=is_training,
+    )
+
+
+def test_engineer_features_unique_columns(raw_tables):
+    """Feature groups produce each feature exactly once"""
+    engineer = TenantFeatureEngineer()
+    features = _engineer(raw_tables, engineer)
+
+    assert features.columns.is_unique
+    assert engineer.get_feature_names() == list(features.columns)
+    assert not features.isna().any().any()
+
+
+def test_pipeline_save_load_roundtrip(raw_tables, tmp_path):
+    """A loaded pipeline reproduces the training transform without refitting"""
+    engineer = TenantFeatureEngineer()
+    train_features = _engineer(raw_tables, engineer)
+
+    pipeline_path = tmp_path / "feature_pipeline.pkl"
+    engineer.save(pipeline_path)
+    loaded = TenantFeatureEngineer.load(pipeline_path)
+
+    assert loaded.is_fitted
+    assert loaded.feature_names == engineer.feature_names
+    assert loaded.scale_columns == engineer.scale_columns
+    assert loaded.fill_values == engineer.fill_values
+
+    scored = _engineer(raw_tables, loaded, is_training=False)
+    pd.testing.assert_frame_equal(scored, train_features)
+
+
+def test_transform_merged_single_row_uses_training_state(raw_tables):
+    """Serving rows are filled, encoded and scaled with training-time state"""
+    engineer = TenantFeatureEngineer()
+    train_features = _engineer(raw_tables, engineer)
+
+    row = (
+        _merged(raw_tables, engineer)
+        .iloc[[3]]
+        .drop(columns=["payment_std", "high_priority_count"])
+    )
+
+    features = engineer.transform_merged(row)
+
+    assert list(features.columns) == engineer.feature_names
+    expected = train_features.iloc[[3]].drop(
+        columns=["payment_consistency", "high_priority_requests"]
+    )
+    pd.testing.assert_frame_equal(features[expected.columns], expected)
+
+
+def test_transform_merged_requires_fitted_pipeline():
+    """Transforming before fitting or loading is an error"""
+    with pytest.raises(ValueError, match="not fitted"):
+        TenantFeatureEngineer().transform_merged(pd.DataFrame({"x": [1]}))
+
+
+def test_pipeline_load_rejects_unknown_format(tmp_path):
+    """Artifacts from an unknown format version are refused"""
+    path = tmp_path / "feature_pipeline.pkl"
+    joblib.dump({"format_version": 99}, path)
+
+    with pytest.raises(ValueError, match="Unsupported feature pipeline format"):
+        TenantFeatureEngineer.load(path)
+
+
+def _merged(tables, engineer):
+    return engineer._merge_data_sources(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+    )
+
+
+@pytest.mark.parametrize("n_rows", [1, 10, 100])
+def test_transform_records_matches_batch_path(raw_tables, n_rows):
+    """Row fast path gives the same values as the DataFrame transform"""
+    engineer = TenantFeatureEngineer()
+    _engineer(raw_tables, engineer)
+
+    merged = _merged(raw_tables, engineer).iloc[-n_rows:]
+    expected = engineer.transform_merged(merged).reset_index(drop=True)
+    actual = engineer.transform_records(merged.to_dict("records"))
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_transform_records_serving_rows(raw_tables):
+    """Sparse request rows with missing and unseen values match the batch path"""
+    engineer = TenantFeatureEngineer()
+    _engineer(raw_tables, engineer)
+
+    records = [
+        {
+            "avg_days_late": 3.0,
+            "max_days_late": 9.0,
+            "payment_count": 12,
+            "total_days_late": 36.0,
+            "autopay_enabled": True,
+            "tenure_months": 18,
+            "square_feet": 1400,
+            "garage": False,
+            "annual_income": None,
+            "primary_payment_method": "wire",
+            "monthly_rent": 2100.0,
+            "lease_end_date": "2026-07-31",
+        },
+        {
+            "avg_days_late": 0.0,
+            "max_days_late": 0.0,
+            "payment_count": 0,
+            "total_days_late": 0.0,
+            "autopay_enabled": False,
+            "tenure_months": 0,
+            "square_feet": 2200,
+            "garage": True,
+            "annual_income": 95000.0,
+            "primary_payment_method": None,
+            "monthly_rent": 2900.0,
+            "lease_end_date": None,
+        },
+    ]
+
+    expected = engineer.transform_merged(pd.DataFrame(records))
+    actual = engineer.transform_records(records)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_engineer_features_columnar_schema(raw_tables):
+    """float32 numerics, then int8 flags, then trailing pandas categoricals"""
+    engineer = TenantFeatureEngineer()
+    features = _engineer(raw_tables, engineer)
+
+    categorical = FEATURE_REGISTRY.names(["categorical"])
+    flags = [n for n in features.columns if FEATURE_REGISTRY[n].is_flag]
+    assert "has_autopay" in flags and "is_summer_expiration" in flags
+    tail = list(features.columns[-len(categorical) - len(flags) :])
+    assert tail == flags + categorical
+
+    for col in categorical:
+        assert isinstance(features[col].dtype, pd.CategoricalDtype)
+        assert features[col].cat.codes.dtype == np.int8
+        assert list(features[col].cat.categories) == list(
+            engineer.vocabularies[col].classes
+        )
+    assert (features[flags].dtypes == np.int8).all()
+    assert set(np.unique(features[flags].to_numpy())) <= {0, 1}
+    numeric = features.drop(columns=categorical + flags)
+    assert (numeric.dtypes == np.float32).all()
+    assert bytes_per_row(features) < 4 * features.shape[1]
+
+
+def test_flags_treat_missing_as_zero():
+    """A missing boolean source gives flag 0 rather than an integer overflow"""
+    values = FEATURE_REGISTRY.evaluate(
+        ["has_garage"], FrameColumns(pd.DataFrame({"garage": [True, None, False]}))
+    )
+    assert values["has_garage"].tolist() == [True, False, False]
+
+
+def test_feature_buffer_frame_shares_memory():
+    """The output DataFrame wraps the preallocated blocks without copying"""
+    buffer = FeatureBuffer(pd.RangeIndex(4), ["rent", "tenure"], ["payment_method"])
+    buffer["rent"] = [2000.0, np.nan, 2200.0, 2300.0]
+    buffer["tenure"] = 12
+    buffer.set_codes("payment_method", [0, 1, UNSEEN_CODE, 1])
+    buffer.fill_missing({"rent": 2100.0})
+
+    frame = buffer.to_frame()
+
+    assert frame["rent"].tolist() == [2000.0, 2100.0, 2200.0, 2300.0]
+    assert np.shares_memory(frame["rent"].to_numpy(), buffer.numeric)
+    assert np.shares_memory(frame["payment_method"].to_numpy(), buffer.codes)
+
+    # With fitted classes the codes become a Categorical; unseen is missing
+    frame = buffer.to_frame({"payment_method": ["ach", "check"]})
+    assert frame["payment_method"].tolist()[:2] == ["ach", "check"]
+    assert frame["payment_method"].isna().tolist() == [False, False, True, False]
+
+
+def test_registry_rejects_duplicate_names():
+    """A feature name can only be registered once"""
+    registry = FeatureRegistry()
+    registry.feature("tenure_months", "behavior", inputs=("tenure_months",))
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.feature("tenure_months", "temporal", inputs=("tenure_months",))
+
+
+def test_registry_evaluates_shared_inputs_once():
+    """Intermediates and source columns are computed once per evaluation"""
+    calls = {"now": 0, "dates": 0}
+
+    class CountingColumns(FrameColumns):
+        def dates(self, name):
+            calls["dates"] += 1
+            return super().dates(name)
+
+    def now():
+        calls["now"] += 1
+        return np.datetime64("2025-01-01", "ns")
+
+    registry = FeatureRegistry()
+    registry.intermediate("now", compute=now)
+    registry.feature(
+        "days_left",
+        "temporal",
+        inputs=("lease_end_date", "now"),
+        compute=lambda end, now: (end - now) // np.timedelta64(1, "D"),
+    )
+    registry.feature(
+        "days_since_start",
+        "temporal",
+        inputs=("now", "lease_end_date"),
+        compute=lambda now, end: (now - end) // np.timedelta64(1, "D") + 365,
+    )
+    registry.feature("unused", "temporal", inputs=("now",), compute=lambda now: 0)
+
+    df = pd.DataFrame({"lease_end_date": ["2025-01-31", "2025-03-01"]})
+    values = registry.evaluate(["days_left", "days_since_start"], CountingColumns(df))
+
+    assert list(values) == ["days_left", "days_since_start"]
+    assert values["days_left"].tolist() == [30, 59]
+    assert calls == {"now": 1, "dates": 1}
+
+
+def test_registry_defaults_when_source_column_absent():
+    """Absent inputs give the declared default; pass-through nodes shadow columns"""
+    registry = FeatureRegistry()
+    registry.feature(
+        "monthly_rent", "financial", inputs=("monthly_rent",), default=2000
+    )
+    registry.feature(
+        "rent_to_income_ratio",
+        "financial",
+        inputs=("monthly_rent", "annual_income"),
+        compute=lambda rent, income: rent * 12 / income,
+        default=0.30,
+    )
+    registry.feature(
+        "annual_rent",
+        "financial",
+        inputs=("monthly_rent",),
+        compute=lambda rent: rent * 12,
+    )
+
+    values = registry.evaluate(
+        ["rent_to_income_ratio", "annual_rent"],
+        FrameColumns(pd.DataFrame({"square_feet": [900, 1200]})),
+    )
+
+    assert values == {"rent_to_income_ratio": 0.30, "annual_rent": 24000}
+
+
+def test_trimmed_feature_set_computes_only_its_inputs(raw_tables):
+    """A smaller feature set trains, serves and reads only the columns it needs"""
+    feature_set = ["payment_method", "rent_per_sqft", "is_summer_expiration"]
+    engineer = TenantFeatureEngineer(feature_set=feature_set)
+    features = _engineer(raw_tables, engineer)
+
+    assert list(features.columns) == [
+        "rent_per_sqft",
+        "is_summer_expiration",
+        "payment_method",
+    ]
+    assert FEATURE_REGISTRY.source_columns(feature_set) == {
+        "primary_payment_method",
+        "monthly_rent",
+        "square_feet",
+        "lease_end_date",
+    }
+
+    row = _merged(raw_tables, engineer).iloc[:5].to_dict("records")
+    pd.testing.assert_frame_equal(
+        engineer.transform_records(row),
+        features.iloc[:5].reset_index(drop=True),
+    )
+
+
+def test_feature_set_rejects_unknown_and_intermediate_names():
+    """Feature sets may only name registered output features"""
+    with pytest.raises(ValueError, match="Unknown features"):
+        TenantFeatureEngineer(feature_set=["monthly_rent", "now"])
+    with pytest.raises(ValueError, match="duplicate"):
+        TenantFeatureEngineer(feature_set=["tenure_months", "tenure_months"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
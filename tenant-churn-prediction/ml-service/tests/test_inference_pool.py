@@ -0,0 +1,129 @@
+"""
+Unit Tests for the Bounded Inference Executor
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api import main
+from src.api.inference_pool import BoundedInferencePool, InferenceQueueFull
+from src.api.model_slot import ModelSlot, ServingModel
+
+
+def test_pool_rejects_beyond_workers_plus_queue():
+    """Running + queued jobs are capped; slots free up as jobs finish"""
+    pool = BoundedInferencePool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        second = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        assert pool.pending == 2
+        with pytest.raises(InferenceQueueFull):
+            await pool.run(lambda: "rejected")
+
+        release.set()
+        assert await first is True
+        assert await second == "queued"
+        assert pool.pending == 0
+        assert await pool.run(lambda: "admitted") == "admitted"
+
+    asyncio.run(scenario())
+
+
+def test_waiting_admissions_get_freed_slots_first():
+    """Waiters are woken in order by finishing jobs; new work is shed meanwhile"""
+    pool = BoundedInferencePool(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        cancelled = asyncio.ensure_future(pool.run(lambda: "never", wait=True))
+        waiting = asyncio.ensure_future(pool.run(lambda: "waited", wait=True))
+        await asyncio.sleep(0.01)
+        assert pool.pending == 3
+
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        assert pool.pending == 2
+        with pytest.raises(InferenceQueueFull):
+            await pool.run(lambda: "rejected")
+
+        release.set()
+        assert await busy is True
+        assert await waiting == "waited"
+        assert pool.pending == 0
+        assert await pool.run(lambda: "admitted") == "admitted"
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+def test_event_loop_free_while_scoring():
+    """Other coroutines run while a job blocks its worker thread"""
+    pool = BoundedInferencePool(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        job = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)  # the loop is not blocked by the running job
+        release.set()
+        await job
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+def test_full_queue_returns_503_with_retry_after(monkeypatch):
+    """The API sheds load with Retry-After instead of queueing without bound"""
+    release = threading.Event()
+
+    class BlockingModel:
+        feature_names = ["x"]
+        model_version = "test"
+
+    monkeypatch.setattr(main, "MODEL_PATH", Path("/nonexistent/model"))
+    monkeypatch.setattr(main, "model_slot", ModelSlot())
+    monkeypatch.setattr(main, "small_request_pool", BoundedInferencePool(1, 0))
+    monkeypatch.setattr(main, "score_tenants", lambda *args: release.wait() and b"[]")
+    monkeypatch.setattr(
+        main, "score_coalesced", lambda *args: release.wait() and [b"[]"]
+    )
+
+    request = {
+        "tenants": [
+            {
+                "tenant_id": "T1",
+                "property_id": "P1",
+                "lease_id": "L1",
+                "lease_end_date": "2026-12-01",
+            }
+        ]
+    }
+    with TestClient(main.app) as client:
+        main.model_slot.swap(ServingModel(model=BlockingModel()))
+        busy = threading.Thread(target=lambda: client.post("/predict", json=request))
+        busy.start()
+        while main.small_request_pool.pending == 0:
+            time.sleep(0.01)
+
+        response = client.post("/predict", json=request)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(main.RETRY_AFTER_SECONDS)
+        assert client.get("/health").status_code == 200
+
+        release.set()
+        busy.join()
+        assert client.post("/predict", json=request).status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,206 @@
+"""
+Unit Tests for Micro-Batching of Concurrent Predictions
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api import main
+from src.api.micro_batcher import MicroBatcher
+from src.api.model_slot import ModelSlot, ServingModel
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.models.xgboost_model import XGBoostChurnModel
+
+from conftest import make_raw_tables
+
+
+def recording_batcher(max_wait_ms=20, max_rows=100):
+    """Batcher that records each batch and echoes its items back"""
+    batches = []
+
+    async def run_batch(items, key):
+        batches.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    return MicroBatcher(run_batch, max_wait_ms, max_rows), batches
+
+
+def test_concurrent_requests_scored_as_one_batch():
+    """Requests inside the window share one call and get their own results"""
+    batcher, batches = recording_batcher()
+
+    async def scenario():
+        return await asyncio.gather(*[batcher.submit("m", i) for i in range(5)])
+
+    assert asyncio.run(scenario()) == [f"m:{i}" for i in range(5)]
+    assert batches == [("m", [0, 1, 2, 3, 4])]
+
+
+def test_batch_flushes_at_max_rows_and_splits_by_key():
+    """A full batch doesn't wait out the window; keys never share a batch"""
+    batcher, batches = recording_batcher(max_wait_ms=10_000, max_rows=4)
+
+    async def scenario():
+        full = [batcher.submit("a", i, rows=2) for i in range(2)]
+        return await asyncio.wait_for(asyncio.gather(*full), timeout=1)
+
+    assert asyncio.run(scenario()) == ["a:0", "a:1"]
+
+    batcher.max_wait = 0.01
+
+    async def two_models():
+        return await asyncio.gather(batcher.submit("a", 0), batcher.submit("b", 1))
+
+    batches.clear()
+    assert asyncio.run(two_models()) == ["a:0", "b:1"]
+    assert sorted(batches) == [("a", [0]), ("b", [1])]
+
+
+def test_batch_error_reaches_every_caller():
+    """A failed batch raises in each waiting request instead of hanging"""
+
+    async def run_batch(items, key):
+        raise RuntimeError("scoring failed")
+
+    batcher = MicroBatcher(run_batch, max_wait_ms=5, max_rows=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("m", 1), batcher.submit("m", 2), return_exceptions=True
+        )
+
+    results = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert [str(e) for e in results] == ["scoring failed", "scoring failed"]
+
+
+def test_exception_results_reach_only_their_caller():
+    """An exception returned in place of a result fails that item alone"""
+
+    async def run_batch(items, key):
+        return [ValueError(f"bad {item}") if item < 0 else item for item in items]
+
+    batcher = MicroBatcher(run_batch, max_wait_ms=5, max_rows=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("m", 1), batcher.submit("m", -1), return_exceptions=True
+        )
+
+    ok, failed = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert ok == 1 and str(failed) == "bad -1"
+
+
+@pytest.fixture
+def served_model(monkeypatch):
+    """Small model served from main's model slot"""
+    tables = make_raw_tables(300)
+    engineer = TenantFeatureEngineer()
+    X = engineer.engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+    )
+    y = (np.random.default_rng(0).random(len(X)) > 0.7).astype(int)
+    model = XGBoostChurnModel({"n_estimators": 10, "n_jobs": 1})
+    model.train(X, y, cv_folds=0)
+    serving = ServingModel(model=model, feature_engineer=engineer)
+
+    slot = ModelSlot()
+    slot.swap(serving)
+    monkeypatch.setattr(main, "model_slot", slot)
+    return serving
+
+
+def tenant_request(i, tenant_id=None):
+    return main.PredictionRequest(
+        tenants=[
+            main.TenantData(
+                tenant_id=tenant_id or f"T{i}",
+                property_id=f"P{i}",
+                lease_id=f"L{i}",
+                lease_end_date="2026-12-01",
+                avg_days_late=float(i),
+                autopay_enabled=bool(i % 2),
+            )
+        ],
+        risk_threshold_high=60 + i,
+    )
+
+
+async def post_concurrently(requests):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as c:
+        return await asyncio.gather(
+            *[c.post("/predict", json=r.dict()) for r in requests]
+        )
+
+
+def test_coalesced_predictions_match_individual_scoring(served_model, monkeypatch):
+    """Concurrent /predict calls are batched without changing any response"""
+    serving = served_model
+    coalesced = []
+    score = main.score_coalesced
+    monkeypatch.setattr(
+        main,
+        "score_coalesced",
+        lambda requests, serving: coalesced.append(len(requests))
+        or score(requests, serving),
+    )
+
+    requests = [tenant_request(i) for i in range(8)]
+    responses = asyncio.run(post_concurrently(requests))
+    assert sum(coalesced) == len(requests) and len(coalesced) < len(requests)
+
+    for request, response in zip(requests, responses):
+        assert response.status_code == 200
+        (expected,) = json.loads(main.score_tenants(request, serving))
+        (actual,) = response.json()
+        assert actual["tenant_id"] == expected["tenant_id"]
+        assert actual["churn_probability"] == pytest.approx(
+            expected["churn_probability"]
+        )
+        assert actual["risk_level"] == expected["risk_level"]
+
+
+def test_failing_request_does_not_fail_its_batch(served_model, monkeypatch):
+    """A payload that can't be scored fails alone, not its whole micro-batch"""
+    build = main.build_feature_frame
+
+    def failing_build(tenants, feature_engineer):
+        if any(tenant["tenant_id"] == "BAD" for tenant in tenants):
+            raise ValueError("unscorable tenant")
+        return build(tenants, feature_engineer)
+
+    monkeypatch.setattr(main, "build_feature_frame", failing_build)
+    monkeypatch.setattr(main.micro_batcher, "max_wait", 0.05)
+    coalesced = []
+    score = main.score_coalesced
+    monkeypatch.setattr(
+        main,
+        "score_coalesced",
+        lambda requests, serving: coalesced.append(len(requests))
+        or score(requests, serving),
+    )
+
+    good, bad = asyncio.run(
+        post_concurrently([tenant_request(0), tenant_request(1, tenant_id="BAD")])
+    )
+
+    assert coalesced == [2]
+    assert good.status_code == 200 and good.json()[0]["tenant_id"] == "T0"
+    assert bad.status_code == 500
+    assert "unscorable tenant" in bad.json()["detail"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,161 @@
+"""
+Unit Tests for Model Hot-Swap and /model/reload
+"""
+
+import copy
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api import main
+from src.api.model_slot import ModelSlot, ServingModel
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.models.xgboost_model import XGBoostChurnModel
+
+from conftest import make_raw_tables
+
+REQUEST = {
+    "tenants": [
+        {
+            "tenant_id": "T1",
+            "property_id": "P1",
+            "lease_id": "L1",
+            "lease_end_date": "2026-12-01",
+        }
+    ]
+}
+
+
+def test_slot_keeps_swapped_model_until_requests_finish():
+    """A retired model stays referenced while a request still holds it"""
+    slot = ModelSlot()
+    old, new = ServingModel(model="old"), ServingModel(model="new")
+    slot.swap(old)
+
+    with slot.acquire() as serving:
+        assert slot.swap(new) is old
+        assert serving is old
+        assert slot.in_flight(old) == 1
+        assert slot.retiring == [old]
+        with slot.acquire() as later:
+            assert later is new
+
+    assert slot.retiring == []
+    assert slot.in_flight(old) == 0
+    assert slot.current is new
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    """Trained model artifact and pipeline, served by the API under test"""
+    tables = make_raw_tables(300)
+    engineer = TenantFeatureEngineer()
+    X = engineer.engineer_features(
+        tables["tenants"],
+        tables["leases"],
+        tables["payments"],
+        tables["properties"],
+        tables["maintenance"],
+    )
+    y = (np.random.default_rng(0).random(len(X)) > 0.7).astype(int)
+    model = XGBoostChurnModel({"n_estimators": 10, "n_jobs": 1})
+    model.train(X, y, cv_folds=0)
+    model.save(tmp_path / "model", feature_pipeline=engineer)
+
+    monkeypatch.setattr(main, "MODEL_PATH", tmp_path / "model")
+    monkeypatch.setattr(main, "model_slot", ModelSlot())
+    return tmp_path, model, engineer
+
+
+def test_pipeline_published_in_model_version(model_dir):
+    """The pipeline is saved and loaded inside the model's artifact version"""
+    tmp_path, model, _ = model_dir
+    artifact = (tmp_path / "model").resolve()
+    files = XGBoostChurnModel.read_manifest(artifact)["files"]
+
+    assert (artifact / files["feature_pipeline"]).is_file()
+    assert not list(tmp_path.glob("*.pkl"))
+    serving = main.load_serving_model()
+    assert serving.feature_engineer.feature_names == model.feature_names
+
+
+def test_predictions_continue_during_reload(model_dir, monkeypatch):
+    """A slow reload runs off the event loop; requests never see a 503"""
+    tmp_path, model, engineer = model_dir
+    model.model_version = "2.0.0"
+
+    with TestClient(main.app) as client:
+        model.save(tmp_path / "model", feature_pipeline=engineer)
+        load = main.load_serving_model
+
+        def slow_load():
+            time.sleep(1.0)
+            return load()
+
+        monkeypatch.setattr(main, "load_serving_model", slow_load)
+        reload_response = {}
+        reload_thread = threading.Thread(
+            target=lambda: reload_response.update(response=client.post("/model/reload"))
+        )
+        reload_thread.start()
+
+        statuses = []
+        while reload_thread.is_alive():
+            start = time.perf_counter()
+            statuses.append(client.post("/predict", json=REQUEST).status_code)
+            assert time.perf_counter() - start < 0.5
+        reload_thread.join()
+
+        assert len(statuses) > 1 and set(statuses) == {200}
+        response = reload_response["response"]
+        assert response.status_code == 200
+        assert response.json()["model_version"] == "2.0.0"
+        assert response.json()["previous_model_version"] == "1.0.0"
+        assert client.get("/health/ready").json()["model_version"] == "2.0.0"
+
+
+def test_failed_reload_keeps_serving_previous_model(model_dir):
+    """A model that fails to load is never swapped in"""
+    tmp_path, _, _ = model_dir
+
+    with TestClient(main.app) as client:
+        serving = main.model_slot.current
+        (tmp_path / "model" / "booster.ubj").write_bytes(b"truncated upload")
+
+        response = client.post("/model/reload")
+        assert response.status_code == 500
+        assert "previous model still serving" in response.json()["detail"]
+        assert main.model_slot.current is serving
+        assert client.post("/predict", json=REQUEST).status_code == 200
+
+
+@pytest.mark.parametrize("pipeline", ["missing", "mismatched"])
+def test_reload_rejects_model_without_its_pipeline(model_dir, pipeline):
+    """A model whose pipeline is missing or builds other features isn't served"""
+    tmp_path, model, engineer = model_dir
+    stale = None
+    if pipeline == "mismatched":
+        stale = copy.deepcopy(engineer)
+        stale.feature_names = stale.feature_names[:-1]
+
+    with TestClient(main.app) as client:
+        serving = main.model_slot.current
+        model.model_version = "2.0.0"
+        model.save(tmp_path / "model", feature_pipeline=stale)
+
+        response = client.post("/model/reload")
+        assert response.status_code == 500
+        assert "feature pipeline" in response.json()["detail"].lower()
+        assert main.model_slot.current is serving
+        assert client.post("/predict", json=REQUEST).status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
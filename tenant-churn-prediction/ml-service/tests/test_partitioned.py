@@ -0,0 +1,141 @@
+"""
+Unit Tests for Partitioned (Out-of-Core) Feature Engineering
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.features.aggregates import AggregateStore
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.partitioned import (
+    PartitionedFeatureBuilder,
+    partition_of,
+    read_feature_partitions,
+)
+
+
+def _args(tables):
+    return [
+        tables[name]
+        for name in ["tenants", "leases", "payments", "properties", "maintenance"]
+    ]
+
+
+def _chunks(df, n_chunks):
+    return (df.iloc[rows] for rows in np.array_split(np.arange(len(df)), n_chunks))
+
+
+def test_partition_of_is_stable_across_chunks(raw_tables):
+    """A key lands in the same partition whichever chunk it arrives in"""
+    keys = raw_tables["payments"]["lease_id"]
+    whole = partition_of(keys, 8)
+    pieces = np.concatenate([partition_of(keys.iloc[i::3], 8) for i in range(3)])
+    order = np.concatenate([np.arange(len(keys))[i::3] for i in range(3)])
+
+    np.testing.assert_array_equal(pieces, whole[order])
+    assert whole.min() >= 0 and whole.max() < 8
+
+
+@pytest.mark.parametrize("n_partitions", [1, 4])
+def test_partitioned_training_matches_in_memory(raw_tables, tmp_path, n_partitions):
+    """Chunked, partitioned training gives the in-memory features and state"""
+    tenants, leases, payments, properties, maintenance = _args(raw_tables)
+    maintenance = maintenance.copy()
+    maintenance.loc[maintenance.index[:40], "request_type"] = "pest control"
+
+    expected_engineer = TenantFeatureEngineer()
+    expected = expected_engineer.engineer_features(
+        tenants, leases, payments, properties, maintenance
+    )
+
+    engineer = TenantFeatureEngineer()
+    paths = PartitionedFeatureBuilder(engineer, tmp_path, n_partitions).build(
+        tenants,
+        leases,
+        _chunks(payments, 5),
+        properties,
+        _chunks(maintenance, 3),
+    )
+
+    assert len(paths) == n_partitions
+    assert not (tmp_path / "spill").exists()
+    pd.testing.assert_frame_equal(
+        read_feature_partitions(tmp_path / "features"), expected, check_exact=True
+    )
+
+    assert engineer.feature_names == expected_engineer.feature_names
+    assert engineer.scale_columns == expected_engineer.scale_columns
+    assert engineer.fill_values == expected_engineer.fill_values
+    for name in ["mean_", "var_", "scale_"]:
+        np.testing.assert_array_equal(
+            getattr(engineer.scalers["standard"], name),
+            getattr(expected_engineer.scalers["standard"], name),
+        )
+    for col, vocabulary in expected_engineer.vocabularies.items():
+        np.testing.assert_array_equal(
+            engineer.vocabularies[col].classes, vocabulary.classes
+        )
+
+
+def test_partitioned_inference_matches_in_memory(raw_tables, tmp_path):
+    """A loaded pipeline applied per partition equals the in-memory transform"""
+    fitted = TenantFeatureEngineer()
+    fitted.engineer_features(*_args(raw_tables))
+    fitted.save(tmp_path / "pipeline.pkl")
+    engineer = TenantFeatureEngineer.load(tmp_path / "pipeline.pkl")
+
+    expected = engineer.engineer_features(*_args(raw_tables), is_training=False)
+    paths = PartitionedFeatureBuilder(engineer, tmp_path / "work", 3).build(
+        *_args(raw_tables), is_training=False, output_dir=tmp_path / "out"
+    )
+
+    pd.testing.assert_frame_equal(
+        read_feature_partitions(paths), expected, check_exact=True
+    )
+
+
+def test_partitioned_inference_requires_fitted_pipeline(raw_tables, tmp_path):
+    builder = PartitionedFeatureBuilder(TenantFeatureEngineer(), tmp_path)
+
+    with pytest.raises(ValueError, match="not fitted"):
+        builder.build(*_args(raw_tables), is_training=False)
+
+
+def test_parallel_training_matches_single_process(raw_tables):
+    """Worker processes fit the same state and features as one process"""
+    expected_engineer = TenantFeatureEngineer()
+    expected = expected_engineer.engineer_features(*_args(raw_tables))
+
+    engineer = TenantFeatureEngineer()
+    actual = engineer.engineer_features(*_args(raw_tables), n_workers=2)
+
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    assert engineer.fill_values == expected_engineer.fill_values
+    assert engineer.scale_columns == expected_engineer.scale_columns
+    np.testing.assert_array_equal(
+        engineer.scalers["standard"].mean_, expected_engineer.scalers["standard"].mean_
+    )
+
+    # Fitted state is shared read-only with the workers at inference time
+    pd.testing.assert_frame_equal(
+        engineer.engineer_features(*_args(raw_tables), is_training=False, n_workers=2),
+        expected_engineer.engineer_features(*_args(raw_tables), is_training=False),
+        check_exact=True,
+    )
+
+
+def test_parallel_rejects_aggregate_store(raw_tables):
+    with pytest.raises(ValueError, match="aggregate store"):
+        TenantFeatureEngineer().engineer_features(
+            *_args(raw_tables), aggregate_store=AggregateStore(), n_workers=2
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
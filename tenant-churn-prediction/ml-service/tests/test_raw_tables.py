@@ -0,0 +1,133 @@
+"""
+Unit Tests for Typed Arrow/Parquet Raw Table Readers
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.raw_tables import (
+    RAW_TABLES,
+    convert_to_parquet,
+    iter_raw_table,
+    load_raw_tables,
+    projected_columns,
+    read_raw_table,
+)
+
+
+@pytest.fixture
+def raw_dirs(raw_tables, tmp_path):
+    """The raw tables as CSV files plus their typed Parquet conversion"""
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    for name in RAW_TABLES:
+        raw_tables[name].to_csv(csv_dir / f"{name}.csv", index=False)
+    convert_to_parquet(csv_dir, tmp_path / "parquet", row_group_rows=256)
+    return csv_dir, tmp_path / "parquet"
+
+
+def _features(tables):
+    return TenantFeatureEngineer().engineer_features(
+        *[tables[name] for name in RAW_TABLES]
+    )
+
+
+def test_arrow_and_parquet_reads_match_pandas_csv(raw_dirs):
+    """Typed reads give the same features as pandas CSV parsing"""
+    csv_dir, parquet_dir = raw_dirs
+    expected = _features(
+        {name: pd.read_csv(csv_dir / f"{name}.csv") for name in RAW_TABLES}
+    )
+
+    for raw_dir in raw_dirs:
+        tables = load_raw_tables(raw_dir)
+        assert tables["payments"]["payment_date"].dtype == "datetime64[ns]"
+        assert tables["properties"]["garage"].dtype == bool
+        pd.testing.assert_frame_equal(_features(tables), expected, check_exact=True)
+
+
+def test_projection_reads_only_needed_columns(raw_dirs):
+    """A trimmed feature set reads its inputs plus keys and aggregate inputs"""
+    _, parquet_dir = raw_dirs
+    columns = projected_columns("properties", feature_set=["square_feet"])
+
+    properties = read_raw_table(
+        parquet_dir / "properties.parquet", "properties", columns
+    )
+    assert list(properties.columns) == ["property_id", "zip_code", "square_feet"]
+
+
+def test_date_predicate_and_batches(raw_dirs, raw_tables):
+    """Date filters keep the inclusive range; batches concatenate to one read"""
+    payments = raw_tables["payments"]
+    dates = pd.to_datetime(payments["payment_date"])
+    expected = (dates >= "2024-06-01") & (dates <= "2024-12-31")
+
+    for raw_dir in raw_dirs:
+        path = next(raw_dir.glob("payments.*"))
+        filtered = read_raw_table(
+            path, "payments", start_date="2024-06-01", end_date="2024-12-31"
+        )
+        assert len(filtered) == expected.sum()
+        assert (
+            filtered["payment_id"].tolist()
+            == payments.loc[expected, "payment_id"].tolist()
+        )
+
+        batches = list(iter_raw_table(path, "payments", batch_rows=200))
+        assert len(batches) > 1
+        pd.testing.assert_frame_equal(
+            pd.concat(batches, ignore_index=True), read_raw_table(path, "payments")
+        )
+
+
+def test_key_filter_keeps_only_matching_rows(raw_dirs, raw_tables):
+    """Key filters combine with date filters and keep file order"""
+    payments = raw_tables["payments"]
+    lease_ids = payments["lease_id"].drop_duplicates().iloc[::3].tolist()
+    dates = pd.to_datetime(payments["payment_date"])
+    expected = payments["lease_id"].isin(lease_ids) & (dates >= "2024-06-01")
+
+    for raw_dir in raw_dirs:
+        path = next(raw_dir.glob("payments.*"))
+        filtered = read_raw_table(
+            path, "payments", start_date="2024-06-01", keys={"lease_id": lease_ids}
+        )
+        assert (
+            filtered["payment_id"].tolist()
+            == payments.loc[expected, "payment_id"].tolist()
+        )
+        assert read_raw_table(path, "payments", keys={"lease_id": []}).empty
+
+
+def test_generator_column_aliases(raw_tables, tmp_path):
+    """Generator column names are mapped to pipeline names"""
+    raw_tables["leases"].rename(columns={"lease_end_date": "end_date"}).to_csv(
+        tmp_path / "leases.csv", index=False
+    )
+
+    leases = read_raw_table(tmp_path / "leases.csv", "leases")
+    assert "lease_end_date" in leases.columns
+    assert "end_date" not in leases.columns
+
+
+def test_missing_required_column_and_bad_predicate(raw_tables, tmp_path):
+    raw_tables["payments"].drop(columns=["amount"]).to_csv(
+        tmp_path / "payments.csv", index=False
+    )
+    with pytest.raises(ValueError, match="missing required payments columns"):
+        read_raw_table(tmp_path / "payments.csv", "payments")
+
+    raw_tables["tenants"].to_csv(tmp_path / "tenants.csv", index=False)
+    with pytest.raises(ValueError, match="no history date"):
+        read_raw_table(tmp_path / "tenants.csv", "tenants", start_date="2024-01-01")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,167 @@
+"""
+Unit Tests for /predict Response Formats: Bulk JSON, NDJSON and Arrow
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api import main
+from src.api.model_slot import ModelSlot, ServingModel
+from src.api.streaming import (
+    ARROW_STREAM_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    encode_chunk,
+    negotiate_stream_format,
+)
+from src.features.feature_engineer import TenantFeatureEngineer
+from src.features.raw_tables import RAW_TABLES
+from src.models.xgboost_model import XGBoostChurnModel
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("application/json", None),
+        ("*/*", None),
+        (NDJSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE),
+        (f"{ARROW_STREAM_MEDIA_TYPE}, application/json;q=0.5", ARROW_STREAM_MEDIA_TYPE),
+        (f"application/json, {NDJSON_MEDIA_TYPE}", None),
+        (f"application/json;q=0.2, {NDJSON_MEDIA_TYPE}", NDJSON_MEDIA_TYPE),
+        (f"{NDJSON_MEDIA_TYPE};q=0", None),
+    ],
+)
+def test_accept_header_selects_stream_format(accept, expected):
+    assert negotiate_stream_format(accept) == expected
+
+
+@pytest.fixture
+def client(raw_tables, monkeypatch):
+    """API serving a small trained model, streaming 7 rows per chunk"""
+    engineer = TenantFeatureEngineer()
+    X = engineer.engineer_features(*[raw_tables[name] for name in RAW_TABLES])
+    y = (np.random.default_rng(0).random(len(X)) > 0.7).astype(int)
+    model = XGBoostChurnModel({"n_estimators": 10, "n_jobs": 1})
+    model.train(X, y, cv_folds=0)
+
+    monkeypatch.setattr(main, "MODEL_PATH", Path("/nonexistent/model"))
+    monkeypatch.setattr(main, "model_slot", ModelSlot())
+    monkeypatch.setattr(main, "STREAM_CHUNK_ROWS", 7)
+    with TestClient(main.app) as client:
+        main.model_slot.swap(ServingModel(model=model, feature_engineer=engineer))
+        yield client
+
+
+REQUEST = {
+    "tenants": [
+        {
+            "tenant_id": f"T{i}",
+            "property_id": f"P{i}",
+            "lease_id": f"L{i}",
+            "lease_end_date": "2026-12-01",
+            "avg_days_late": float(i % 9),
+            "autopay_enabled": bool(i % 2),
+        }
+        for i in range(20)
+    ],
+    "risk_threshold_high": 40,
+}
+
+COMPARED = ["tenant_id", "property_id", "risk_score", "risk_level", "predicted_churn"]
+
+
+def test_streamed_formats_match_json_response(client):
+    """NDJSON and Arrow streams carry the same predictions as plain JSON"""
+    expected = client.post("/predict", json=REQUEST).json()
+
+    response = client.post(
+        "/predict", json=REQUEST, headers={"Accept": NDJSON_MEDIA_TYPE}
+    )
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    ndjson = [json.loads(line) for line in response.text.splitlines()]
+
+    response = client.post(
+        "/predict", json=REQUEST, headers={"Accept": ARROW_STREAM_MEDIA_TYPE}
+    )
+    assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+    arrow = pa.ipc.open_stream(response.content).read_all().to_pylist()
+
+    for streamed in (ndjson, arrow):
+        assert len(streamed) == len(expected)
+        for row, expected_row in zip(streamed, expected):
+            assert {k: row[k] for k in COMPARED} == {
+                k: expected_row[k] for k in COMPARED
+            }
+            assert row["churn_probability"] == pytest.approx(
+                expected_row["churn_probability"], rel=1e-12
+            )
+    assert main.model_slot.in_flight(main.model_slot.current) == 0
+
+
+def test_json_response_built_per_batch(client):
+    """One timestamp per batch; explanations only when requested"""
+    predictions = client.post("/predict", json=REQUEST).json()
+    assert list(predictions[0]) == main.PREDICTION_FIELDS
+    assert len({row["predicted_at"] for row in predictions}) == 1
+    assert all(row["explanation"] is None for row in predictions)
+
+    explained = client.post(
+        "/predict", json={**REQUEST, "include_explanation": True}
+    ).json()
+    assert [row["risk_level"] for row in explained] == [
+        row["risk_level"] for row in predictions
+    ]
+    assert all(
+        row["explanation"]["churn_probability"]
+        == pytest.approx(row["churn_probability"])
+        for row in explained
+    )
+
+
+def test_json_bytes_match_pydantic_responses():
+    """Bulk JSON is byte-identical to FastAPI serializing PredictionResponses"""
+    probabilities = np.random.default_rng(1).random(50).astype(np.float32)
+    frame = main.prediction_frame(
+        {
+            "tenant_id": [f"T{i}" for i in range(50)],
+            "property_id": [f"P{i}" for i in range(50)],
+        },
+        probabilities,
+    )
+    records = json.loads(main.predictions_json(frame))
+    expected = JSONResponse(
+        jsonable_encoder([main.PredictionResponse(**r) for r in records])
+    ).body
+
+    assert main.predictions_json(frame) == expected
+    assert [r["churn_probability"] for r in records] == [
+        float(p) for p in probabilities
+    ]
+    ndjson = encode_chunk(frame, NDJSON_MEDIA_TYPE).splitlines()
+    assert [json.loads(line) for line in ndjson] == [
+        {k: v for k, v in r.items() if k != "explanation"} for r in records
+    ]
+
+
+def test_streamed_request_rejects_explanations(client):
+    response = client.post(
+        "/predict",
+        json={**REQUEST, "include_explanation": True},
+        headers={"Accept": NDJSON_MEDIA_TYPE},
+    )
+    assert response.status_code == 422
+    assert main.model_slot.in_flight(main.model_slot.current) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Flat Tree Inference Engine
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.models.tree_engine import FlatTreeEnsemble
+from src.models.xgboost_model import XGBoostChurnModel
+
+PAYMENT_METHODS = ["ach", "card", "check", "cash", "money_order"]
+
+
+@pytest.fixture
+def mixed_data():
+    """Numeric columns with missing values plus a categorical column"""
+    rng = np.random.default_rng(3)
+    n_samples = 2000
+    payment = rng.integers(0, len(PAYMENT_METHODS), n_samples)
+    X = pd.DataFrame(
+        {
+            "rent": rng.normal(1500, 300, n_samples).astype(np.float32),
+            "days_late": rng.exponential(3, n_samples),
+            "tenure": rng.integers(1, 120, n_samples).astype(np.int16),
+            "payment_method": pd.Categorical.from_codes(
+                payment, categories=PAYMENT_METHODS
+            ),
+        }
+    )
+    X.loc[X.sample(frac=0.2, random_state=1).index, "days_late"] = np.nan
+    logit = (X["days_late"].fillna(6) - 3) / 2 + np.isin(payment, [2, 3]) * 1.5
+    y = pd.Series((logit + rng.normal(0, 1, n_samples) > 0.5).astype(int))
+    return X, y
+
+
+@pytest.fixture
+def trained_model(mixed_data):
+    X, y = mixed_data
+    model = XGBoostChurnModel({"n_estimators": 60, "max_cat_to_onehot": 1, "n_jobs": 1})
+    model.train(X, y, cv_folds=0)
+    return model
+
+
+def test_matches_booster_probabilities(trained_model, mixed_data):
+    """Numeric, missing and categorical splits follow XGBoost's routing"""
+    X, _ = mixed_data
+    engine = FlatTreeEnsemble.from_booster(trained_model.model.get_booster())
+
+    assert engine.n_trees == 60
+    assert engine.category_row.max() >= 0  # partition splits were exercised
+    np.testing.assert_allclose(
+        engine.predict_proba(X), trained_model.model.predict_proba(X), atol=1e-6
+    )
+
+
+def test_unseen_and_missing_categories(trained_model, mixed_data):
+    """Unknown category codes score like XGBoost's missing values"""
+    X, _ = mixed_data
+    X = X.head(50).copy()
+    X["payment_method"] = pd.Categorical(
+        ["wire"] * 25 + [None] * 25, categories=PAYMENT_METHODS
+    )
+    engine = FlatTreeEnsemble.from_booster(trained_model.model.get_booster())
+
+    np.testing.assert_allclose(
+        engine.predict_proba(X), trained_model.model.predict_proba(X), atol=1e-6
+    )
+
+
+def test_row_mode_matches_batch(trained_model, mixed_data):
+    """A plain list in feature order scores like the DataFrame row"""
+    X, _ = mixed_data
+    engine = FlatTreeEnsemble.from_booster(trained_model.model.get_booster())
+    row = engine.to_matrix(X.iloc[[7]])[0].tolist()
+
+    assert engine.predict_row(row) == pytest.approx(
+        engine.predict_proba(X.iloc[[7]])[0, 1]
+    )
+
+
+def test_early_stopped_model_compiles_kept_trees(mixed_data):
+    """The engine scores only the trees kept up to the best iteration"""
+    X, y = mixed_data
+    model = XGBoostChurnModel({"n_estimators": 300, "n_jobs": 1})
+    model.train(X[:1500], y[:1500], X[1500:], y[1500:], cv_folds=0)
+    model.set_inference_backend("numpy")
+
+    assert model._engine.n_trees == model.training_metadata["n_trees"]
+    np.testing.assert_allclose(
+        model.predict_proba(X), model.model.predict_proba(X), atol=1e-6
+    )
+
+
+def test_model_backend_switch(trained_model, mixed_data, tmp_path):
+    """The numpy backend serves predictions, also after a save/load round trip"""
+    X, _ = mixed_data
+    expected = trained_model.predict_proba(X)
+
+    model_path = tmp_path / "model"
+    trained_model.save(model_path)
+    loaded = XGBoostChurnModel.load(model_path)
+    loaded.set_inference_backend("numpy")
+
+    np.testing.assert_allclose(loaded.predict_proba(X), expected, atol=1e-6)
+    np.testing.assert_array_equal(loaded.predict(X), trained_model.predict(X))
+
+    loaded.set_inference_backend("auto")
+    loaded.AUTO_ENGINE_MAX_ROWS = 10
+    np.testing.assert_allclose(loaded.predict_proba(X.head(5)), expected[:5], atol=1e-6)
+    np.testing.assert_allclose(loaded.predict_proba(X), expected, atol=1e-6)
+
+    with pytest.raises(ValueError, match="Unknown inference backend"):
+        loaded.set_inference_backend("onnx")
+
+
+def test_unsupported_objective_rejected(mixed_data):
+    X, y = mixed_data
+    booster = xgb.train(
+        {"objective": "reg:squarederror"},
+        xgb.DMatrix(X[["rent", "tenure"]], label=y),
+        num_boost_round=2,
+    )
+    with pytest.raises(ValueError, match="binary:logistic"):
+        FlatTreeEnsemble.from_booster(booster)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+Unit Tests for Hyperband Hyperparameter Search
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.models.tuning import DEFAULT_SEARCH_SPACE, HyperbandTuner, trial_threads
+from src.models.xgboost_model import XGBoostChurnModel
+
+SEARCH_SPACE = {
+    "max_depth": [2, 4],
+    "learning_rate": [0.1, 0.3],
+    "subsample": [0.8, 1.0],
+}
+
+
+@pytest.fixture
+def tuning_data():
+    rng = np.random.default_rng(7)
+    n_samples = 1500
+    X = pd.DataFrame(rng.normal(size=(n_samples, 6)), columns=list("abcdef"))
+    noise = rng.normal(0, 1, n_samples)
+    y = pd.Series((X["a"] + X["b"] * X["c"] + noise > 0).astype(int))
+    return X, y
+
+
+def _tuner(**kwargs):
+    params = {"objective": "binary:logistic", "tree_method": "hist", "seed": 1}
+    return HyperbandTuner(
+        params, SEARCH_SPACE, max_rounds=27, min_rounds=3, n_jobs=1, **kwargs
+    )
+
+
+def _scores(results):
+    trials = results["trials"]
+    keys = zip(
+        trials["params"].map(lambda p: tuple(sorted(p.items()))), trials["rounds"]
+    )
+    return dict(zip(keys, trials["validation_auc"]))
+
+
+def test_brackets_halve_towards_max_rounds():
+    """Every bracket ends at max_rounds with 1/eta of the configs per rung"""
+    tuner = HyperbandTuner({}, max_rounds=200, min_rounds=8, eta=3)
+    plan = tuner.brackets()
+
+    assert [rungs[-1][1] for rungs in plan] == [200] * len(plan)
+    for rungs in plan:
+        counts = [n for n, _ in rungs]
+        assert all(a // 3 == b for a, b in zip(counts, counts[1:]))
+
+    # A few dozen fits instead of the exhaustive grid's 243 x 5 folds
+    fits = sum(n for rungs in plan for n, _ in rungs)
+    assert fits < np.prod([len(v) for v in DEFAULT_SEARCH_SPACE.values()]) / 10
+
+
+def test_trial_threads_split_cores():
+    """Parallel trials share the cores instead of each using all of them"""
+    assert trial_threads(4, n_jobs=8) == 2
+    assert trial_threads(3, n_jobs=2) == 1
+    assert trial_threads(1, n_jobs=6) == 6
+
+
+def test_tune_hyperparameters_updates_model(tuning_data):
+    """The best configuration and its early-stopped round count become the model"""
+    X, y = tuning_data
+    model = XGBoostChurnModel({"n_estimators": 27, "n_jobs": 1})
+
+    results = model.tune_hyperparameters(X, y, param_grid=SEARCH_SPACE)
+
+    assert 0.5 < results["best_score"] <= 1
+    assert results["fits"] == len(results["trials"])
+    assert model.model_config["n_estimators"] == results["best_num_boost_round"]
+    for name, value in results["best_params"].items():
+        assert value in SEARCH_SPACE[name]
+        assert model.model.get_params()[name] == value
+
+    model.train(X, y, cv_folds=0)
+
+
+def test_interrupted_search_resumes_from_state(tuning_data, tmp_path):
+    """A budget-limited run resumes without refitting its completed trials"""
+    X, y = tuning_data
+    state_path = tmp_path / "tuning.json"
+
+    full = _tuner().run(X, y)
+
+    partial = _tuner(max_fits=4, state_path=state_path).run(X, y)
+    assert partial["budget_exhausted"]
+    assert len(partial["trials"]) == 4
+
+    resumed = _tuner(state_path=state_path).run(X, y)
+    assert not resumed["budget_exhausted"]
+    assert resumed["fits"] == full["fits"] - 4
+    assert _scores(resumed) == _scores(full)
+    assert resumed["best_params"] == full["best_params"]
+
+
+def test_parallel_trials_match_serial(tuning_data):
+    """Concurrent trials on the shared matrices give the serial results"""
+    X, y = tuning_data
+
+    serial = _tuner().run(X, y)
+    parallel = _tuner(n_parallel=2).run(X, y)
+
+    assert _scores(parallel) == pytest.approx(_scores(serial))
+    assert parallel["best_params"] == serial["best_params"]
+
+
+def test_state_from_a_different_search_is_rejected(tuning_data, tmp_path):
+    """Resuming with changed settings would mix incomparable trials"""
+    X, y = tuning_data
+    state_path = tmp_path / "tuning.json"
+    _tuner(max_fits=2, state_path=state_path).run(X, y)
+
+    params = {"objective": "binary:logistic", "tree_method": "hist", "seed": 1}
+    changed = HyperbandTuner(
+        params, SEARCH_SPACE, max_rounds=81, min_rounds=3, state_path=state_path
+    )
+    with pytest.raises(ValueError, match="different search"):
+        changed.run(X, y)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
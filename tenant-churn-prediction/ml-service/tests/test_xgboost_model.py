@@ -2,15 +2,19 @@
 Unit Tests for XGBoost Churn Model
 """
 
+import json
 import sys
 from pathlib import Path
 
+import joblib
 import numpy as np
 import pandas as pd
 import pytest
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.models.base_model import risk_levels
+from src.models.training_matrix import fold_matrices
 from src.models.xgboost_model import XGBoostChurnModel
 
 
@@ -145,9 +149,185 @@ def test_risk_scoring(trained_model, sample_data):
     )
 
 
+def test_vectorized_risk_levels_match_scalar_rule():
+    """Banding whole arrays gives the same levels as the per-value checks"""
+
+    def scalar_level(value, high, medium):
+        if value >= high:
+            return "HIGH"
+        elif value >= medium:
+            return "MEDIUM"
+        return "LOW"
+
+    scores = np.arange(0, 101)
+    for high, medium in [(80, 50), (50, 50), (30, 50), (90, 0)]:
+        assert list(risk_levels(scores, high, medium)) == [
+            scalar_level(score, high, medium) for score in scores
+        ]
+
+    probabilities = np.array([0.0, 0.4999, 0.5, 0.7999, 0.8, 1.0])
+    assert list(risk_levels(probabilities)) == [
+        "LOW",
+        "LOW",
+        "MEDIUM",
+        "MEDIUM",
+        "HIGH",
+        "HIGH",
+    ]
+
+
+def test_dmatrix_training_matches_estimator_fit(sample_data):
+    """Native training on the binned matrix gives the same booster as fit()"""
+    X, y = sample_data
+
+    fitted = XGBoostChurnModel()
+    fitted.train(X, y)
+    native = XGBoostChurnModel()
+    results = native.train(X, y, use_dmatrix=True)
+
+    np.testing.assert_allclose(native.predict_proba(X), fitted.predict_proba(X))
+    assert results["metadata"]["training_matrix"] == "QuantileDMatrix"
+    assert 0.5 < results["metadata"]["cv_mean_auc"] <= 1
+
+
+def test_dmatrix_training_reports_out_of_fold_metrics(sample_data):
+    """CV out-of-fold predictions give the reported metrics; CV is optional"""
+    X, y = sample_data
+
+    results = XGBoostChurnModel().train(X, y, use_dmatrix=True, cv_folds=4)
+    metadata = results["metadata"]
+    assert metadata["training_metrics_source"] == "out_of_fold"
+    assert metadata["cv_folds"] == 4
+    assert list(metadata["phase_seconds"]) == [
+        "matrix_build",
+        "cross_validation",
+        "fit",
+        "evaluation",
+    ]
+    # Held-out predictions score below the in-sample fit
+    in_sample = XGBoostChurnModel().train(X, y, use_dmatrix=True, cv_folds=0)
+    assert results["training_metrics"]["roc_auc"] < 1.0
+    assert results["training_metrics"]["roc_auc"] <= (
+        in_sample["training_metrics"]["roc_auc"]
+    )
+
+    metadata = in_sample["metadata"]
+    assert metadata["training_metrics_source"] == "in_sample"
+    assert metadata["cv_mean_auc"] is None
+    assert "cross_validation" not in metadata["phase_seconds"]
+
+
+def test_estimator_training_reports_out_of_fold_metrics(sample_data):
+    """The sklearn path cross-validates on the same fold matrices as the native path"""
+    X, y = sample_data
+
+    estimator = XGBoostChurnModel().train(X, y, cv_folds=4)
+    native = XGBoostChurnModel().train(X, y, use_dmatrix=True, cv_folds=4)
+
+    metadata = estimator["metadata"]
+    assert metadata["training_metrics_source"] == "out_of_fold"
+    assert list(metadata["phase_seconds"]) == ["fit", "cross_validation", "evaluation"]
+    assert metadata["cv_mean_auc"] == pytest.approx(native["metadata"]["cv_mean_auc"])
+    assert estimator["training_metrics"] == pytest.approx(native["training_metrics"])
+
+
+def test_fold_bins_exclude_held_out_rows(sample_data):
+    """Each fold's cuts come from its training rows; held-out rows reuse them"""
+    X, y = sample_data
+    X = X.copy()
+    X.loc[0, "monthly_rent"] = 1e6
+
+    for dtrain, dheld, held_out in fold_matrices(X, y, 4, random_state=0):
+        indptr, cuts = dtrain.get_quantile_cut()
+        column = list(X.columns).index("monthly_rent")
+        rent_cuts = cuts[indptr[column] : indptr[column + 1]]
+        assert (rent_cuts.max() > 1e6) == (0 not in held_out)
+        assert dheld.num_row() == len(held_out)
+        assert dtrain.num_row() + dheld.num_row() == len(X)
+
+
+def test_estimator_training_without_cv(sample_data):
+    """cv_folds=0 skips cross-validation on the sklearn path too"""
+    X, y = sample_data
+
+    results = XGBoostChurnModel().train(X, y, cv_folds=0)
+    assert results["metadata"]["cv_folds"] == 0
+    assert list(results["metadata"]["phase_seconds"]) == ["fit", "evaluation"]
+
+    with pytest.raises(ValueError, match="cv_folds"):
+        XGBoostChurnModel().train(X, y, cv_folds=1)
+
+
+def test_matrix_cache_reused_until_data_changes(sample_data, tmp_path, capsys):
+    """A cached binary matrix is loaded for unchanged data and rebuilt otherwise"""
+    X, y = sample_data
+    cache_path = tmp_path / "train.dmatrix"
+
+    first = XGBoostChurnModel()
+    first.train(X, y, matrix_cache_path=cache_path)
+    assert cache_path.exists()
+    assert "Training matrix cached" in capsys.readouterr().out
+
+    second = XGBoostChurnModel()
+    second.train(X, y, matrix_cache_path=cache_path)
+    assert "Loading cached training matrix" in capsys.readouterr().out
+    np.testing.assert_allclose(second.predict_proba(X), first.predict_proba(X))
+
+    changed = X.assign(monthly_rent=X["monthly_rent"] + 1)
+    XGBoostChurnModel().train(changed, y, matrix_cache_path=cache_path)
+    assert "Training matrix cached" in capsys.readouterr().out
+
+
+def test_early_stopping_truncates_to_best_iteration(sample_data):
+    """Only the trees up to the best validation iteration are kept"""
+    X, y = sample_data
+    noisy = y.where(np.random.default_rng(3).random(len(y)) > 0.2, 1 - y)
+    X_train, y_train, X_val, y_val = X[:700], noisy[:700], X[700:], noisy[700:]
+
+    model = XGBoostChurnModel({"learning_rate": 0.3})
+    results = model.train(
+        X_train, y_train, X_val, y_val, early_stopping_rounds=5, cv_folds=0
+    )
+    best_iteration = results["metadata"]["best_iteration"]
+
+    assert best_iteration is not None and best_iteration < 199
+    assert results["metadata"]["n_trees"] == best_iteration + 1
+    assert model.model.get_booster().num_boosted_rounds() == best_iteration + 1
+
+    # Same trees as training exactly that many rounds without early stopping
+    fixed = XGBoostChurnModel(
+        {"learning_rate": 0.3, "n_estimators": best_iteration + 1}
+    )
+    fixed.train(X_train, y_train, cv_folds=0)
+    np.testing.assert_allclose(model.predict_proba(X_val), fixed.predict_proba(X_val))
+
+    native = XGBoostChurnModel({"learning_rate": 0.3})
+    results = native.train(
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        early_stopping_rounds=5,
+        use_dmatrix=True,
+        cv_folds=0,
+    )
+    assert results["metadata"]["best_iteration"] == best_iteration
+    np.testing.assert_allclose(native.predict_proba(X_val), model.predict_proba(X_val))
+
+
+def test_training_without_validation_keeps_all_trees(sample_data):
+    """Early stopping needs a validation set; without one every tree is kept"""
+    X, y = sample_data
+
+    results = XGBoostChurnModel({"n_estimators": 30}).train(X, y, cv_folds=2)
+
+    assert results["metadata"]["best_iteration"] is None
+    assert results["metadata"]["n_trees"] == 30
+
+
 def test_model_save_load(trained_model, tmp_path):
     """Test model save and load"""
-    model_path = tmp_path / "test_model.pkl"
+    model_path = tmp_path / "test_model"
 
     # Save model
     trained_model.save(model_path)
@@ -161,6 +341,128 @@ def test_model_save_load(trained_model, tmp_path):
     assert loaded_model.model_version == trained_model.model_version
 
 
+def test_model_artifact_layout(trained_model, sample_data, tmp_path):
+    """Native booster, readable manifest and a memory-mapped importance table"""
+    X, _ = sample_data
+    model_path = tmp_path / "test_model"
+    trained_model.save(model_path)
+
+    manifest = XGBoostChurnModel.read_manifest(model_path)
+    assert manifest["model_type"] == "XGBoostChurnModel"
+    assert manifest["feature_names"] == trained_model.feature_names
+    assert manifest["training_metadata"]["n_trees"] == 200
+    assert (model_path / manifest["files"]["booster"]).suffix == ".ubj"
+
+    loaded_model = XGBoostChurnModel.load(model_path)
+    assert isinstance(loaded_model.feature_importances, np.memmap)
+    pd.testing.assert_frame_equal(
+        loaded_model.get_feature_importance(),
+        trained_model.get_feature_importance(),
+        check_dtype=False,
+    )
+    np.testing.assert_array_equal(
+        loaded_model.predict_proba(X), trained_model.predict_proba(X)
+    )
+
+    # Saved with its compiled tree engine, so the numpy backend skips compiling
+    assert loaded_model._engine is not None
+    loaded_model.set_inference_backend("numpy")
+    np.testing.assert_allclose(
+        loaded_model.predict_proba(X), trained_model.predict_proba(X), atol=1e-6
+    )
+
+    # Saving again switches the link to a new version, keeping the previous
+    # one for loads still reading it
+    first_version = model_path.resolve()
+    trained_model.model_version = "2.0.0"
+    trained_model.save(model_path)
+    assert XGBoostChurnModel.read_manifest(model_path)["model_version"] == "2.0.0"
+    assert model_path.is_symlink() and model_path.resolve() != first_version
+    assert first_version.exists()
+
+    trained_model.save(model_path)
+    assert not first_version.exists()
+    visible = [p.name for p in tmp_path.iterdir() if not p.name.startswith(".")]
+    assert visible == ["test_model"]
+    assert len(list(tmp_path.glob(".test_model.*"))) == 2
+
+
+def test_save_replaces_pre_versioning_artifact(trained_model, tmp_path):
+    """An artifact saved as a plain directory is moved into a version once"""
+    model_path = tmp_path / "test_model"
+    trained_model.save(model_path)
+    plain = tmp_path / "plain"
+    model_path.resolve().rename(plain)
+    model_path.unlink()
+    plain.rename(model_path)
+    assert model_path.is_dir() and not model_path.is_symlink()
+
+    trained_model.model_version = "2.0.0"
+    trained_model.save(model_path)
+
+    assert model_path.is_symlink()
+    assert XGBoostChurnModel.load(model_path).model_version == "2.0.0"
+    assert len(list(tmp_path.glob(".test_model.*"))) == 2
+
+
+def test_legacy_joblib_model_loads(trained_model, sample_data, tmp_path):
+    """Models pickled by earlier releases still load"""
+    X, _ = sample_data
+    legacy_path = tmp_path / "xgboost_churn_model.pkl"
+    joblib.dump(
+        {
+            "model": trained_model.model,
+            "feature_names": trained_model.feature_names,
+            "model_config": trained_model.model_config,
+            "training_metadata": trained_model.training_metadata,
+            "model_version": trained_model.model_version,
+        },
+        legacy_path,
+    )
+
+    loaded_model = XGBoostChurnModel.load(legacy_path)
+    np.testing.assert_array_equal(
+        loaded_model.predict_proba(X), trained_model.predict_proba(X)
+    )
+    with pytest.raises(ValueError, match="legacy joblib"):
+        loaded_model.save(legacy_path)
+
+
+def _booster_threads(model):
+    config = json.loads(model.model.get_booster().save_config())
+    return int(config["learner"]["generic_param"]["nthread"])
+
+
+def test_inference_threads_set_after_load(trained_model, sample_data, tmp_path):
+    """Serving threads go on the loaded booster; training keeps n_jobs"""
+    X, y = sample_data
+    model_path = tmp_path / "test_model"
+    trained_model.save(model_path)
+
+    loaded_model = XGBoostChurnModel.load(model_path, inference_threads=2)
+    assert _booster_threads(loaded_model) == 2
+    assert loaded_model.model_config["n_jobs"] == -1
+    np.testing.assert_allclose(
+        loaded_model.predict_proba(X), trained_model.predict_proba(X)
+    )
+
+    # Retraining fits with the training threads, then restores the serving ones
+    loaded_model.model_config["n_jobs"] = 3
+    loaded_model.model.set_params(n_estimators=5)
+    fit_threads = []
+    original_fit = loaded_model.model.fit
+    loaded_model.model.fit = lambda *args, **kwargs: (
+        fit_threads.append(loaded_model.model.n_jobs) or original_fit(*args, **kwargs)
+    )
+    loaded_model.train(X, y, cv_folds=0)
+    assert fit_threads == [3]
+    assert _booster_threads(loaded_model) == 2
+
+    assert _booster_threads(XGBoostChurnModel.load(model_path)) == -1
+    with pytest.raises(ValueError, match="n_threads"):
+        loaded_model.set_inference_threads(0)
+
+
 def test_prediction_explanation(trained_model, sample_data):
     """Test prediction explanation"""
     X, _ = sample_data